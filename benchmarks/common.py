@@ -0,0 +1,133 @@
+"""Shared setup for the benchmark scripts.
+
+Run them from the repository root, for example::
+
+    python -m benchmarks.run
+    python -m benchmarks.element_ids
+
+"""
+import os
+import time
+import tracemalloc
+#-
+import django
+from django.conf import settings
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), 'templates')
+"The crispy-forms template pack of the repository."
+
+
+def setup(crispy=False, **options):
+    """Configure a minimal Django project with materialweb installed.
+
+    The `python-pack` template engine serves the template pack of the
+    repository with `material/field.html` in Python. With `crispy`,
+    crispy-forms is installed too, and the `template-pack` template engine
+    serves the template pack files only.
+    """
+    if settings.configured:
+        return
+
+    installed_apps = ['materialweb']
+    templates = [{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'OPTIONS': {
+            'builtins': ['django.templatetags.i18n'],
+        },
+    }, {
+        'NAME': 'python-pack',
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': [('django.template.loaders.cached.Loader', [
+                'materialweb.loaders.Loader',
+                'django.template.loaders.filesystem.Loader',
+            ])],
+        },
+    }]
+    if crispy:
+        installed_apps.append('crispy_forms')
+        options.setdefault('CRISPY_TEMPLATE_PACK', 'material')
+        options.setdefault('CRISPY_ALLOWED_TEMPLATE_PACKS', ('material',))
+        templates.append({
+            'NAME': 'template-pack',
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [TEMPLATES_DIR],
+            'OPTIONS': {
+                'loaders': [('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                ])],
+            },
+        })
+
+    settings.configure(
+        INSTALLED_APPS=installed_apps,
+        TEMPLATES=templates,
+        MATERIALWEB_PYTHON_TEMPLATES=True,
+        USE_I18N=True,
+        SECRET_KEY='benchmarks',
+        ALLOWED_HOSTS=['*'],
+        **options)
+    django.setup()
+
+
+def compile_template(source, engine='django'):
+    """Parse a template using the materialweb library.
+    """
+    from django.template import engines # pylint:disable=import-outside-toplevel
+    return engines[engine].from_string('{% load materialweb %}' + source)
+
+
+def timeit(func, repeat=20):
+    """Run `func` `repeat` times, return the sorted durations in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings
+
+
+def percentile(timings, value):
+    """Get a percentile of sorted `timings`.
+    """
+    index = min(len(timings) - 1, int(round(value / 100 * (len(timings) - 1))))
+    return timings[index]
+
+
+def peak_memory(func):
+    """Run `func` once, return the peak of allocated memory in bytes.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(func, repeat=20, warmup=2):
+    """Measure `func`, return renders/sec, p50, p99, peak memory and size.
+    """
+    for _ in range(warmup):
+        output = func()
+
+    timings = timeit(func, repeat)
+    return {
+        'renders_per_sec': len(timings) / sum(timings),
+        'p50': percentile(timings, 50),
+        'p99': percentile(timings, 99),
+        'peak_memory': peak_memory(func),
+        'size': len(output),
+    }
+
+
+def report(name, timings):
+    """Print the median and best of the sorted `timings`, in milliseconds.
+    """
+    median = timings[len(timings) // 2]
+    print('%-32s %9.2f ms median %9.2f ms best' % (name, median * 1000,
+            timings[0] * 1000))
@@ -0,0 +1,37 @@
+"""Element id generators on a page with 2,000 components.
+
+Compares the default per-render counter with uuid4() ids.
+"""
+from .common import setup, compile_template, timeit, report
+
+setup()
+
+# pylint:disable=wrong-import-position
+from django.test import override_settings
+
+SOURCE = '''
+{% for item in items %}
+  {% Card class=item %}
+    {% Card_Content %}{{ item }}{% endCard_Content %}
+  {% endCard %}
+{% endfor %}
+'''
+
+GENERATORS = {
+    'sequential_id': 'materialweb.tags.base.sequential_id',
+    'random_id': 'materialweb.tags.base.random_id',
+}
+
+
+def main():
+    template = compile_template(SOURCE)
+    # Card and Card_Content for each item.
+    context = {'items': ['item-%d' % x for x in range(1000)]}
+
+    for name, path in GENERATORS.items():
+        with override_settings(MATERIALWEB_ID_GENERATOR=path):
+            report(name, timeit(lambda: template.render(context)))
+
+
+if __name__ == '__main__':
+    main()
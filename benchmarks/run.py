@@ -0,0 +1,83 @@
+"""Render the benchmark workloads, report throughput, latency and memory.
+
+.. code-block:: sh
+
+   python -m benchmarks.run
+   python -m benchmarks.run table-1000 form-50 --repeat 50
+   python -m benchmarks.run --save before.json
+   python -m benchmarks.run --compare before.json
+
+"""
+import argparse
+from importlib.util import find_spec
+import json
+#-
+from django.template import Context
+#-
+from .common import setup, measure
+from .workloads import CRISPY_WORKLOADS, WORKLOADS
+
+
+def run(names, repeat):
+    results = {}
+    for name in names:
+        template, make_context = WORKLOADS[name]()
+        template = template.template
+
+        def _render():
+            return template.render(Context(make_context()))
+
+        results[name] = measure(_render, repeat)
+    return results
+
+
+def print_results(results, baseline=None):
+    print('%-18s %12s %10s %10s %12s %12s' % ('workload', 'renders/s',
+            'p50 ms', 'p99 ms', 'peak KiB', 'size KiB'))
+    for name, result in results.items():
+        line = '%-18s %12.1f %10.2f %10.2f %12.1f %12.1f' % (name,
+                result['renders_per_sec'], result['p50'] * 1000,
+                result['p99'] * 1000, result['peak_memory'] / 1024,
+                result['size'] / 1024)
+        if baseline and name in baseline:
+            line += '   p50 %+6.1f%%' % ((result['p50'] /\
+                    baseline[name]['p50'] - 1) * 100)
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('workloads', nargs='*',
+            help="Default to all workloads: %s." % ', '.join(WORKLOADS))
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--save', help="Write the results to a JSON file.")
+    parser.add_argument('--compare', help="Compare with saved results.")
+    args = parser.parse_args()
+
+    for name in args.workloads:
+        if name not in WORKLOADS:
+            parser.error("Unknown workload: %s" % name)
+
+    names = args.workloads
+    if not names:
+        names = list(WORKLOADS)
+        # By default skip the template pack if crispy-forms is missing.
+        if find_spec('crispy_forms') is None:
+            names = [x for x in names if x not in CRISPY_WORKLOADS]
+    setup(crispy=any(x in CRISPY_WORKLOADS for x in names))
+
+    results = run(names, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
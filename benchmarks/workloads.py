@@ -0,0 +1,309 @@
+"""Representative pages rendered by the benchmarks.
+
+Each workload is a function returning the compiled template and a function
+creating a new render context.
+"""
+from django import forms
+from django.core.paginator import Paginator
+from django.test import RequestFactory
+#-
+from .common import compile_template
+
+WORKLOADS = {}
+
+CRISPY_WORKLOADS = ('pack-templates-40',)
+"Workloads rendering the crispy-forms template pack, which need crispy-forms."
+
+
+def workload(name, *args):
+    """Decorator, register a workload under `name`, with arguments.
+    """
+    def _decorator(func):
+        WORKLOADS[name] = lambda: func(*args)
+        return func
+    return _decorator
+
+
+TABLE = '''
+{% Table label="Desserts" name="dessert" row_selectable=True pager=page %}
+  {% Table_Head %}
+    {% Table_Head_Row %}
+      {% Table_Head_Col %}Dessert{% endTable_Head_Col %}
+      {% Table_Head_Col type="num" %}Calories{% endTable_Head_Col %}
+      {% Table_Head_Col type="num" %}Fat (g){% endTable_Head_Col %}
+      {% Table_Head_Col %}Comments{% endTable_Head_Col %}
+    {% endTable_Head_Row %}
+  {% endTable_Head %}
+  {% Table_Body %}
+    {% for row in page.object_list %}
+      {% Table_Row value=row.id %}
+        {% Table_ColHeader %}{{ row.name }}{% endTable_ColHeader %}
+        {% Table_Col type="num" %}{{ row.calories }}{% endTable_Col %}
+        {% Table_Col type="num" %}{{ row.fat }}{% endTable_Col %}
+        {% Table_Col %}{{ row.comment }}{% endTable_Col %}
+      {% endTable_Row %}
+    {% endfor %}
+  {% endTable_Body %}
+{% endTable %}
+'''
+
+@workload('table-10000', 10000)
+@workload('table-1000', 1000)
+@workload('table-100', 100)
+def table(size):
+    rows = [{
+        'id': x,
+        'name': 'Dessert <%d>' % x,
+        'calories': x * 7 % 500,
+        'fat': x % 30 / 3,
+        'comment': 'Super tasty & sweet',
+    } for x in range(size * 3)]
+    paginator = Paginator(rows, size)
+    request = RequestFactory().get('/desserts/', {'page': 2, 'q': 'cake'})
+
+    def _context():
+        return {'page': paginator.page(2), 'request': request}
+
+    return compile_template(TABLE), _context
+
+
+TABLE_SOURCE = '''
+{% Table label="Desserts" name="dessert" row_selectable=True pager=page columns=columns row_value="id" %}{% endTable %}
+'''
+
+@workload('table-source-10000', 10000)
+@workload('table-source-1000', 1000)
+def table_source(size):
+    """Same as `table()`, rendered from `columns`.
+    """
+    # pylint:disable=import-outside-toplevel
+    from materialweb.tags.data_table import Column
+
+    template, make_context = table(size)
+    columns = [
+        Column('name', 'Dessert'),
+        Column('calories', 'Calories', type='num'),
+        Column('fat', 'Fat (g)', type='num'),
+        Column('comment', 'Comments'),
+    ]
+
+    def _context():
+        context = make_context()
+        context['columns'] = columns
+        return context
+
+    del template
+    return compile_template(TABLE_SOURCE), _context
+
+
+FORM = '''
+{% for field in text_fields %}{% TextField field mode="outlined" %}{% endfor %}
+{% for field in select_fields %}{% Select field %}{% endSelect %}{% endfor %}
+{% for field in checkbox_fields %}{% CheckBox field %}{% endfor %}
+'''
+
+@workload('form-50')
+def form():
+    fields = {}
+    data = {}
+    for x in range(50):
+        name = 'field%d' % x
+        if x % 3 == 0:
+            fields[name] = forms.CharField(label='Text %d' % x,
+                    help_text='Help text %d' % x)
+            data[name] = 'value %d' % x
+        elif x % 3 == 1:
+            fields[name] = forms.ChoiceField(label='Choice %d' % x,
+                    choices=[(str(y), 'Option %d' % y) for y in range(10)])
+            data[name] = '3'
+        else:
+            fields[name] = forms.BooleanField(label='Check %d' % x,
+                    required=False)
+            data[name] = 'on'
+    form_class = type('BenchmarkForm', (forms.Form,), fields)
+
+    def _context():
+        bound = form_class(data)
+        widgets = {
+            forms.CharField: [],
+            forms.ChoiceField: [],
+            forms.BooleanField: [],
+        }
+        for field in bound:
+            widgets[type(field.field)].append(field)
+        return {
+            'text_fields': widgets[forms.CharField],
+            'select_fields': widgets[forms.ChoiceField],
+            'checkbox_fields': widgets[forms.BooleanField],
+        }
+
+    return compile_template(FORM), _context
+
+
+def admin_form(size):
+    """Get an admin-style form class of `size` mixed fields, and its data.
+    """
+    kinds = (
+        (forms.CharField, {}, 'value %d'),
+        (forms.CharField, {'widget': forms.Textarea}, 'notes %d'),
+        (forms.ChoiceField, {'choices': [(str(y), 'Option %d' % y)\
+                for y in range(10)]}, '3'),
+        (forms.BooleanField, {'required': False}, 'on'),
+        (forms.EmailField, {}, 'user%d@example.com'),
+        (forms.DateField, {}, '2020-01-%02d'),
+    )
+    fields = {}
+    data = {}
+    for x in range(size):
+        field_class, kwargs, value = kinds[x % len(kinds)]
+        name = 'field%d' % x
+        fields[name] = field_class(label='Field %d' % x,
+                help_text='Help text %d' % x if x % 4 == 0 else '', **kwargs)
+        data[name] = value % (x % 28 + 1) if '%' in value else value
+    return type('AdminForm', (forms.Form,), fields), data
+
+
+FORM_TAG = '''{% Form form %}'''
+
+@workload('form-tag-60', 60)
+def form_tag(size):
+    """A whole form rendered with the Form component.
+    """
+    form_class, data = admin_form(size)
+
+    def _context():
+        return {'form': form_class(data)}
+
+    return compile_template(FORM_TAG), _context
+
+
+FORM_DJANGO = '''{{ form }}'''
+
+@workload('form-renderer-60', 60)
+def form_renderer(size):
+    """Same as `form_tag()`, with MaterialFormRenderer.
+    """
+    # pylint:disable=import-outside-toplevel
+    from materialweb.renderers import MaterialFormRenderer
+
+    form_class, data = admin_form(size)
+    renderer = MaterialFormRenderer()
+
+    def _context():
+        return {'form': form_class(data, renderer=renderer)}
+
+    return compile_template(FORM_DJANGO), _context
+
+
+@workload('form-django-60', 60)
+def form_django(size):
+    """Same as `form_tag()`, with the Django form templates, for comparison.
+    """
+    form_class, data = admin_form(size)
+
+    def _context():
+        return {'form': form_class(data)}
+
+    return compile_template(FORM_DJANGO), _context
+
+
+PACK_FORM = '''
+{% for field in form %}{% include "material/field.html" %}{% endfor %}
+'''
+
+def pack_form(size, engine):
+    """A form rendered a field at a time with `material/field.html` of the
+    template pack, like crispy-forms does.
+    """
+    form_class, data = admin_form(size)
+
+    def _context():
+        return {
+            'form': form_class(data),
+            'form_show_errors': True,
+            'form_show_labels': True,
+        }
+
+    return compile_template(PACK_FORM, engine), _context
+
+
+workload('pack-python-40', 40, 'python-pack')(pack_form)
+workload('pack-templates-40', 40, 'template-pack')(pack_form)
+
+
+SELECT = '''{% Select form.choice mode="outlined" %}{% endSelect %}'''
+
+@workload('select-5000', 5000)
+def select(size):
+    class SelectForm(forms.Form):
+        choice = forms.ChoiceField(label="Choice",
+                choices=[(str(x), 'Option %d' % x) for x in range(size)])
+
+    def _context():
+        return {'form': SelectForm({'choice': str(size // 2)})}
+
+    return compile_template(SELECT), _context
+
+
+APP_SHELL = '''
+{% Drawer mode="modal" %}
+  {% Drawer_Header %}
+    {% Drawer_Title %}{{ user }}{% endDrawer_Title %}
+    {% Drawer_SubTitle %}{{ email }}{% endDrawer_SubTitle %}
+  {% endDrawer_Header %}
+  {% Drawer_Content %}
+    {% List %}
+      {% for item in menu %}
+        {% List_Item tag="a" href=item.url activated=item.active %}
+          {% List_Text %}{{ item.label }}{% endList_Text %}
+        {% endList_Item %}
+      {% endfor %}
+    {% endList %}
+  {% endDrawer_Content %}
+{% endDrawer %}
+{% Drawer_AppContent %}
+  {% TopAppBar %}
+    {% TopAppBar_Left %}
+      {% TopAppBar_Menu class="material-icons" %}menu{% endTopAppBar_Menu %}
+      {% TopAppBar_Title %}{{ title }}{% endTopAppBar_Title %}
+    {% endTopAppBar_Left %}
+    {% TopAppBar_Right %}
+      {% IconButton label="Search" class="material-icons" %}search{% endIconButton %}
+    {% endTopAppBar_Right %}
+  {% endTopAppBar %}
+  {% for card in cards %}
+    {% Card mode="outlined" %}
+      {% Card_PrimaryAction %}
+        {% Card_Media %}{% endCard_Media %}
+        {% Card_Content %}{{ card.text }}{% endCard_Content %}
+      {% endCard_PrimaryAction %}
+      {% Card_Actions %}
+        {% Button tag="a" href=card.url %}
+          {% Button_Label %}Open{% endButton_Label %}
+        {% endButton %}
+        {% IconButton label="Share" class="material-icons" %}share{% endIconButton %}
+      {% endCard_Actions %}
+    {% endCard %}
+  {% endfor %}
+{% endDrawer_AppContent %}
+'''
+
+@workload('app-shell')
+def app_shell():
+    def _context():
+        return {
+            'user': 'Jane Doe',
+            'email': 'jane@example.com',
+            'title': 'Dashboard',
+            'menu': [{
+                'url': '/section/%d/' % x,
+                'label': 'Section %d' % x,
+                'active': x == 3,
+            } for x in range(12)],
+            'cards': [{
+                'url': '/item/%d/' % x,
+                'text': 'Card number %d' % x,
+            } for x in range(24)],
+        }
+
+    return compile_template(APP_SHELL), _context
@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+#-
+from .conf import get_setting
 
 
 class MaterialWebConfig(AppConfig):
     name = 'materialweb'
+
+    def ready(self):
+        if get_setting('MATERIALWEB_PROFILE'):
+            from . import profiler # pylint:disable=import-outside-toplevel
+            profiler.install()
@@ -0,0 +1,79 @@
+"""Storage of Template Tag output cached with the `cache` argument.
+
+Uses the Django cache named by the `MATERIALWEB_CACHE` setting, or a local
+memory cache if it is not set.
+
+Fragments are kept `MATERIALWEB_CACHE_STALE` seconds after they expired. A
+request getting an expired fragment uses it anyway, while it is rendered again
+in a background thread.
+"""
+from functools import lru_cache
+import logging
+from threading import Thread
+import time
+#-
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+#-
+from .conf import get_setting
+
+_logger = logging.getLogger(__name__)
+
+REFRESH_LOCK_TIMEOUT = 60
+"Seconds before another refresh of a stale fragment can be started."
+
+
+@lru_cache(maxsize=None)
+def _local_cache():
+    return LocMemCache('materialweb', {})
+
+
+def get_cache():
+    """Get the cache storing the fragments.
+    """
+    alias = get_setting('MATERIALWEB_CACHE')
+    if alias:
+        return caches[alias]
+    return _local_cache()
+
+
+def get_fragment(key, timeout, renderer):
+    """Get a cached fragment, render it if it is missing.
+
+    `renderer()` is called in the current thread, and returns the function
+    rendering the fragment, which may be called in another thread. What that
+    function returns is stored and returned as the fragment.
+    """
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is None:
+        fragment = renderer()()
+        store(cache, key, timeout, fragment)
+        return fragment
+
+    expires, fragment = entry
+    if time.time() >= expires and cache.add(key + ':refresh', True,
+            REFRESH_LOCK_TIMEOUT):
+        Thread(target=refresh, args=(key, timeout, renderer()),
+                daemon=True).start()
+    return fragment
+
+
+def store(cache, key, timeout, fragment):
+    stale = get_setting('MATERIALWEB_CACHE_STALE')
+    cache.set(key, (time.time() + timeout, fragment), timeout + stale)
+
+
+def refresh(key, timeout, render):
+    """Render a stale fragment again.
+    """
+    cache = get_cache()
+    try:
+        store(cache, key, timeout, render())
+    except Exception: # pylint:disable=broad-except
+        _logger.exception("Failed to refresh cached fragment %s.", key)
+    finally:
+        cache.delete(key + ':refresh')
+        # Connections of this thread are not reused, whatever CONN_MAX_AGE.
+        connections.close_all()
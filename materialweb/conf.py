@@ -0,0 +1,23 @@
+"""Django settings read by materialweb, and their default values.
+"""
+from django.conf import settings
+
+DEFAULTS = {
+    'MATERIALWEB_CACHE': None,
+    'MATERIALWEB_CACHE_TIMEOUT': 300,
+    'MATERIALWEB_CACHE_STALE': 60,
+    'MATERIALWEB_COUNT_TIMEOUT': 60,
+    'MATERIALWEB_ID_GENERATOR': 'materialweb.tags.base.sequential_id',
+    'MATERIALWEB_MINIFY': False,
+    'MATERIALWEB_PAGE_SIZES': (10, 25, 100),
+    'MATERIALWEB_PROFILE': False,
+    'MATERIALWEB_PROFILE_LOG': True,
+    'MATERIALWEB_PROFILE_SERVER_TIMING': True,
+    'MATERIALWEB_PROFILE_FILE': None,
+    'MATERIALWEB_PYTHON_TEMPLATES': False,
+    'MATERIALWEB_SVG_SPRITE': False,
+}
+
+
+def get_setting(name):
+    return getattr(settings, name, DEFAULTS[name])
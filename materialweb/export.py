@@ -0,0 +1,129 @@
+"""Download the rows of a :code:`Table` as CSV or NDJSON.
+
+The export uses the same `source` and `columns` as the Table, and streams
+the rows as they are fetched, a queryset is read `chunk_size` rows at a time
+so the memory used does not depend on the number of rows.
+
+.. code-block:: python
+
+   from materialweb.export import export_response
+
+   def dessert_list(request):
+       desserts = Dessert.objects.order_by('name')
+       response = export_response(request, desserts, COLUMNS)
+       if response is not None:
+           return response
+       ...
+
+Then :code:`{% Table pager=page columns=columns export="csv" %}` adds the
+download link to the pagination bar.
+"""
+import csv
+#-
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
+#-
+from .streaming import buffered
+from .tags.data_table import Column, iter_source
+
+
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+"Text starting with these is run as a formula by spreadsheet applications."
+
+
+class _Echo:
+    """File-like object returning what is written, for csv.writer.
+    """
+    def write(self, value):
+        return value
+
+
+def iter_rows(source, columns, chunk_size=2000):
+    """Yield the values of each item in `source`, formatted by `columns`.
+    """
+    fields = [column.field for column in columns]
+    formatters = [column.formatter for column in columns]
+    if not any(formatters):
+        yield from iter_source(source, fields, chunk_size)
+        return
+
+    for row in iter_source(source, fields, chunk_size):
+        yield [formatter(value) if formatter else value\
+                for formatter, value in zip(formatters, row)]
+
+
+def escape_formula(value):
+    """Prefix text read as a formula with a quote, to keep it text.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(source, columns, chunk_size=2000, escape_formulas=True):
+    """Yield the header and rows as CSV lines.
+
+    Text values that would run as formulas in spreadsheet applications are
+    prefixed with a quote, unless `escape_formulas` is False. Numbers are
+    written as they are.
+    """
+    writer = csv.writer(_Echo())
+    header = [str(column.header) for column in columns]
+    if escape_formulas:
+        header = [escape_formula(x) for x in header]
+    yield writer.writerow(header)
+
+    for row in iter_rows(source, columns, chunk_size):
+        if escape_formulas:
+            row = [escape_formula(x) for x in row]
+        yield writer.writerow(row)
+
+
+def iter_ndjson(source, columns, chunk_size=2000):
+    """Yield the rows as JSON objects keyed by field, one per line.
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    fields = [column.field for column in columns]
+    for row in iter_rows(source, columns, chunk_size):
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+FORMATS = {
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
+"Export generator function and content type, keyed by format name."
+
+
+class ExportResponse(StreamingHttpResponse):
+    """Send the rows of a Table source as a file download.
+    """
+    chunk_size = 8192
+    "Send the output in chunks of at least this many characters."
+
+    def __init__(self, source, columns, format='csv', filename='export', # pylint:disable=redefined-builtin
+            chunk_size=2000, **kwargs):
+
+        exporter, content_type = FORMATS[format]
+        columns = [Column.coerce(x) for x in columns]
+
+        super().__init__(
+                buffered(exporter(source, columns, chunk_size),
+                    self.chunk_size),
+                content_type=content_type, **kwargs)
+        self['Content-Disposition'] = content_disposition_header(True,
+                '%s.%s' % (filename, format))
+
+
+def export_response(request, source, columns, name='export',
+        filename='export', chunk_size=2000):
+    """Get an ExportResponse if the request asks for one.
+
+    The format is read from the `name` query parameter, returns None if it is
+    missing or unknown.
+    """
+    format = request.GET.get(name) # pylint:disable=redefined-builtin
+    if format not in FORMATS:
+        return None
+    return ExportResponse(source, columns, format, filename, chunk_size)
@@ -0,0 +1,58 @@
+"""Template loader serving templates of the crispy-forms pack in Python.
+
+`templates/material` is a crispy-forms template pack, its `field.html` is
+rendered for every field and includes several other templates and filters.
+This loader can serve `material/field.html` as the :code:`Form_PackField`
+component instead, see :mod:`materialweb.tags.pack`, which renders the same
+markup in one pass. The other templates of the pack, and your layouts, are
+loaded from the files and include it unchanged.
+
+It is disabled by default, set :code:`MATERIALWEB_PYTHON_TEMPLATES = True`
+and put the loader before the others:
+
+.. code-block:: python
+
+   TEMPLATES = [{
+       'BACKEND': 'django.template.backends.django.DjangoTemplates',
+       'DIRS': [...],
+       'OPTIONS': {
+           'loaders': [('django.template.loaders.cached.Loader', [
+               'materialweb.loaders.Loader',
+               'django.template.loaders.filesystem.Loader',
+               'django.template.loaders.app_directories.Loader',
+           ])],
+       },
+   }]
+
+The output only differs from the template files in white space. If you
+override `material/field.html` or the layout templates it includes, leave the
+setting off. The setting is read when a template is loaded, the cached
+loader keeps what it loaded first.
+"""
+from django.template import Origin, TemplateDoesNotExist
+from django.template.loaders.base import Loader as BaseLoader
+#-
+from .conf import get_setting
+
+PYTHON_TEMPLATES = {
+    'material/field.html': '{% load materialweb %}{% Form_PackField field %}',
+}
+"Source of the templates served by the loader, keyed by template name."
+
+
+class Loader(BaseLoader):
+    """Serve PYTHON_TEMPLATES, the next loaders find the other templates.
+    """
+    def get_contents(self, origin):
+        try:
+            return PYTHON_TEMPLATES[origin.name]
+        except KeyError:
+            raise TemplateDoesNotExist(origin) from None
+
+
+    def get_template_sources(self, template_name):
+        if not get_setting('MATERIALWEB_PYTHON_TEMPLATES'):
+            return
+        if template_name in PYTHON_TEMPLATES:
+            yield Origin(name=template_name, template_name=template_name,
+                    loader=self)
@@ -0,0 +1,58 @@
+"""Sum up the render statistics written by ProfilerMiddleware.
+"""
+import json
+#-
+from django.core.management.base import BaseCommand, CommandError
+#-
+from ...conf import get_setting
+
+COLUMNS = ('calls', 'cumulative', 'self', 'bytes')
+
+
+class Command(BaseCommand):
+    help = "Show the most expensive materialweb components."
+
+    def add_arguments(self, parser):
+        parser.add_argument('filename', nargs='?',
+                help="Default to the MATERIALWEB_PROFILE_FILE setting.")
+        parser.add_argument('--sort', choices=COLUMNS, default='self')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--path', help="Only requests with this path.")
+
+
+    def handle(self, *args, **options):
+        filename = options['filename'] or\
+                get_setting('MATERIALWEB_PROFILE_FILE')
+        if not filename:
+            raise CommandError("Missing filename, MATERIALWEB_PROFILE_FILE is "
+                    "not set.")
+
+        totals = {}
+        requests = 0
+        try:
+            with open(filename, encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    if options['path'] and record['path'] != options['path']:
+                        continue
+                    requests += 1
+                    for item in record['stats']:
+                        key = (item['component'], item['mode'])
+                        total = totals.setdefault(key, dict.fromkeys(COLUMNS,
+                                0))
+                        for column in COLUMNS:
+                            total[column] += item[column]
+        except OSError as e:
+            raise CommandError(str(e)) from e
+
+        rows = sorted(totals.items(), key=lambda x: x[1][options['sort']],
+                reverse=True)[:options['limit']]
+
+        self.stdout.write("%d requests" % requests)
+        self.stdout.write('%-40s %10s %12s %12s %12s %12s' % ('component',
+                'calls', 'cumulative', 'self', 'self/call', 'bytes'))
+        for (component, mode), total in rows:
+            self.stdout.write('%-40s %10d %10.1fms %10.1fms %10.3fms %12d' % (
+                    '%s %s' % (component, mode), total['calls'],
+                    total['cumulative'] * 1000, total['self'] * 1000,
+                    total['self'] * 1000 / total['calls'], total['bytes']))
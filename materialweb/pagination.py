@@ -0,0 +1,523 @@
+"""Paginators for the `pager` argument of :code:`Table`.
+
+Besides Django's Page, a pager can be a page of the paginators here. The
+pagination bar asks the page for its links with `page_links()`, and for the
+"X-Y of Z" text with `page_summary()`.
+"""
+import base64
+import binascii
+from hashlib import md5
+import json
+#-
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist,\
+        ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, Page,\
+        PageNotAnInteger, Paginator
+from django.db import router
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+#-
+from .cache import get_cache
+from .conf import get_setting
+
+LAST_PAGE = 'last'
+"Cursor of the last page."
+
+KEY_ALIAS = 'materialweb_cursor_%d'
+"Annotation holding one ordering field of the rows of a CursorPaginator."
+
+PAGE_SIZE_SESSION_KEY = 'materialweb.page_size.%s'
+"Session key of the page size chosen for a table, by default its path."
+
+
+def page_links(page):
+    """Get the values of the page parameter for the pagination buttons.
+
+    Returns a dict with `first`, `prev`, `next` and `last` keys, the value is
+    None if the button is disabled.
+    """
+    if hasattr(page, 'pagination_links'):
+        return page.pagination_links()
+
+    if page.has_previous():
+        first, prev = 1, page.previous_page_number()
+    else:
+        first = prev = None
+    if page.has_next():
+        next_, last = page.next_page_number(), page.paginator.num_pages
+    else:
+        next_ = last = None
+    return {'first': first, 'prev': prev, 'next': next_, 'last': last}
+
+
+def page_summary(page):
+    """Get the text describing which rows are displayed.
+    """
+    if hasattr(page, 'pagination_summary'):
+        return page.pagination_summary()
+
+    return _("%(start)s‑%(end)s of %(total)s") % {
+        'start': page.start_index(),
+        'end': page.end_index(),
+        'total': page.paginator.count,
+    }
+
+
+def get_page_size(request, name='page_size', sizes=None, default=None,
+        key=None):
+    """Get the rows per page requested with the `name` query parameter.
+
+    Only the values in `sizes`, `MATERIALWEB_PAGE_SIZES` by default, are
+    accepted, it can be a comma separated string like the `page_sizes` of
+    the table. The chosen size is kept in the session under `key`, the request
+    path by default, and used when the parameter is missing. Otherwise the
+    size is `default`, or the first of `sizes`.
+
+    .. code-block:: python
+
+       paginator = Paginator(queryset, get_page_size(request))
+
+    """
+    if sizes is None:
+        sizes = get_setting('MATERIALWEB_PAGE_SIZES')
+    elif isinstance(sizes, str):
+        sizes = sizes.split(',')
+    sizes = [int(size) for size in sizes]
+    session = getattr(request, 'session', None)
+    session_key = PAGE_SIZE_SESSION_KEY % (key or request.path)
+
+    try:
+        size = int(request.GET.get(name, ''))
+    except ValueError:
+        size = None
+
+    if size in sizes:
+        if session is not None and session.get(session_key) != size:
+            session[session_key] = size
+        return size
+
+    if session is not None:
+        size = session.get(session_key)
+        if size in sizes:
+            return size
+
+    if default in sizes:
+        return default
+    return sizes[0]
+
+
+def encode_cursor(direction, values):
+    # Dates, decimals and uuids as str(), which the model fields parse back
+    # without losing precision.
+    data = json.dumps([direction, values], default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Get (direction, values) of a cursor, None if it is invalid.
+    """
+    if cursor == LAST_PAGE:
+        return 'before', None
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, values = json.loads(data)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+    if direction not in ('after', 'before') or not isinstance(values, list):
+        return None
+    return direction, values
+
+
+def field_converter(model, name):
+    """Get the `to_python()` of the model field an ordering name refers to.
+
+    Follows `__` separated relations, other names, like annotations, are
+    left as they are.
+    """
+    field = None
+    for part in name.split('__'):
+        if field is not None:
+            model = field.related_model
+        if model is None:
+            return lambda value: value
+        opts = model._meta # pylint:disable=protected-access
+        try:
+            field = opts.pk if part == 'pk' else opts.get_field(part)
+        except FieldDoesNotExist:
+            return lambda value: value
+    if field.is_relation:
+        field = field.target_field
+    return field.to_python
+
+
+class CursorPaginator:
+    """Keyset pagination, the page is found with a WHERE on the ordering key.
+
+    Unlike OFFSET, the cost of a page does not depend on how deep it is. The
+    pages are identified by opaque cursors instead of numbers, there is no
+    total count.
+
+    The ordering defaults to the queryset ordering, or the model's
+    `Meta.ordering`, `pk` is added if it is missing to make the key unique.
+    The ordering fields should be indexed together and not nullable.
+
+    .. code-block:: python
+
+       paginator = CursorPaginator(AuditLog.objects.all(), 50,
+               ordering=('-created', 'pk'))
+       page = paginator.page(request.GET.get('page'))
+
+    """
+    def __init__(self, queryset, per_page, ordering=None):
+        ordering = list(ordering or queryset.query.order_by or\
+                queryset.model._meta.ordering or ('pk',))
+        for name in ordering:
+            if not isinstance(name, str):
+                raise ValueError("CursorPaginator orders by field names "
+                        "only, got %r." % (name,))
+        if not {'pk', '-pk'}.intersection(ordering):
+            ordering.append('pk')
+
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple((x.lstrip('-'), x.startswith('-'))\
+                for x in ordering)
+        # The key of each row is read from annotations, related fields
+        # included, without another query.
+        self.aliases = tuple(KEY_ALIAS % i for i in range(len(ordering)))
+        self.converters = tuple(field_converter(queryset.model, name)\
+                for (name, _) in self.fields)
+        self.queryset = queryset.order_by(*ordering).annotate(**{
+                alias: F(name) for alias, (name, _) in zip(self.aliases,
+                    self.fields)})
+
+
+    def page(self, cursor=None):
+        """Get the page of a cursor, the first page if it is empty or invalid.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        if position is None:
+            direction, values = 'after', None
+        else:
+            direction, values = position
+        if values is not None:
+            try:
+                values = self.parse_key(values)
+            except (ValidationError, ValueError, TypeError):
+                direction, values = 'after', None
+
+        queryset = self.queryset
+        if direction == 'before':
+            queryset = queryset.reverse()
+        if values is not None:
+            queryset = queryset.filter(self.seek(values, direction))
+
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'before':
+            rows.reverse()
+            has_previous = more
+            has_next = values is not None
+        else:
+            has_previous = values is not None
+            has_next = more
+
+        return CursorPage(self, rows, has_previous, has_next)
+
+
+    def parse_key(self, values):
+        """Convert the key values of a cursor with the model fields.
+
+        Cursors come from the query string, raise ValidationError, ValueError
+        or TypeError if they do not make a valid key.
+        """
+        if len(values) != len(self.fields):
+            raise ValueError("Cursor has %d values, expected %d." % (
+                    len(values), len(self.fields)))
+        key = []
+        for convert, value in zip(self.converters, values):
+            if value is not None:
+                value = convert(value)
+            if value is None:
+                raise ValueError("Cursor values cannot be None.")
+            key.append(value)
+        return key
+
+
+    def seek(self, values, direction):
+        """Get the filter for rows after (or before) the key `values`.
+        """
+        query = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.fields, values):
+            forward = descending == (direction == 'before')
+            query |= equal & Q(**{name + ('__gt' if forward else '__lt'):\
+                    value})
+            equal &= Q(**{name: value})
+        return query
+
+
+    def key(self, row):
+        """Get the ordering key of a row of the page.
+        """
+        if isinstance(row, dict):
+            return [row[alias] for alias in self.aliases]
+        return [getattr(row, alias) for alias in self.aliases]
+
+
+class CursorPage:
+    """A page of CursorPaginator.
+
+    `object_list` is the list of the rows in the page, in the paginator
+    ordering.
+    """
+    def __init__(self, paginator, object_list, has_previous, has_next):
+        self.paginator = paginator
+        self.object_list = object_list
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+
+    def has_next(self):
+        return self._has_next
+
+
+    def has_previous(self):
+        return self._has_previous
+
+
+    def has_other_pages(self):
+        return self._has_previous or self._has_next
+
+
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return encode_cursor('after',
+                self.paginator.key(self.object_list[-1]))
+
+
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return encode_cursor('before',
+                self.paginator.key(self.object_list[0]))
+
+
+    def pagination_links(self):
+        return {
+            'first': '' if self._has_previous else None,
+            'prev': self.previous_cursor(),
+            'next': self.next_cursor(),
+            'last': LAST_PAGE if self._has_next else None,
+        }
+
+
+    def pagination_summary(self):
+        return ''
+
+
+class NoCountPaginator:
+    """Numbered pages without counting the rows.
+
+    One more row than `per_page` is fetched to know whether there is a next
+    page, the last page and the total are unknown until it is reached.
+
+    .. code-block:: python
+
+       paginator = NoCountPaginator(AuditLog.objects.filter(...), 50)
+       page = paginator.get_page(request.GET.get('page'))
+
+    Unlike Django Paginator there is no `count`, `num_pages` or `page_range`,
+    reading them raises AttributeError.
+    """
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+
+    @property
+    def count(self):
+        raise AttributeError("NoCountPaginator doesn't count the rows")
+
+
+    @property
+    def num_pages(self):
+        raise AttributeError("NoCountPaginator doesn't know the number of "
+                "pages")
+
+
+    @property
+    def page_range(self):
+        raise AttributeError("NoCountPaginator doesn't know the number of "
+                "pages")
+
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(
+                    _("That page number is not an integer")) from None
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+
+    def page(self, number):
+        """Get a page, raise EmptyPage if there are no rows past page 1.
+        """
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        has_next = len(rows) > self.per_page
+        return NoCountPage(rows[:self.per_page], number, self, has_next)
+
+
+    def get_page(self, number):
+        """Get a page, the first page if `number` is invalid or out of range.
+        """
+        try:
+            return self.page(number)
+        except InvalidPage:
+            return self.page(1)
+
+
+class NoCountPage(Page):
+    """A page of NoCountPaginator.
+    """
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+
+    def __repr__(self):
+        return '<Page %s>' % self.number
+
+
+    def has_next(self):
+        return self._has_next
+
+
+    def next_page_number(self):
+        return self.number + 1
+
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+
+    def end_index(self):
+        return (self.number - 1) * self.paginator.per_page\
+                + len(self.object_list)
+
+
+    def pagination_links(self):
+        has_previous = self.number > 1
+        return {
+            'first': 1 if has_previous else None,
+            'prev': self.number - 1 if has_previous else None,
+            'next': self.number + 1 if self._has_next else None,
+            'last': None,
+        }
+
+
+    def pagination_summary(self):
+        values = {'start': self.start_index(), 'end': self.end_index()}
+        if self._has_next:
+            return _("%(start)s‑%(end)s of many") % values
+        # On the last page the total is known.
+        values['total'] = values['end']
+        return _("%(start)s‑%(end)s of %(total)s") % values
+
+
+class CachedCountPaginator(Paginator):
+    """Django Paginator keeping the row count in the cache.
+
+    The count is shared by the paginators of the same query, until it expires
+    after `count_timeout` seconds, `MATERIALWEB_COUNT_TIMEOUT` by default.
+    Other rows may have been added or deleted since, the pagination bar shows
+    a count taken from the cache as approximate.
+    """
+    def __init__(self, object_list, per_page, orphans=0,
+            allow_empty_first_page=True, count_timeout=None):
+
+        super().__init__(object_list, per_page, orphans,
+                allow_empty_first_page)
+        if count_timeout is None:
+            count_timeout = get_setting('MATERIALWEB_COUNT_TIMEOUT')
+        self.count_timeout = count_timeout
+        self.count_is_exact = True
+        "Whether `count` was computed now rather than taken from the cache."
+
+
+    def count_key(self):
+        """Get the cache key of the count, None if it cannot be cached.
+        """
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return None
+        # Ordering does not change the count.
+        queryset = self.object_list.order_by()
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        database = queryset.db or router.db_for_read(queryset.model)
+        return 'materialweb.count.' + md5(repr((database, sql, params))\
+                .encode()).hexdigest()
+
+
+    @cached_property
+    def count(self):
+        key = self.count_key()
+        if key is None:
+            return super().count
+
+        cache = get_cache()
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, self.count_timeout)
+        else:
+            self.count_is_exact = False
+        return count
+
+
+    def _get_page(self, *args, **kwargs):
+        return CachedCountPage(*args, **kwargs)
+
+
+class CachedCountPage(Page):
+    """A page of CachedCountPaginator.
+    """
+    def pagination_summary(self):
+        values = {
+            'start': self.start_index(),
+            'end': self.end_index(),
+            'total': self.paginator.count,
+        }
+        if self.paginator.count_is_exact:
+            return _("%(start)s‑%(end)s of %(total)s") % values
+        return _("%(start)s‑%(end)s of about %(total)s") % values
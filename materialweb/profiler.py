@@ -0,0 +1,256 @@
+"""Measure the time spent rendering each materialweb component.
+
+Enabled with the `MATERIALWEB_PROFILE` setting, which swaps the render
+method of :code:`Node` at startup, there is no cost when it is disabled.
+Then add the middleware:
+
+.. code-block:: python
+
+   MATERIALWEB_PROFILE = True
+
+   MIDDLEWARE = [
+       'materialweb.profiler.ProfilerMiddleware',
+       ...
+   ]
+
+For each request and each component class and mode it records the number of
+renders, the cumulative time, the time excluding child components, and the
+size of the output in UTF-8 bytes, children included. The middleware can log
+the results, send them in the `Server-Timing` header, and append them to the
+file set in `MATERIALWEB_PROFILE_FILE`, to be summed up later with
+:code:`manage.py materialweb_profile`.
+
+Streaming responses are rendered after the middleware returned, and are not
+measured.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+from threading import Lock
+from time import perf_counter
+#-
+from django.core.exceptions import MiddlewareNotUsed
+#-
+from .conf import get_setting
+from .tags.base import Node
+
+_logger = logging.getLogger(__name__)
+
+_current = ContextVar('materialweb_profile', default=None)
+"Profile of the request being handled."
+
+_file_lock = Lock()
+
+_original_render_into = Node.render_into
+_original_render_state = Node.render_state
+
+
+class Stats:
+    """Render statistics of one component class and mode.
+    """
+    __slots__ = ('calls', 'cumulative', 'self', 'bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.cumulative = 0.0
+        self.self = 0.0
+        self.bytes = 0
+
+
+    def as_dict(self):
+        """Get the statistics as a dict, for JSON.
+        """
+        return {
+            'calls': self.calls,
+            'cumulative': self.cumulative,
+            'self': self.self,
+            'bytes': self.bytes,
+        }
+
+
+class Frame:
+    """A component being rendered.
+    """
+    __slots__ = ('component', 'mode', 'children', 'bytes')
+
+    def __init__(self, component):
+        self.component = component
+        self.mode = None
+        self.children = 0.0
+        self.bytes = 0
+
+
+class Profile:
+    """Render statistics collected during one request.
+    """
+    def __init__(self):
+        self.stats = {}
+        "Stats keyed by (component, mode)."
+        self.stack = []
+
+
+    def add(self, frame, duration):
+        """Record the render of a component that took `duration` seconds.
+
+        The duration is added to the children time of the parent frame.
+        """
+        key = (frame.component, frame.mode)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = Stats()
+        stats.calls += 1
+        stats.cumulative += duration
+        stats.self += duration - frame.children
+        stats.bytes += frame.bytes
+
+        if self.stack:
+            self.stack[-1].children += duration
+
+
+    def total(self):
+        """Time spent in the outermost components.
+        """
+        return sum(stats.self for stats in self.stats.values())
+
+
+    def sorted(self):
+        """Get ((component, mode), Stats) pairs, most expensive first.
+        """
+        return sorted(self.stats.items(), key=lambda x: x[1].self,
+                reverse=True)
+
+
+    def as_list(self):
+        """Get the statistics as a list of dicts, most expensive first.
+        """
+        return [dict(component=component, mode=mode, **stats.as_dict())\
+                for ((component, mode), stats) in self.sorted()]
+
+
+@contextmanager
+def profile():
+    """Collect render statistics of the code in the with block.
+
+    .. code-block:: python
+
+       with profile() as result:
+           template.render(context)
+       print(result.as_list())
+
+    """
+    result = Profile()
+    token = _current.set(result)
+    try:
+        yield result
+    finally:
+        _current.reset(token)
+
+
+def component_name(node):
+    """Get the name of the component class, with its module, of a Node.
+    """
+    return '%s.%s' % (type(node).__module__.rsplit('.', 1)[-1],
+            type(node).__name__)
+
+
+def _render_into(self, context, write):
+    current = _current.get()
+    if current is None:
+        _original_render_into(self, context, write)
+        return
+
+    frame = Frame(component_name(self))
+
+    def _write(value):
+        frame.bytes += len(value.encode())
+        write(value)
+
+    current.stack.append(frame)
+    start = perf_counter()
+    try:
+        _original_render_into(self, context, _write)
+    finally:
+        duration = perf_counter() - start
+        current.stack.pop()
+        current.add(frame, duration)
+
+
+def _render_state(self, context):
+    state = _original_render_state(self, context)
+    current = _current.get()
+    if current is not None and current.stack\
+            and current.stack[-1].mode is None:
+        current.stack[-1].mode = state.mode
+    return state
+
+
+def install():
+    """Swap the render methods of Node with measuring ones.
+    """
+    Node.render_into = _render_into
+    Node.render_state = _render_state
+
+
+def uninstall():
+    """Restore the render methods of Node.
+    """
+    Node.render_into = _original_render_into
+    Node.render_state = _original_render_state
+
+
+def server_timing(result, limit=10):
+    """Format the most expensive components as `Server-Timing` header.
+    """
+    metrics = ['mw;dur=%.3f;desc="materialweb"' % (result.total() * 1000)]
+    for index, ((component, mode), stats) in\
+            enumerate(result.sorted()[:limit]):
+        metrics.append('mw%d;dur=%.3f;desc="%s %s x%d"' % (index,
+                stats.self * 1000, component, mode, stats.calls))
+    return ', '.join(metrics)
+
+
+class ProfilerMiddleware:
+    """Collect render statistics for each request.
+    """
+    def __init__(self, get_response):
+        if not get_setting('MATERIALWEB_PROFILE'):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.log = get_setting('MATERIALWEB_PROFILE_LOG')
+        self.server_timing = get_setting('MATERIALWEB_PROFILE_SERVER_TIMING')
+        self.filename = get_setting('MATERIALWEB_PROFILE_FILE')
+
+
+    def __call__(self, request):
+        with profile() as result:
+            response = self.get_response(request)
+            # Render TemplateResponse while profiling.
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+
+        if not result.stats:
+            return response
+
+        if self.log:
+            for (component, mode), stats in result.sorted():
+                _logger.info("%s %s %s: %d calls, %.3f ms, %.3f ms self, "
+                        "%d bytes", request.path, component, mode,
+                        stats.calls, stats.cumulative * 1000,
+                        stats.self * 1000, stats.bytes)
+
+        if self.server_timing:
+            response['Server-Timing'] = server_timing(result)
+
+        if self.filename:
+            record = json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'stats': result.as_list(),
+            })
+            with _file_lock:
+                with open(self.filename, 'a', encoding='utf-8') as f:
+                    f.write(record + '\n')
+
+        return response
@@ -0,0 +1,170 @@
+"""Choices of a :code:`Select` searched on the server, for large choice sets.
+
+Register the choices under a name, and give the name to the `remote`
+argument of :code:`Select`. The page gets only the current value and the
+first options, the others are fetched from the `materialweb:choices` view as
+the user types.
+
+.. code-block:: python
+
+   from materialweb.remote import QuerySetChoices, register
+
+   register('customers', QuerySetChoices(Customer.objects.all(), 'name'))
+
+.. code-block:: jinja
+
+   {% Select form.customer remote="customers" %}{% endSelect %}
+
+The view answers only authenticated users, unless the choices are created
+with `public=True`. Override `has_permission()` for other rules. The
+script `materialweb/remote-select.js` in the static files fetches the
+choices as the user types.
+"""
+from bisect import bisect_left
+#-
+from django.core.exceptions import ImproperlyConfigured
+
+_choices = {}
+"Registered choices, keyed by name."
+
+
+def register(name, choices):
+    """Register the choices searched under `name`.
+    """
+    _choices[name] = choices
+    return choices
+
+
+def get_choices(name):
+    """Get the choices registered under `name`.
+    """
+    try:
+        return _choices[name]
+    except KeyError:
+        raise ImproperlyConfigured("No remote choices named %r." % name)\
+                from None
+
+
+class Choices:
+    """Searchable choices, a list of (value, label) pairs.
+    """
+    limit = 20
+    "Maximum number of choices returned by a search."
+    public = False
+    "Whether anonymous users can search these choices in the view."
+
+    def has_permission(self, request):
+        """Whether `request` can search these choices in the view.
+
+        Authenticated users only, or everyone if `public`.
+        """
+        if self.public:
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_authenticated)
+
+
+    def search(self, term, limit=None):
+        """Get the choices whose label matches `term`, in label order.
+        """
+        raise NotImplementedError()
+
+
+    def labels(self, values):
+        """Get the labels of `values`, keyed by str(value).
+        """
+        raise NotImplementedError()
+
+
+    def initial(self, value, limit=None):
+        """Get the choices rendered with the page, `value` first.
+        """
+        choices = self.search('', limit)
+        if value in (None, ''):
+            return choices
+
+        value = str(value)
+        label = self.labels([value]).get(value)
+        if label is None:
+            return choices
+        return [(value, label)] + [x for x in choices if str(x[0]) != value]
+
+
+class QuerySetChoices(Choices):
+    """Choices searched in the database.
+
+    The rows whose `field` starts with the search term, `match='contains'` for
+    anywhere in the field. An index on `field` makes the prefix search fast,
+    on PostgreSQL an index on `UPPER(field)` with the `text_pattern_ops`
+    operator class.
+    """
+    def __init__(self, queryset, field, match='startswith', value='pk',
+            label=str, limit=None, public=False):
+        if match not in ('startswith', 'contains'):
+            raise ImproperlyConfigured("match must be startswith or contains.")
+
+        self.queryset = queryset
+        self.field = field
+        self.lookup = '%s__i%s' % (field, match)
+        self.value = value
+        self.label = label
+        if limit is not None:
+            self.limit = limit
+        self.public = public
+
+
+    def search(self, term, limit=None):
+        queryset = self.queryset.order_by(self.field, self.value)
+        if term:
+            queryset = queryset.filter(**{self.lookup: term})
+        return [(getattr(item, self.value), self.label(item))\
+                for item in queryset[:limit or self.limit]]
+
+
+    def labels(self, values):
+        queryset = self.queryset.filter(**{self.value + '__in': values})
+        return {str(getattr(item, self.value)): self.label(item)\
+                for item in queryset}
+
+
+class StaticChoices(Choices):
+    """Choices searched in memory, for a fixed list.
+
+    Sorted by label once, a prefix search is a binary search.
+    """
+    def __init__(self, choices, match='startswith', limit=None,
+            public=False):
+        if match not in ('startswith', 'contains'):
+            raise ImproperlyConfigured("match must be startswith or contains.")
+
+        self.choices = sorted(((str(label).casefold(), value, label)\
+                for value, label in choices), key=lambda x: x[0])
+        self.keys = [x[0] for x in self.choices]
+        self.by_value = {str(value): label for _, value, label in self.choices}
+        self.match = match
+        if limit is not None:
+            self.limit = limit
+        self.public = public
+
+
+    def search(self, term, limit=None):
+        limit = limit or self.limit
+        term = term.casefold()
+        if self.match == 'contains':
+            found = (x for x in self.choices if term in x[0])
+        else:
+            start = bisect_left(self.keys, term)
+            found = (x for x in self.choices[start:start + limit]\
+                    if x[0].startswith(term))
+
+        result = []
+        for _, value, label in found:
+            result.append((value, label))
+            if len(result) >= limit:
+                break
+        return result
+
+
+    def labels(self, values):
+        return {str(value): self.by_value[str(value)] for value in values\
+                if str(value) in self.by_value}
@@ -0,0 +1,128 @@
+"""Django form renderer drawing the forms with materialweb components.
+
+.. code-block:: python
+
+   FORM_RENDERER = 'materialweb.renderers.MaterialFormRenderer'
+
+Then :code:`{{ form }}` renders like :code:`{% Form form %}`, and
+:code:`{{ form.name.as_field_group }}` renders that field alone. Formsets
+keep the Django templates, their forms are rendered here.
+
+The input and textarea widgets are rendered in Python, with the markup of
+the Django templates, instead of a template and an include each.
+"""
+from functools import lru_cache
+#-
+from django.forms.renderers import DjangoTemplates
+from django.template import Context, Variable
+from django.utils.html import conditional_escape, escape
+from django.utils.safestring import SafeData, mark_safe
+#-
+from .tags.base import PageState, id_prefix
+from .tags.form import Form, write_field
+
+INPUT_TEMPLATES = frozenset('django/forms/widgets/%s.html' % x for x in (
+        'checkbox', 'color', 'date', 'datetime', 'email', 'file', 'hidden',
+        'input', 'number', 'password', 'search', 'tel', 'text', 'time',
+        'url'))
+"Widget templates made of `django/forms/widgets/input.html` only."
+
+TEXTAREA_TEMPLATE = 'django/forms/widgets/textarea.html'
+
+
+@lru_cache(maxsize=None)
+def form_node(mode):
+    """Get the Form Node rendering the `form` context variable.
+    """
+    return Form(Variable('form'), mode=mode)
+
+
+def format_value(value):
+    """Same as `{{ value|stringformat:'s' }}`.
+    """
+    if isinstance(value, SafeData):
+        return value
+    return escape(str(value))
+
+
+def form_context(context, form):
+    """Get the template Context rendering `form`.
+
+    The renderer does not see the page the form is in, the element ids get
+    a prefix of their own, from the form class and its prefix, so that they
+    stay unique when the page has several forms.
+    """
+    context = Context(context)
+    form_class = type(form)
+    context.materialweb_page = PageState(id_prefix('%s.%s:%s' % (
+            form_class.__module__, form_class.__qualname__, form.prefix)))
+    return context
+
+
+def render_attrs(attrs):
+    """Same as `django/forms/widgets/attrs.html`.
+    """
+    return ''.join(\
+            ' %s' % conditional_escape(name) if value is True else\
+            ' %s="%s"' % (conditional_escape(name), format_value(value))\
+            for name, value in attrs.items() if value is not False)
+
+
+def render_input(widget):
+    """Same as `django/forms/widgets/input.html`.
+    """
+    if widget['value'] is None:
+        value = ''
+    else:
+        value = ' value="%s"' % format_value(widget['value'])
+    return '<input type="%s" name="%s"%s%s>' % (
+            conditional_escape(widget['type']),
+            conditional_escape(widget['name']), value,
+            render_attrs(widget['attrs']))
+
+
+def render_textarea(widget):
+    """Same as `django/forms/widgets/textarea.html`.
+    """
+    return '<textarea name="%s"%s>\n%s</textarea>' % (
+            conditional_escape(widget['name']),
+            render_attrs(widget['attrs']),
+            conditional_escape(widget['value']) if widget['value'] else '')
+
+
+class MaterialFormRenderer(DjangoTemplates):
+    """Render forms and fields with :code:`Form`, in Python.
+
+    Forms with their own `template_name` still use that template.
+    """
+    form_template_name = 'materialweb/form.html'
+    "Stands for :code:`{% Form form %}`, there is no such template."
+    field_template_name = 'materialweb/field.html'
+    "Stands for one field of :code:`{% Form form %}`."
+
+    mode = 'filled'
+    "Variant of the text fields and selects, 'filled' or 'outlined'."
+
+    python_widgets = True
+    """Render the input and textarea widgets in Python, set to False if your
+    templates override the Django widget templates."""
+
+    def render(self, template_name, context, request=None):
+        if self.python_widgets:
+            if template_name in INPUT_TEMPLATES:
+                return render_input(context['widget'])
+            if template_name == TEXTAREA_TEMPLATE:
+                return render_textarea(context['widget'])
+
+        if template_name == self.form_template_name:
+            return mark_safe(form_node(self.mode).render(
+                    form_context(context, context['form'])).strip())
+
+        if template_name == self.field_template_name:
+            field = context['field']
+            chunks = []
+            write_field(form_context(context, field.form), field, self.mode,
+                    chunks.append)
+            return mark_safe(''.join(chunks).strip())
+
+        return super().render(template_name, context, request)
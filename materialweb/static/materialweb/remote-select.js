@@ -0,0 +1,80 @@
+/* Remote search for {% Select remote="..." %}, see materialweb.remote.
+ *
+ * Typing in a select fetches the matching choices from the url in its
+ * data-remote-url attribute, and replaces the items of its list.
+ *
+ *   <script src="{% static 'materialweb/remote-select.js' %}"></script>
+ *   <script>
+ *     document.querySelectorAll('.mdc-select').forEach(function (el) {
+ *       var select = new mdc.select.MDCSelect(el);
+ *       materialwebRemoteSelect(el, select);
+ *     });
+ *   </script>
+ *
+ * The MDCSelect instance is optional, it is told to read the new items.
+ */
+(function (global) {
+  'use strict';
+
+  var DELAY = 250;
+  // Milliseconds, wait for the user to stop typing before searching.
+  var RESET = 1000;
+  // Milliseconds, a key typed after this long starts a new search term.
+
+  function attach(root, mdcSelect) {
+    var anchor = root.querySelector('[data-remote-url]');
+    if (!anchor) {
+      return;
+    }
+    var list = root.querySelector('.mdc-list');
+    var url = anchor.getAttribute('data-remote-url');
+    var term = '';
+    var lastKey = 0;
+    var timer = null;
+    var request = 0;
+
+    function search() {
+      var current = ++request;
+      var query = url + (url.indexOf('?') < 0 ? '?' : '&') +
+          'format=html&q=' + encodeURIComponent(term);
+      fetch(query, {credentials: 'same-origin'})
+        .then(function (response) {
+          if (!response.ok) {
+            throw new Error(response.status);
+          }
+          return response.text();
+        })
+        .then(function (html) {
+          // An older search answering late is ignored.
+          if (current !== request) {
+            return;
+          }
+          list.innerHTML = html;
+          if (mdcSelect) {
+            mdcSelect.layoutOptions();
+          }
+        })
+        .catch(function () {});
+    }
+
+    root.addEventListener('keydown', function (event) {
+      var now = Date.now();
+      if (now - lastKey > RESET) {
+        term = '';
+      }
+      if (event.key === 'Backspace') {
+        term = term.slice(0, -1);
+      } else if (event.key.length === 1 && !event.ctrlKey &&
+          !event.metaKey && !event.altKey) {
+        term += event.key;
+      } else {
+        return;
+      }
+      lastKey = now;
+      clearTimeout(timer);
+      timer = setTimeout(search, DELAY);
+    }, true);
+  }
+
+  global.materialwebRemoteSelect = attach;
+})(window);
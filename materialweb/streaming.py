@@ -0,0 +1,251 @@
+"""Render templates incrementally, for StreamingHttpResponse.
+
+Template Tags provided by materialweb yield their output piece by piece with
+`render_iter()`. The Django Template Tags a page layout is usually made of,
+`extends`, `block`, `for`, `if` and `with`, are rendered the same way here.
+Anything else is rendered as a whole and yielded as one chunk.
+
+.. code-block:: python
+
+   from materialweb.streaming import StreamingTemplateView
+
+   class ReportView(StreamingTemplateView):
+       template_name = 'report.html'
+
+"""
+from django.http import StreamingHttpResponse
+from django.template import loader
+from django.template.base import TextNode, VariableDoesNotExist
+from django.template.context import make_context
+from django.template.defaulttags import ForNode, IfNode, WithNode
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockContext,\
+        BlockNode, ExtendsNode
+from django.views.generic import TemplateView
+
+_renderers = {}
+"Generator functions rendering Django Template Tags, keyed by Node class."
+
+
+def register(node_class):
+    """Decorator, register a generator function rendering `node_class`.
+    """
+    def _decorator(func):
+        _renderers[node_class] = func
+        return func
+    return _decorator
+
+
+def annotate_exception(node, context, exc):
+    """Add template debug information to `exc`, see `render_annotated()`.
+    """
+    if context.template.engine.debug\
+            and not hasattr(exc, 'template_debug')\
+            and context.render_context.template.origin == node.origin:
+        exc.template_debug = context.render_context.template\
+                .get_exception_info(exc, node.token)
+
+
+def iter_node(node, context):
+    """Render a template Node, yield the output in chunks.
+    """
+    try:
+        render_iter = getattr(node, 'render_iter', None)
+        if render_iter is not None:
+            yield from render_iter(context)
+            return
+
+        renderer = _renderers.get(type(node))
+        if renderer is None:
+            yield node.render(context)
+        else:
+            yield from renderer(node, context)
+    except Exception as e:
+        annotate_exception(node, context, e)
+        raise
+
+
+def iter_nodelist(nodelist, context):
+    """Render a NodeList, yield the output in chunks.
+    """
+    for node in nodelist:
+        yield from iter_node(node, context)
+
+
+@register(ForNode)
+def iter_for(node, context):
+    if 'forloop' in context:
+        parentloop = context['forloop']
+    else:
+        parentloop = {}
+    with context.push():
+        values = node.sequence.resolve(context, ignore_failures=True)
+        if values is None:
+            values = []
+        if not hasattr(values, '__len__'):
+            values = list(values)
+        len_values = len(values)
+        if len_values < 1:
+            yield from iter_nodelist(node.nodelist_empty, context)
+            return
+        if node.is_reversed:
+            values = reversed(values)
+        num_loopvars = len(node.loopvars)
+        unpack = num_loopvars > 1
+
+        loop_dict = context['forloop'] = {'parentloop': parentloop}
+        for i, item in enumerate(values):
+            loop_dict['counter0'] = i
+            loop_dict['counter'] = i + 1
+            loop_dict['revcounter'] = len_values - i
+            loop_dict['revcounter0'] = len_values - i - 1
+            loop_dict['first'] = i == 0
+            loop_dict['last'] = i == len_values - 1
+
+            pop_context = False
+            if unpack:
+                try:
+                    len_item = len(item)
+                except TypeError: # not an iterable
+                    len_item = 1
+                if num_loopvars != len_item:
+                    raise ValueError(
+                            "Need {} values to unpack in for loop; got {}. "\
+                            .format(num_loopvars, len_item))
+                context.update(dict(zip(node.loopvars, item)))
+                pop_context = True
+            else:
+                context[node.loopvars[0]] = item
+
+            yield from iter_nodelist(node.nodelist_loop, context)
+
+            if pop_context:
+                context.pop()
+
+
+@register(IfNode)
+def iter_if(node, context):
+    for condition, nodelist in node.conditions_nodelists:
+        if condition is not None:
+            try:
+                match = condition.eval(context)
+            except VariableDoesNotExist:
+                match = None
+        else:
+            match = True
+
+        if match:
+            yield from iter_nodelist(nodelist, context)
+            return
+
+
+@register(WithNode)
+def iter_with(node, context):
+    values = {key: val.resolve(context)\
+            for key, val in node.extra_context.items()}
+    with context.push(**values):
+        yield from iter_nodelist(node.nodelist, context)
+
+
+@register(BlockNode)
+def iter_block(node, context):
+    block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+    with context.push():
+        if block_context is None:
+            context['block'] = node
+            yield from iter_nodelist(node.nodelist, context)
+            return
+
+        push = block = block_context.pop(node.name)
+        if block is None:
+            block = node
+        # New block so it can store the context, same as BlockNode.render().
+        block = type(node)(block.name, block.nodelist)
+        block.context = context
+        context['block'] = block
+        yield from iter_nodelist(block.nodelist, context)
+        if push is not None:
+            block_context.push(node.name, push)
+
+
+@register(ExtendsNode)
+def iter_extends(node, context):
+    compiled_parent = node.get_parent(context)
+
+    if BLOCK_CONTEXT_KEY not in context.render_context:
+        context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+    block_context = context.render_context[BLOCK_CONTEXT_KEY]
+    block_context.add_blocks(node.blocks)
+
+    # The root template's blocks need to be added too.
+    for child in compiled_parent.nodelist:
+        if not isinstance(child, TextNode):
+            if not isinstance(child, ExtendsNode):
+                block_context.add_blocks({n.name: n for n in\
+                        compiled_parent.nodelist.get_nodes_by_type(BlockNode)})
+            break
+
+    with context.render_context.push_state(compiled_parent,
+            isolated_context=False):
+        yield from iter_nodelist(compiled_parent.nodelist, context)
+
+
+def iter_template(template, context=None, request=None):
+    """Render a template loaded with `get_template()`, yield the output.
+    """
+    # Use the base.Template of a backends.django.Template.
+    engine = template.backend.engine
+    template = template.template
+    context = make_context(context, request, autoescape=engine.autoescape)
+
+    with context.render_context.push_state(template):
+        with context.bind_template(template):
+            context.template_name = template.name
+            yield from iter_nodelist(template.nodelist, context)
+
+
+def buffered(chunks, size):
+    """Join small chunks until they are at least `size` characters.
+    """
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+class StreamingTemplateResponse(StreamingHttpResponse):
+    """Send a rendered template while it is still being rendered.
+
+    Takes the same arguments as TemplateResponse, so it can be used as
+    `response_class` of a TemplateView. Unlike TemplateResponse the template
+    is rendered as the response is being sent, it cannot be modified by
+    middlewares after the view returned.
+    """
+    chunk_size = 8192
+    "Send the output in chunks of at least this many characters."
+
+    def __init__(self, request, template, context=None, content_type=None,
+            status=None, charset=None, using=None, headers=None):
+
+        if isinstance(template, (list, tuple)):
+            template = loader.select_template(template, using=using)
+        elif isinstance(template, str):
+            template = loader.get_template(template, using=using)
+
+        super().__init__(
+                buffered(iter_template(template, context, request),
+                    self.chunk_size),
+                content_type=content_type, status=status, charset=charset,
+                headers=headers)
+
+
+class StreamingTemplateView(TemplateView):
+    """TemplateView sending a StreamingTemplateResponse.
+    """
+    response_class = StreamingTemplateResponse
@@ -67,13 +67,12 @@ class Banner(Node):
     MODES = ('default', 'stacked')
     "Available variants."
 
-    def prepare(self):
-        if self.mode == 'stacked':
-            self.values['class'].append('mdc-banner--mobile-stacked')
+    def prepare(self, state):
+        if state.mode == 'stacked':
+            state.values['class'].append('mdc-banner--mobile-stacked')
 
 
-    @property
-    def template(self):
+    def template(self, state):
         return '''
 <{tag} class="mdc-banner {class}" role="banner" {props}>
   <div class="mdc-banner__content" role="status" aria-live="assertive">
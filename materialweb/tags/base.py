@@ -1,10 +1,379 @@
+from datetime import date, time
+from decimal import Decimal
+from functools import lru_cache
+from hashlib import md5
+from itertools import chain
 import logging
-from uuid import uuid4
+import re
+from string import Formatter
+from uuid import UUID, uuid4
+from zlib import crc32
 #-
 from django import template
-from django.template.base import TextNode # pylint:disable=unused-import
+from django.dispatch import receiver
+from django.forms import BoundField
+from django.template.context import RenderContext
+from django.template.defaulttags import CommentNode, LoadNode
+from django.test.signals import setting_changed
+from django.template.base import NodeList, TextNode # pylint:disable=unused-import
+from django.utils import timezone, translation
+from django.utils.functional import Promise
+from django.utils.module_loading import import_string
+from django.utils.translation import get_language
+from django.templatetags.i18n import TranslateNode
+#-
+from ..cache import get_fragment
+from ..conf import get_setting
+from ..streaming import annotate_exception, iter_nodelist
 
 _logger = logging.getLogger(__name__)
+_formatter = Formatter()
+
+_compiled_templates = {}
+"Compiled templates keyed by (Node class, mode)."
+
+SVG_SYMBOLS = {
+    'mw-checkmark': '<path id="mw-checkmark" fill="none" '\
+            'd="M1.73,12.91 8.1,19.28 22.79,4.59"/>',
+    'mw-dropdown-inactive': '<polygon id="mw-dropdown-inactive" '\
+            'stroke="none" fill-rule="evenodd" points="7 10 12 15 17 10"/>',
+    'mw-dropdown-active': '<polygon id="mw-dropdown-active" '\
+            'stroke="none" fill-rule="evenodd" points="7 15 12 10 17 15"/>',
+}
+"Shared SVG shapes of the MATERIALWEB_SVG_SPRITE setting, keyed by id."
+
+_svg_shapes = {re.search(r'\b(?:d|points)="([^"]*)"', markup).group(1): name\
+        for (name, markup) in SVG_SYMBOLS.items()}
+_svg_shape = re.compile(r'<(path|polygon)\b[^>]*?\b(?:d|points)="(%s)"[^>]*?'
+        r'(?:/>|>\s*</\1>)' % '|'.join(map(re.escape, _svg_shapes)))
+_svg_class = re.compile(r'\bclass="([^"]*)"')
+
+_tag_space = re.compile(r'(?<=>)\s*\n\s*(?=[<{])|(?<=[>}])\s*\n\s*(?=<)')
+_line_space = re.compile(r'\s*\n\s*')
+
+
+def minify(text):
+    """Remove the line breaks and indentation of a template.
+
+    Removed between tags, or between a tag and a field, elsewhere they are
+    replaced with a space. Values of the fields are left alone.
+    """
+    text = _tag_space.sub('', text.strip())
+    return _line_space.sub(' ', text)
+
+
+def svg_uses(text):
+    """Replace the inline SVG shapes found in SVG_SYMBOLS with `<use>`.
+
+    The class of the shape is kept on the `<use>` element, stroke and fill
+    set by CSS are inherited by the shared shape. Returns the text and the
+    ids of the shapes it needs.
+    """
+    symbols = []
+
+    def _use(match):
+        name = _svg_shapes[match.group(2)]
+        if name not in symbols:
+            symbols.append(name)
+        classes = _svg_class.search(match.group(0))
+        if classes is None:
+            return '<use href="#%s"/>' % name
+        return '<use href="#%s" class="%s"/>' % (name, classes.group(1))
+
+    return _svg_shape.sub(_use, text), tuple(symbols)
+
+
+def svg_sprite(page, symbols):
+    """Get the definitions of the `symbols` not yet written in this page.
+
+    Nothing is written if the page is a cached fragment, the page it is used
+    in writes the definitions instead, see `Node.render_cached()`.
+    """
+    missing = [x for x in symbols if x not in page.symbols]
+    if not missing:
+        return ''
+    page.symbols.update(missing)
+    if not page.sprite:
+        return ''
+    return '<svg aria-hidden="true" width="0" height="0" '\
+            'style="position:absolute"><defs>%s</defs></svg>' % ''.join(
+            SVG_SYMBOLS[x] for x in missing)
+
+
+class CompiledTemplate:
+    """Format string parsed once into literal chunks and field slots.
+
+    Rendering copies the chunks, fills in the slots and joins them, which is
+    what `str.format()` does except the parsing.
+
+    With the MATERIALWEB_MINIFY setting the template is minified first. With
+    the MATERIALWEB_SVG_SPRITE setting the shared SVG shapes are replaced
+    with references, listed in `symbols`.
+    """
+    __slots__ = ('text', 'chunks', 'slots', 'symbols')
+
+    def __init__(self, text):
+        if get_setting('MATERIALWEB_MINIFY'):
+            text = minify(text)
+        if get_setting('MATERIALWEB_SVG_SPRITE'):
+            text, self.symbols = svg_uses(text)
+        else:
+            self.symbols = ()
+        self.text = text
+        self.chunks = []
+        self.slots = []
+
+        for literal, name, spec, conversion in _formatter.parse(text):
+            if literal:
+                self.chunks.append(literal)
+            if name is None:
+                continue
+            if not name.isidentifier() or spec or conversion:
+                # Leave anything fancier than {name} to str.format().
+                self.chunks = None
+                self.slots = None
+                return
+            self.slots.append((len(self.chunks), name))
+            self.chunks.append(None)
+
+
+    def format(self, values):
+        if self.chunks is None:
+            return self.text.format(**values)
+
+        chunks = self.chunks[:]
+        for index, name in self.slots:
+            chunks[index] = str(values[name])
+        return ''.join(chunks)
+
+
+    def write(self, values, write, child=None):
+        """Pass the rendered template to `write()` piece by piece.
+
+        The `{child}` field calls `child()` instead, which writes the
+        children itself, so their output is never copied into this one.
+        """
+        if self.chunks is None:
+            if child is not None:
+                chunks = []
+                child(chunks.append)
+                values = dict(values, child=''.join(chunks))
+            write(self.format(values))
+            return
+
+        slots = iter(self.slots)
+        index, name = next(slots, (None, None))
+        for position, chunk in enumerate(self.chunks):
+            if position != index:
+                write(chunk)
+                continue
+            if name == 'child' and child is not None:
+                child(write)
+            else:
+                write(str(values[name]))
+            index, name = next(slots, (None, None))
+
+
+    def iter(self, values, child=None):
+        """Yield the rendered template piece by piece.
+
+        Same as `write()`, the `{child}` field yields from `child()`.
+        """
+        if self.chunks is None:
+            if child is not None:
+                values = dict(values, child=''.join(child()))
+            yield self.format(values)
+            return
+
+        slots = iter(self.slots)
+        index, name = next(slots, (None, None))
+        for position, chunk in enumerate(self.chunks):
+            if position != index:
+                yield chunk
+                continue
+            if name == 'child' and child is not None:
+                yield from child()
+            else:
+                yield str(values[name])
+            index, name = next(slots, (None, None))
+
+
+@lru_cache(maxsize=256)
+def compile_template(text):
+    """Get the CompiledTemplate of a format string.
+    """
+    return CompiledTemplate(text)
+
+
+_missing = object()
+
+
+class PageState:
+    """Values shared by every Node in one render of a template.
+
+    Stored on the template Context, copies of it made by `{% include %}` or
+    `Context.new()` share the same PageState.
+    """
+    __slots__ = ('id_prefix', 'last_id', 'scope', 'symbols', 'sprite',
+            'memo')
+
+    def __init__(self, prefix):
+        self.id_prefix = prefix
+        self.last_id = 0
+        self.scope = {}
+        "Values provided by the parent Template Tags being rendered."
+        self.symbols = set()
+        "Ids of the shared SVG shapes already written, see `svg_sprite()`."
+        self.sprite = True
+        "Write the shared SVG shapes, False in cached fragments."
+        self.memo = {}
+        "Values computed once per page, like the choices of a Select."
+
+
+REQUEST_RENDERS = '_materialweb_renders'
+"Request attribute counting the renders of each id prefix."
+
+
+def page_state(context):
+    """Get the PageState of the render `context` belongs to.
+    """
+    try:
+        return context.materialweb_page
+    except AttributeError:
+        name = getattr(context.template, 'name', None)
+        prefix = id_prefix(name)
+        request = getattr(context, 'request', None)
+        if request is not None:
+            # Separate renders of a template into the same page, with
+            # render_to_string(), would repeat the element ids.
+            renders = request.__dict__.setdefault(REQUEST_RENDERS, {})
+            count = renders.get(prefix, 0)
+            renders[prefix] = count + 1
+            if count:
+                prefix = '%s-%d' % (prefix, count)
+        page = context.materialweb_page = PageState(prefix)
+        return page
+
+
+def id_prefix(name):
+    """Element id prefix scoped to a template name.
+    """
+    if not name:
+        return 'mw'
+    return 'mw%x' % (crc32(name.encode()) & 0xffffff)
+
+
+def sequential_id(context):
+    """Element id generator, a counter per template render.
+
+    The same page renders the same ids every time, which keeps responses
+    cacheable and comparable. The prefix comes from the template name, a
+    template rendered several times for one request, each time with a new
+    Context, gets a numbered prefix after the first render. That is only
+    known when the request is given to the render, like
+    :code:`render_to_string(name, context, request)`; without it the renders
+    repeat the same ids.
+    """
+    page = page_state(context)
+    page.last_id += 1
+    return '%s-%d' % (page.id_prefix, page.last_id)
+
+
+def random_id(context): # pylint:disable=unused-argument
+    """Element id generator using uuid4().
+    """
+    return uuid4().hex
+
+
+@lru_cache(maxsize=None)
+def get_id_generator():
+    """Get the callable configured by MATERIALWEB_ID_GENERATOR.
+    """
+    return import_string(get_setting('MATERIALWEB_ID_GENERATOR'))
+
+
+@receiver(setting_changed)
+def _reset_settings(setting, **kwargs): # pylint:disable=unused-argument
+    if setting == 'MATERIALWEB_ID_GENERATOR':
+        get_id_generator.cache_clear()
+    elif setting in ('MATERIALWEB_MINIFY', 'MATERIALWEB_SVG_SPRITE'):
+        compile_template.cache_clear()
+        _compiled_templates.clear()
+
+
+FRAGMENT_EXCLUDED = ('request', 'csrf_token')
+"Context values bound to the request, not passed to cached fragments."
+
+CACHE_KEY_TYPES = (str, int, float, Decimal, date, time, UUID, type(None))
+"Argument values that can be part of a cache key, and lists of them."
+
+
+def cache_key_value(value, name):
+    """Represent the Template Tag argument `name` in the cache key.
+
+    Only plain values are accepted, the repr() of other objects is not a
+    reliable key: it may query the database, leave things out, or contain a
+    memory address.
+    """
+    if isinstance(value, BoundField):
+        return (value.html_name,
+                cache_key_value(value.field.prepare_value(value.value()),
+                    name),
+                [str(error) for error in value.errors])
+    if isinstance(value, Promise):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [cache_key_value(x, name) for x in value]
+    if isinstance(value, CACHE_KEY_TYPES):
+        return value
+    raise template.TemplateSyntaxError("Cannot cache on the %r argument, "
+            "a %s. Pass the values the output depends on with vary_on." % (
+                name, type(value).__name__))
+
+
+def nodelist_reads_context(nodelist):
+    """Whether the output of parsed template nodes depends on the context.
+
+    Other Template Tags could read anything, only text, comments, `{% load %}`,
+    translations of a literal string, and the materialweb Template Tags not
+    given template variables are known not to.
+    """
+    for node in nodelist:
+        if isinstance(node, (TextNode, CommentNode, LoadNode)):
+            continue
+        if isinstance(node, TranslateNode) and node.asvar is None\
+                and node.message_context is None\
+                and not node.filter_expression.filters\
+                and getattr(node.filter_expression.var, 'literal', None)\
+                    is not None:
+            continue
+        if isinstance(node, Node) and not node.reads_context():
+            continue
+        return True
+    return False
+
+
+class RenderState:
+    """Values computed while rendering a Node.
+
+    Parsed templates are cached and shared by every thread, so a Node instance
+    must not keep anything from one render to the next. Everything specific to
+    the current render lives here and gets passed around instead.
+    """
+    __slots__ = ('context', 'page', 'mode', 'id', 'bound_field', 'values',
+            'provided', 'symbols')
+
+    def __init__(self, context):
+        self.context = context
+        self.page = page_state(context)
+        self.mode = None
+        self.id = None
+        self.bound_field = None
+        self.values = None
+        self.provided = []
+        "Scope values replaced by this Node, (key, previous value) pairs."
+        self.symbols = []
+        "Shared SVG shapes used by templates formatted in `prepare()`."
 
 
 class Node(template.Node):
@@ -17,16 +386,23 @@ class Node(template.Node):
     "Render form field as hidden input."
     MODES = ()
     "Available variants."
-    MUST_HAVE_NODE_PROPS = ('mode', 'tag', 'class', 'label')
+    MUST_HAVE_NODE_PROPS = ('mode', 'tag', 'class', 'label', 'cache',
+            'cache_timeout', 'vary_on')
     "Base Template Tag arguments."
     NODE_PROPS = ()
     "Extended Template Tag arguments."
     DEFAULT_TAG = 'div'
     "Rendered HTML tag."
+    DYNAMIC_TEMPLATE = False
+    "Template depends on the render state, do not cache it per mode."
+    READS_CONTEXT = False
+    "Output depends on context values besides CATCH_CLASSNAMES/PROPERTIES."
 
     # Parent Tags can set html attributes on their childs.
     CATCH_CLASSNAMES = ()
     CATCH_PROPERTIES = ()
+    PROVIDES = ()
+    "Scope keys set for the child Template Tags, see `provide()`."
 
     def __init__(self, *args, **kwargs):
         if self.WANT_CHILDREN:
@@ -35,137 +411,483 @@ class Node(template.Node):
         else:
             self.args = args
 
-        self.context = None
         self.kwargs = kwargs
-        self.bound_field = None
-        self.id = None
-        self.mode = None
-        self.values = None
+        self.compile()
 
 
-    @property
-    def props(self):
-        props = [(key, self.eval(val))\
-                for (key, val) in self.kwargs.items()\
+    def compile(self):
+        """Precompute what the Template Tag arguments fix at parse time.
+
+        String literals are resolved here, once. Only arguments given as
+        template variables are left to be resolved on every render.
+        """
+        kwargs = self.kwargs
+
+        mode = kwargs.get('mode')
+        if isinstance(mode, template.Variable):
+            self.mode = None
+        else:
+            self.mode = self.select_mode(mode)
+
+        self.tag = kwargs.get('tag', self.DEFAULT_TAG)
+        self.cache = kwargs.get('cache')
+
+        classes = kwargs.get('class', '')
+        if isinstance(classes, template.Variable):
+            self.classes = None
+        else:
+            self.classes = tuple(classes.split())
+
+        self.prop_args = tuple((key, val) for (key, val) in kwargs.items()\
                 if key not in self.MUST_HAVE_NODE_PROPS\
-                and key not in self.NODE_PROPS]
+                and key not in self.NODE_PROPS)
+        if any(isinstance(val, template.Variable)\
+                for (_, val) in self.prop_args):
+            self.static_props = None
+        else:
+            self.static_props = tuple(self.filter_props(self.prop_args))
+
+        if self.cache is not None and 'vary_on' not in kwargs:
+            self.check_cache_key()
+
+
+    def check_cache_key(self):
+        """Refuse `cache` when the arguments are not a reliable cache key.
+
+        That is when the output depends on context values the key leaves
+        out, or on a template variable argument, besides the HTML attributes,
+        which could hold any object. Then `vary_on` must list the values the
+        output depends on.
+        """
+        if self.READS_CONTEXT:
+            raise template.TemplateSyntaxError("Cannot cache %s, it reads "
+                    "context values. Pass the values the output depends on "
+                    "with vary_on." % type(self).__name__)
+
+        for index, arg in enumerate(self.args):
+            if isinstance(arg, template.Variable)\
+                    and not (index == 0 and self.WANT_FORM_FIELD):
+                raise template.TemplateSyntaxError("Cannot cache on the "
+                        "argument %d, a template variable. Pass the values "
+                        "the output depends on with vary_on." % index)
+        for key in self.NODE_PROPS:
+            if isinstance(self.kwargs.get(key), template.Variable):
+                raise template.TemplateSyntaxError("Cannot cache on the %r "
+                        "argument, a template variable. Pass the values the "
+                        "output depends on with vary_on." % key)
+
+        if self.WANT_CHILDREN and nodelist_reads_context(self.nodelist):
+            raise template.TemplateSyntaxError("Cannot cache %s, its "
+                    "children read context values. Pass the values the "
+                    "output depends on with vary_on." % type(self).__name__)
+
+
+    def reads_context(self):
+        """Whether the output depends on context values.
+
+        Besides the scope values provided by the parent Template Tags.
+        """
+        if self.READS_CONTEXT or self.WANT_FORM_FIELD:
+            return True
+        if any(isinstance(arg, template.Variable)\
+                for arg in chain(self.args, self.kwargs.values())):
+            return True
+        return self.WANT_CHILDREN and nodelist_reads_context(self.nodelist)
+
+
+    def is_static(self, provided=()):
+        """Whether the rendered output is already known at parse time.
+
+        That is when no argument is a template variable, every CATCH_* key
+        is provided by an enclosing Template Tag in the same static subtree,
+        and the children are plain text or static themselves.
+        """
+        if self.READS_CONTEXT or self.WANT_FORM_FIELD:
+            return False
+        if any(isinstance(arg, template.Variable)\
+                for arg in chain(self.args, self.kwargs.values())):
+            return False
+        if any(key not in provided\
+                for key in chain(self.CATCH_CLASSNAMES, self.CATCH_PROPERTIES)):
+            return False
+
+        if self.WANT_CHILDREN:
+            provided = set(provided).union(self.PROVIDES)
+            for node in self.nodelist:
+                if isinstance(node, TextNode):
+                    continue
+                if isinstance(node, Node) and node.is_static(provided):
+                    continue
+                return False
+        return True
+
+
+    def select_mode(self, mode):
+        if not self.MODES:
+            return 'default'
+        if not mode:
+            return self.MODES[0]
+        if mode not in self.MODES:
+            raise NotImplementedError("Mode %s is not allowed." % mode)
+        return mode
+
+
+    def filter_props(self, props):
         # Ignore properties with falsy value except empty string.
         return [x for x in props if bool(x[1]) or x[1] == '']
 
 
-    @property
-    def child(self):
+    def props(self, state):
+        if self.static_props is not None:
+            return list(self.static_props)
+
+        context = state.context
+        return self.filter_props([(key, self.eval(val, context))\
+                for (key, val) in self.prop_args])
+
+
+    def classnames(self, state):
+        if self.classes is not None:
+            return list(self.classes)
+        return self.eval(self.kwargs['class'], state.context).split()
+
+
+    def child(self, state):
         if self.WANT_CHILDREN:
-            return self.nodelist.render(self.context)
+            return self.nodelist.render(state.context)
         return ''
 
 
-    @property
-    def label(self):
+    def write_child(self, state, write):
+        """Render the children straight into `write()`.
+        """
+        if not self.WANT_CHILDREN:
+            return
+        context = state.context
+        for node in self.nodelist:
+            if isinstance(node, Node):
+                node.render_annotated_into(context, write)
+            else:
+                write(node.render_annotated(context))
+
+
+    def iter_child(self, state):
+        """Render the children, yield their output as it is produced.
+        """
+        if self.WANT_CHILDREN:
+            yield from iter_nodelist(self.nodelist, state.context)
+
+
+    def label(self, state):
         if 'label' in self.kwargs:
-            return self.eval(self.kwargs['label'])
+            return self.eval(self.kwargs['label'], state.context)
         if self.WANT_FORM_FIELD:
-            return self.bound_field.label
+            return state.bound_field.label
         return ''
 
 
-    @property
-    def element(self):
+    def element(self, state):
         if not self.WANT_FORM_FIELD:
             return ''
 
-        field = self.bound_field
+        field = state.bound_field
         widget_attrs = field.field.widget.attrs
 
-        attrs = dict(self.values['props'])
+        attrs = dict(state.values['props'])
         attrs['class'] = widget_attrs.get('class', '').split()
         if field.help_text:
-            attrs['aria-controls'] = self.id + '-hint'
-            attrs['aria-describedby'] = self.id + '-hint'
+            attrs['aria-controls'] = state.id + '-hint'
+            attrs['aria-describedby'] = state.id + '-hint'
 
-        self.prepare_attributes(attrs, widget_attrs)
+        self.prepare_attributes(state, attrs, widget_attrs)
         attrs['class'] = ' '.join(attrs['class'])
 
         if self.HIDE_FORM_FIELD:
-            return self.bound_field.as_hidden(attrs=attrs)
+            return field.as_hidden(attrs=attrs)
         return field.as_widget(attrs=attrs)
 
 
-    @property
-    def element_attributes(self):
+    def element_attributes(self, state):
         if not self.WANT_FORM_FIELD:
             return {}
-        return self.bound_field.field.widget.attrs
+        return state.bound_field.field.widget.attrs
 
 
-    @property
-    def element_hint(self):
+    def element_hint(self, state):
         return f'''
 <div class="mdc-text-field-helper-line">
-  <div id="{self.id}-hint" aria-hidden="true"
+  <div id="{state.id}-hint" aria-hidden="true"
       class="mdc-text-field-helper-text">
-    {self.bound_field.help_text}
+    {state.bound_field.help_text}
   </div>
 </div>
 '''
 
 
-    def eval(self, value):
+    def eval(self, value, context):
         if isinstance(value, template.Variable):
-            return value.resolve(self.context)
+            return value.resolve(context)
         return value
 
 
     def render(self, context):
-        self.context = context
-        self.mode = self.kwargs.get('mode', None)
-
-        if self.MODES:
-            if not self.mode:
-                self.mode = self.MODES[0]
-            elif self.mode not in self.MODES:
-                raise NotImplementedError("Mode %s is not allowed." %\
-                        self.mode)
+        chunks = []
+        self.render_into(context, chunks.append)
+        return ''.join(chunks)
+
+
+    def render_annotated_into(self, context, write):
+        """Same as `render_annotated()`, for `render_into()`.
+        """
+        try:
+            self.render_into(context, write)
+        except Exception as e:
+            annotate_exception(self, context, e)
+            raise
+
+
+    def render_into(self, context, write):
+        """Render the Template Tag, passing the output to `write()`.
+
+        Child Template Tags write their output directly, instead of getting
+        it rendered as a string and copied into the parent's template.
+        """
+        if self.cache and self.eval(self.cache, context):
+            write(self.render_cached(context))
         else:
-            self.mode = 'default'
+            self.render_uncached_into(context, write)
+
+
+    def render_uncached_into(self, context, write):
+        state = self.render_state(context)
+        try:
+            compiled = self.compiled_template(state)
+            sprite = self.sprite(state, compiled)
+            if sprite:
+                write(sprite)
+            compiled.write(state.values, write,
+                    lambda write: self.write_child(state, write))
+
+            if self.WANT_FORM_FIELD and state.bound_field.help_text:
+                write('\n')
+                write(self.element_hint(state))
+        finally:
+            self.release(state)
+
+
+    def render_iter(self, context):
+        """Render the Template Tag, yield the output as it is produced.
+
+        Used for StreamingHttpResponse, see :mod:`materialweb.streaming`.
+        """
+        if self.cache and self.eval(self.cache, context):
+            yield self.render_cached(context)
+            return
+
+        state = self.render_state(context)
+        try:
+            compiled = self.compiled_template(state)
+            sprite = self.sprite(state, compiled)
+            if sprite:
+                yield sprite
+            yield from compiled.iter(state.values,
+                    lambda: self.iter_child(state))
+
+            if self.WANT_FORM_FIELD and state.bound_field.help_text:
+                yield '\n'
+                yield self.element_hint(state)
+        finally:
+            self.release(state)
+
+
+    def render_cached(self, context):
+        """Get the output from the cache, see :mod:`materialweb.cache`.
+
+        Enabled with the `cache` argument, `cache_timeout` sets the timeout
+        in seconds. The key is made of the position of the Template Tag,
+        its arguments, the active language and time zone, and the values
+        provided by the parent Template Tags. When the output depends on
+        other context values, read by the Template Tag or its children,
+        `vary_on` is required, see `check_cache_key()`.
+
+        Fragments are shared by every request, and may be rendered again
+        after the request is finished: the `request` and `csrf_token` context
+        values are not available to them.
+        """
+        key = self.cache_key(context)
+        timeout = int(self.eval(self.kwargs.get('cache_timeout'), context) or\
+                get_setting('MATERIALWEB_CACHE_TIMEOUT'))
+
+        def _renderer():
+            # The fragment can be rendered in another thread, after `context`
+            # moved on. Render it with a copy of the current values, and its
+            # own element ids, it can be used in any page.
+            values = context.flatten()
+            for name in FRAGMENT_EXCLUDED:
+                values.pop(name, None)
+            fragment = context.new(values)
+            fragment.render_context = RenderContext()
+            fragment.render_context.template = context.render_context.template
+
+            page = fragment.materialweb_page = PageState(id_prefix(key))
+            page.scope.update(page_state(context).scope)
+            page.sprite = False
+
+            # Translations and dates follow the request, not the thread.
+            language = get_language()
+            zone = timezone.get_current_timezone()
+
+            def _render():
+                with translation.override(language),\
+                        timezone.override(zone):
+                    html = self.render_fragment(fragment)
+                return html, tuple(sorted(page.symbols))
+
+            return _render
+
+        html, symbols = get_fragment(key, timeout, _renderer)
+        return svg_sprite(page_state(context), symbols) + html
+
+
+    def render_fragment(self, context):
+        """Render the output of a cached fragment.
+
+        The shared SVG shapes it needs are left out, and listed in the
+        fragment's PageState.
+        """
+        chunks = []
+        self.render_uncached_into(context, chunks.append)
+        return ''.join(chunks)
+
+
+    def cache_key(self, context):
+        """Get the cache key of the output.
+
+        Variable arguments are part of the key, unless `vary_on` is given,
+        then only the `vary_on` values are. See `check_cache_key()` and
+        `cache_key_argument()`.
+        """
+        token = getattr(self, 'token', None)
+        vary_on = self.kwargs.get('vary_on')
+
+        def _varying(name, value):
+            if isinstance(value, template.Variable) and vary_on is not None:
+                return False
+            return name != 'vary_on'
+
+        args = [cache_key_value(self.eval(arg, context), index)\
+                for index, arg in enumerate(self.args)\
+                if _varying(index, arg)]
+        kwargs = [(key, self.cache_key_argument(key, self.eval(val, context)))\
+                for (key, val) in sorted(self.kwargs.items())\
+                if _varying(key, val)]
+        if vary_on is not None:
+            kwargs.append(('vary_on', cache_key_value(
+                    self.eval(vary_on, context), 'vary_on')))
+        scope = [(key, cache_key_value(val, key))\
+                for (key, val) in sorted(page_state(context).scope.items())]
+
+        parts = [
+            getattr(getattr(self, 'origin', None), 'name', None),
+            getattr(token, 'lineno', None),
+            getattr(token, 'contents', None),
+            get_language(),
+            timezone.get_current_timezone_name(),
+            args,
+            kwargs,
+            scope,
+        ]
+        return 'materialweb.fragment.' + md5(repr(parts).encode()).hexdigest()
+
+
+    def cache_key_argument(self, name, value):
+        """Represent the Template Tag argument `name` in the cache key.
+
+        The base arguments and the HTML attributes are rendered as strings,
+        other values are keyed with `cache_key_value()`.
+        """
+        if name in self.NODE_PROPS or isinstance(value, CACHE_KEY_TYPES):
+            return cache_key_value(value, name)
+        return (type(value).__name__, str(value))
+
+
+    def render_state(self, context):
+        """Compute the RenderState, every template value except `child`.
+        """
+        state = RenderState(context)
+        try:
+            self.prepare_state(state)
+        except BaseException:
+            self.release(state)
+            raise
+        return state
+
+
+    def prepare_state(self, state):
+        context = state.context
+        state.mode = self.mode or\
+                self.select_mode(self.eval(self.kwargs['mode'], context))
 
         if self.WANT_FORM_FIELD:
-            self.bound_field = self.args[0].resolve(context)
-            self.id = self.bound_field.id_for_label
+            state.bound_field = self.args[0].resolve(context)
+            state.id = state.bound_field.id_for_label
         else:
-            self.id = uuid4().hex
-
-        self.values = values = {
-            'id': self.id,
-            'tag': self.eval(self.kwargs.get('tag', self.DEFAULT_TAG)),
-            'label': self.label,
-            'props': self.props,
-            'class': self.eval(self.kwargs.get('class', '')).split(),
+            state.id = get_id_generator()(context)
+
+        state.values = values = {
+            'id': state.id,
+            'tag': self.eval(self.tag, context),
+            'label': self.label(state),
+            'props': self.props(state),
+            'class': self.classnames(state),
         }
 
         # Parent Tags can set html attributes on their childs.
+        scope = state.page.scope
         for ext in self.CATCH_CLASSNAMES:
-            if ext in context:
-                values['class'].extend(context[ext])
+            if ext in scope:
+                values['class'].extend(scope[ext])
         for ext in self.CATCH_PROPERTIES:
-            if ext in context:
-                values['props'].extend(context[ext])
+            if ext in scope:
+                values['props'].extend(scope[ext])
 
-        self.prepare()
+        self.prepare(state)
 
         # Cleanup props
         values['props'] = self.prune_attributes(values['props'])
 
-        values['child'] = self.child
-        values['element'] = self.element
+        values['element'] = self.element(state)
         values['class'] = ' '.join(values['class'])
         values['props'] = self.join_attributes(values['props'])
 
-        html = self.template.format(**values)
 
-        if self.WANT_FORM_FIELD and self.bound_field.help_text:
-            return html + '\n' + self.element_hint
-        return html
+    def provide(self, state, key, value):
+        """Set a scope value for the child Template Tags.
+
+        The value is visible to every Template Tag rendered before this one
+        is finished, then the previous value is restored.
+        """
+        scope = state.page.scope
+        state.provided.append((key, scope.get(key, _missing)))
+        scope[key] = value
+
+
+    def provided(self, state, key, default=None):
+        """Get a scope value set by a parent Template Tag.
+        """
+        return state.page.scope.get(key, default)
+
+
+    def release(self, state):
+        """Restore the scope values replaced by `provide()`.
+        """
+        scope = state.page.scope
+        while state.provided:
+            key, value = state.provided.pop()
+            if value is _missing:
+                del scope[key]
+            else:
+                scope[key] = value
 
 
     def prune_attributes(self, attrs):
@@ -188,19 +910,61 @@ class Node(template.Node):
         return ' '.join('%s="%s"' % x for x in attrs)
 
 
-    def prepare_attributes(self, attrs, default):
+    def prepare_attributes(self, state, attrs, default):
         pass
 
 
-    def prepare(self):
+    def prepare(self, state):
         pass
 
 
-    @property
-    def template(self):
-        method = getattr(self, 'template_%s' % self.mode, None)
+    def format_template(self, state, text, values):
+        """Format a template used in the values of this one's.
+
+        The shared SVG shapes it needs are written before this Template Tag.
+        """
+        compiled = compile_template(text)
+        state.symbols.extend(compiled.symbols)
+        return compiled.format(values)
+
+
+    def use_symbols(self, state, *symbols):
+        """Write shared SVG shapes the children need before this Template Tag.
+
+        For tables and lists, whose children cannot hold the definitions.
+        """
+        if get_setting('MATERIALWEB_SVG_SPRITE'):
+            state.symbols.extend(symbols)
+
+
+    def sprite(self, state, compiled):
+        """Get the shared SVG shapes this render needs first in the page.
+        """
+        if not compiled.symbols and not state.symbols:
+            return ''
+        return svg_sprite(state.page, compiled.symbols + tuple(state.symbols))
+
+
+    def compiled_template(self, state):
+        """Get the CompiledTemplate for this render.
+
+        Compiled once per class and mode, unless DYNAMIC_TEMPLATE.
+        """
+        if self.DYNAMIC_TEMPLATE:
+            return compile_template(self.template(state))
+
+        key = (type(self), state.mode)
+        compiled = _compiled_templates.get(key)
+        if compiled is None:
+            compiled = CompiledTemplate(self.template(state))
+            _compiled_templates[key] = compiled
+        return compiled
+
+
+    def template(self, state):
+        method = getattr(self, 'template_%s' % state.mode, None)
         if not method:
             raise NotImplementedError("Method is missing: template_%s" %\
-                    self.mode)
+                    state.mode)
 
         return method() # pylint:disable=not-callable
@@ -61,15 +61,14 @@ class Button(Node):
 
     CATCH_CLASSNAMES = ('button_class',)
 
-    def prepare(self):
-        if self.mode == 'outlined':
-            self.values['class'].append('mdc-button--outlined')
-        elif self.mode == 'raised':
-            self.values['class'].append('mdc-button--raised')
+    def prepare(self, state):
+        if state.mode == 'outlined':
+            state.values['class'].append('mdc-button--outlined')
+        elif state.mode == 'raised':
+            state.values['class'].append('mdc-button--raised')
 
 
-    @property
-    def template(self):
+    def template(self, state):
         return '''
 <div class="mdc-touch-target-wrapper">
   <{tag} class="mdc-button mdc-button--touch {class}" {props}>
@@ -229,14 +228,15 @@ class ToggleButton(Node):
 
     CATCH_CLASSNAMES = ('button_class',)
 
-    def prepare(self):
-        self.values['state'] = self.eval(self.kwargs.get('state'))
-        self.values['icon_when_on'] = self.kwargs['icon_when_on']
-        self.values['icon_when_off'] = self.kwargs['icon_when_off']
+    def prepare(self, state):
+        state.values['state'] = self.eval(self.kwargs.get('state'),
+                state.context)
+        state.values['icon_when_on'] = self.kwargs['icon_when_on']
+        state.values['icon_when_off'] = self.kwargs['icon_when_off']
 
-        if self.values['state']:
-            self.values['class'].append('mdc-icon-button--on')
-            self.values['props'].append(('aria-pressed', 'true'))
+        if state.values['state']:
+            state.values['class'].append('mdc-icon-button--on')
+            state.values['props'].append(('aria-pressed', 'true'))
 
 
     def template_default(self):
@@ -93,15 +93,14 @@ class Card(Node):
     MODES = ('elevated', 'outlined')
     "Available variants."
 
-    def prepare(self):
-        if self.mode == 'elevated':
-            self.values['class'].append('mdc-card--elevated')
-        elif self.mode == 'outlined':
-            self.values['class'].append('mdc-card--outlined')
+    def prepare(self, state):
+        if state.mode == 'elevated':
+            state.values['class'].append('mdc-card--elevated')
+        elif state.mode == 'outlined':
+            state.values['class'].append('mdc-card--outlined')
 
 
-    @property
-    def template(self):
+    def template(self, state):
         return '''
 <{tag} class="mdc-card {class}" {props}>
   {child}
@@ -176,13 +175,12 @@ class RichMedia(Node):
     MODES = ('default', 'square')
     "Available variants."
 
-    def prepare(self):
-        if self.mode == 'square':
-            self.values['class'].append('mdc-card__media--square')
+    def prepare(self, state):
+        if state.mode == 'square':
+            state.values['class'].append('mdc-card__media--square')
 
 
-    @property
-    def template(self):
+    def template(self, state):
         return '''
 <{tag} class="mdc-card__media {class}" {props}>
   <div class="mdc-card__media-content">
@@ -237,18 +235,19 @@ class Actions(Node):
     MODES = ('default', 'full_bleed')
     "Available variants."
 
-    def prepare(self):
-        if self.mode == 'full_bleed':
-            self.values['class'].append('mdc-card__actions--full-bleed')
+    PROVIDES = ('button_class', 'button_icon_class')
 
-        self.context['button_class'] = ['mdc-card__action',
-                'mdc-card__action--button']
-        self.context['button_icon_class'] = ['mdc-card__action',
-                'mdc-card__action--icon']
+    def prepare(self, state):
+        if state.mode == 'full_bleed':
+            state.values['class'].append('mdc-card__actions--full-bleed')
 
+        self.provide(state, 'button_class', ['mdc-card__action',
+                'mdc-card__action--button'])
+        self.provide(state, 'button_icon_class', ['mdc-card__action',
+                'mdc-card__action--icon'])
 
-    @property
-    def template(self):
+
+    def template(self, state):
         return '''
 <{tag} class="mdc-card__actions {class}" {props}>
   {child}
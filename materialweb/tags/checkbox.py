@@ -55,17 +55,17 @@ class CheckBox(Node):
     WANT_FORM_FIELD = True
     "Template Tag needs form field as first argument."
 
-    def prepare_attributes(self, attrs, default):
+    def prepare_attributes(self, state, attrs, default):
         indeterminate = default.get('indeterminate', None)
         if not indeterminate is None:
             attrs['data-indeterminate'] = 'true'
         attrs['class'].append('mdc-checkbox__native-control')
 
 
-    def prepare(self):
-        disabled = self.element_attributes.get('disabled', None)
+    def prepare(self, state):
+        disabled = self.element_attributes(state).get('disabled', None)
         if not disabled is None:
-            self.values['class'].append('mdc-checkbox--disabled')
+            state.values['class'].append('mdc-checkbox--disabled')
 
 
     def template_default(self):
@@ -126,17 +126,17 @@ class CheckBoxInput(Node):
     WANT_FORM_FIELD = True
     "Template Tag needs form field as first argument."
 
-    def prepare_attributes(self, attrs, default):
+    def prepare_attributes(self, state, attrs, default):
         indeterminate = default.get('indeterminate', None)
         if not indeterminate is None:
             attrs['data-indeterminate'] = 'true'
         attrs['class'].append('mdc-checkbox__native-control')
 
 
-    def prepare(self):
-        disabled = self.element_attributes.get('disabled', None)
+    def prepare(self, state):
+        disabled = self.element_attributes(state).get('disabled', None)
         if not disabled is None:
-            self.values['class'].append('mdc-checkbox--disabled')
+            state.values['class'].append('mdc-checkbox--disabled')
 
 
     def template_default(self):
@@ -15,12 +15,249 @@ Data tables can contain:
  * Tools to query and manipulate data
 
 """
-from yarl import URL
+from collections.abc import Mapping
+from decimal import Decimal
+from functools import lru_cache
+import re
 #-
-from django.utils.translation import gettext as _
+from django import VERSION as DJANGO_VERSION, template
+from django.conf import settings
+from django.db.models import QuerySet
+from django.template.base import VariableNode
+from django.utils import numberformat
+from django.utils.formats import get_format, localize
+from django.utils.timezone import template_localtime
+from django.utils.html import conditional_escape
+from django.utils.translation import get_language, gettext as _
 #-
-from .base import Node, TextNode
-from .button import IconButton
+from ..conf import get_setting
+from ..pagination import page_links, page_summary
+from ..streaming import annotate_exception
+from .base import SVG_SYMBOLS, Node, NodeList, PageState, TextNode,\
+        compile_template, get_id_generator, minify, page_state, svg_uses
+
+VALUE_RENDERER_KEY = 'materialweb.value_renderer'
+"RenderContext key prefix of the `value_renderer()` of the template render."
+
+_row_slot = re.compile('\x00(\\w+)\x00')
+
+HEAD_CHECKBOX = '''
+<th role="columnheader" scope="col"
+    class="mdc-data-table__header-cell mdc-data-table__header-cell--checkbox">
+  <div class="mdc-checkbox mdc-data-table__header-row-checkbox mdc-checkbox--selected">
+    <input type="checkbox" aria-label="{label_toggle_all}"
+        class="mdc-checkbox__native-control" />
+    <div class="mdc-checkbox__background">
+      <svg viewBox="0 0 24 24" class="mdc-checkbox__checkmark">
+        <path fill="none" d="M1.73,12.91 8.1,19.28 22.79,4.59"
+            class="mdc-checkbox__checkmark-path" />
+      </svg>
+      <div class="mdc-checkbox__mixedmark"></div>
+    </div>
+    <div class="mdc-checkbox__ripple"></div>
+  </div>
+</th>
+''' # pylint:disable=line-too-long
+"Select all rows checkbox, in the header row."
+
+ROW_CHECKBOX = '''
+<td class="mdc-data-table__cell mdc-data-table__cell--checkbox">
+  <div class="mdc-checkbox mdc-data-table__row-checkbox">
+    <input name="{name}" value="{value}" type="checkbox"
+        aria-labelledby="{id_row_header}"
+        class="mdc-checkbox__native-control" />
+    <div class="mdc-checkbox__background">
+      <svg viewBox="0 0 24 24" class="mdc-checkbox__checkmark">
+        <path fill="none" d="M1.73,12.91 8.1,19.28 22.79,4.59"
+            class="mdc-checkbox__checkmark-path" />
+      </svg>
+      <div class="mdc-checkbox__mixedmark"></div>
+    </div>
+    <div class="mdc-checkbox__ripple"></div>
+  </div>
+</td>
+'''
+"Select row checkbox."
+
+
+PAGE_SIZE_OPTION = '''
+<li aria-selected="{aria_selected}" role="option" data-value="{size}"
+    class="mdc-list-item{selected}">
+  <a href="{href}" class="mdc-list-item__text">{size}</a>
+</li>
+'''
+"Rows per page option."
+
+PAGINATION_BUTTON = '''
+<button aria-label="{label}" title="{label}" {props} data-{key}-page="true"
+    class="mdc-icon-button mdc-data-table__pagination-button material-icons">
+  {icon}
+</button>
+'''
+"Pagination bar button, same as an IconButton."
+
+EXPORT_LINK = '''
+<a href="{href}" download class="mdc-button mdc-data-table__pagination-export">
+  <span class="mdc-button__ripple"></span>
+  <span class="mdc-button__label">{label} {format}</span>
+</a>
+'''
+"Pagination bar link downloading the rows, see `materialweb.export`."
+
+
+class Column:
+    """Column of a Table rendered from its `source`.
+
+    `field` is the name of the value in the source items, for querysets it can
+    be anything accepted by `values_list()`. `formatter` gets the value and
+    returns what to display, the result is escaped and localized like
+    :code:`{{ value }}` unless it is marked safe.
+    """
+    __slots__ = ('field', 'header', 'type', 'formatter', 'row_header')
+
+    def __init__(self, field, header=None, type=None, formatter=None, # pylint:disable=redefined-builtin
+            row_header=False):
+        self.field = field
+        self.header = field if header is None else header
+        self.type = type
+        "Set to 'num' for numeric values."
+        self.formatter = formatter
+        self.row_header = row_header
+        "Render the cell as row header, the first column by default."
+
+
+    @classmethod
+    def coerce(cls, spec):
+        """Get a Column from a Column, field name, dict or tuple.
+        """
+        if isinstance(spec, cls):
+            return spec
+        if isinstance(spec, str):
+            return cls(spec)
+        if isinstance(spec, Mapping):
+            return cls(**spec)
+        return cls(*spec)
+
+
+def item_getter(field):
+    """Get a function reading `field` from dicts or objects.
+
+    Follows `__` separated relations like `values_list()` does.
+    """
+    names = field.split('__')
+
+    def _get(item):
+        for name in names:
+            if item is None:
+                return None
+            if isinstance(item, Mapping):
+                item = item.get(name)
+            else:
+                item = getattr(item, name, None)
+        return item
+    return _get
+
+
+def resolve_use_l10n(use_l10n):
+    """Get the localization setting a `use_l10n` of None stands for.
+
+    Same as `django.utils.formats.number_format()`. Django 4 reads the
+    deprecated USE_L10N setting, which walks the stack to warn about it,
+    resolve it once per render rather than for every value.
+    """
+    if use_l10n is not None:
+        return use_l10n
+    if DJANGO_VERSION >= (5, 0):
+        return True
+    try:
+        return settings._USE_L10N_INTERNAL # pylint:disable=protected-access
+    except AttributeError:
+        return settings.USE_L10N
+
+
+def value_renderer(context):
+    """Get a function rendering values like :code:`{{ value }}` does.
+
+    Same as `render_value_in_context()`, except the localization setting and
+    the number format are looked up once instead of for every value.
+    """
+    use_l10n = resolve_use_l10n(context.use_l10n)
+    # Only {% localize off %} renders numbers as str(), with the localization
+    # turned off in the settings they are still formatted.
+    localize_off = context.use_l10n is False
+    use_tz = context.use_tz
+    escape = conditional_escape if context.autoescape else str
+    decimal_sep = get_format('DECIMAL_SEPARATOR', use_l10n=use_l10n)
+    grouping = get_format('NUMBER_GROUPING', use_l10n=use_l10n)
+    thousand_sep = get_format('THOUSAND_SEPARATOR', use_l10n=use_l10n)
+
+    def _render(value):
+        if isinstance(value, str):
+            return escape(value)
+        if isinstance(value, (int, float, Decimal))\
+                and not isinstance(value, bool):
+            if localize_off:
+                return str(value)
+            return numberformat.format(value, decimal_sep, None, grouping,
+                    thousand_sep, use_l10n=use_l10n)
+        value = localize(template_localtime(value, use_tz=use_tz),
+                use_l10n=use_l10n)
+        if not isinstance(value, str):
+            value = str(value)
+        return escape(value)
+    return _render
+
+
+def iter_source(source, fields, chunk_size=2000):
+    """Yield a tuple of the `fields` values of each item in `source`.
+
+    From a queryset only those fields are fetched, `chunk_size` rows at a
+    time.
+    """
+    if isinstance(source, QuerySet):
+        yield from source.values_list(*fields).iterator(chunk_size=chunk_size)
+        return
+
+    getters = [item_getter(field) for field in fields]
+    for item in source:
+        yield tuple(getter(item) for getter in getters)
+
+
+@lru_cache(maxsize=None)
+def pagination_markup(language, minified): # pylint:disable=unused-argument
+    """Get the translated labels and buttons of the pagination bar.
+
+    The buttons are (enabled, disabled) pairs, the enabled one is a format
+    string with an `{href}` field. Cached by language and `MATERIALWEB_MINIFY`.
+    """
+    button = compile_template(PAGINATION_BUTTON)
+    markup = {
+        'label_rows_per_page': _("Rows per page"),
+        'label_export': _("Export"),
+    }
+
+    for key, icon, label in (
+            ('first', 'first_page', _("First Page")),
+            ('prev', 'chevron_left', _("Previous Page")),
+            ('next', 'chevron_right', _("Next Page")),
+            ('last', 'last_page', _("Last Page"))):
+
+        label = str(conditional_escape(label))
+        enabled = button.format({
+            'key': key,
+            'icon': icon,
+            'label': label.replace('{', '{{').replace('}', '}}'),
+            'props': 'href="{href}"',
+        })
+        disabled = button.format({
+            'key': key,
+            'icon': icon,
+            'label': label,
+            'props': 'disabled="disabled" type="button"',
+        })
+        markup[key] = (enabled, disabled)
+
+    return markup
 
 
 class DataTable(Node):
@@ -187,104 +424,211 @@ class DataTable(Node):
          </div>
        </div>
 
+
+    The header and rows can be rendered from a queryset or a list of items,
+    only the fields of the columns are fetched from the database:
+
+    .. code-block:: python
+
+       columns = [
+           Column('name', _("Dessert")),
+           Column('calories', _("Calories"), type='num'),
+           Column('comment', _("Comments"), formatter=str.capitalize),
+       ]
+
+    .. code-block:: jinja
+
+       {% Table source=desserts columns=columns %}{% endTable %}
+
+    With `pager`, `source` defaults to the items of the page.
     """ # pylint:disable=line-too-long
     WANT_CHILDREN = True
     "Template Tag needs closing end tag."
-    NODE_PROPS = ('name', 'pager', 'page_name', 'row_selectable', 'row_movable')
+    NODE_PROPS = ('name', 'pager', 'page_name', 'page_size_name', 'page_sizes',
+            'row_selectable', 'row_movable', 'source', 'columns', 'row_value',
+            'chunk_size', 'export', 'export_name')
     "Extended Template Tag arguments."
     DEFAULT_TAG = 'table'
     "Rendered HTML tag."
-
-    def prepare(self):
-        self.context['name'] = self.eval(self.kwargs.get('name', ''))
-        self.context['selectable'] = self.eval(
-                self.kwargs.get('row_selectable'))
-        self.context['movable'] = self.eval(
-                self.kwargs.get('row_movable'))
-
-        pager = self.eval(self.kwargs.get('pager'))
-        if pager:
-            self.values['pagination'] = self.render_pagination(pager)
-        else:
-            self.values['pagination'] = ''
-
-
-    def render_pagination(self, pager):
-        url = URL(self.context['request'].get_full_path())
-        page_name = self.eval(self.kwargs.get('page_name', 'page'))
-
-        if pager.has_previous():
-            first_kwargs = {'href': url % {page_name: 1}}
-            prev_kwargs = {'href': url %\
-                    {page_name: pager.previous_page_number()}}
-            extra_kwargs = {}
+    READS_CONTEXT = True
+    "Output depends on context values besides CATCH_CLASSNAMES/PROPERTIES."
+
+    PROVIDES = ('name', 'selectable', 'movable')
+
+    def prepare(self, state):
+        self.provide(state, 'name', self.eval(self.kwargs.get('name', ''),
+                state.context))
+        selectable = self.eval(self.kwargs.get('row_selectable'),
+                state.context)
+        self.provide(state, 'selectable', selectable)
+        self.provide(state, 'movable', self.eval(
+                self.kwargs.get('row_movable'), state.context))
+        if selectable:
+            self.use_symbols(state, 'mw-checkmark')
+
+        pager = self.eval(self.kwargs.get('pager'), state.context)
+        if pager is not None:
+            state.values['pagination'] = self.render_pagination(state, pager)
         else:
-            first_kwargs = prev_kwargs = {}
-            extra_kwargs = {'type': 'button', 'disabled': 'disabled'}
-
-        first_button = IconButton(
-                TextNode('first_page'),
-                **{
-                    'label': _("First Page"),
-                    'data-first-page': 'true',
-                    'class': 'mdc-data-table__pagination-button material-icons',
-                },
-                **first_kwargs,
-                **extra_kwargs)
-        prev_button = IconButton(
-                TextNode('chevron_left'),
-                **{
-                    'label': _("Previous Page"),
-                    'data-prev-page': 'true',
-                    'class': 'mdc-data-table__pagination-button material-icons',
-                },
-                **prev_kwargs,
-                **extra_kwargs)
-
-        if pager.has_next():
-            next_kwargs = {'href': url % {page_name: pager.next_page_number()}}
-            last_kwargs = {'href': url %\
-                    {page_name: pager.pagination.num_pages}}
-            extra_kwargs = {}
-        else:
-            next_kwargs = last_kwargs = {}
-            extra_kwargs = {'type': 'button', 'disabled': 'disabled'}
-
-        next_button = IconButton(
-                TextNode('chevron_right'),
-                **{
-                    'label': _("Next Page"),
-                    'data-next-page': 'true',
-                    'class': 'material-icons mdc-data-table__pagination-button',
-                },
-                **next_kwargs,
-                **extra_kwargs)
-        last_button = IconButton(
-                TextNode('last_page'),
-                **{
-                    'label': _("Last Page"),
-                    'data-last-page': 'true',
-                    'class': 'material-icons mdc-data-table__pagination-button',
-                },
-                **last_kwargs,
-                **extra_kwargs)
+            state.values['pagination'] = ''
+
+        columns = self.eval(self.kwargs.get('columns'), state.context)
+        if columns:
+            state.values['columns'] = [Column.coerce(x) for x in columns]
+            source = self.eval(self.kwargs.get('source'), state.context)
+            if source is None and pager is not None:
+                source = pager.object_list
+            if source is None:
+                raise template.TemplateSyntaxError("The rows of the columns "
+                        "argument need a source or pager argument.")
+            state.values['source'] = source
+
+            state.values['head'] = self.render_head(state,
+                    state.values['columns'], selectable)
+            state.values['row_format'] = self.row_format(state,
+                    state.values['columns'], selectable)
+
+
+    def write_child(self, state, write):
+        for chunk in self.iter_source(state):
+            write(chunk)
+        super().write_child(state, write)
+
+
+    def iter_child(self, state):
+        yield from self.iter_source(state)
+        yield from super().iter_child(state)
+
+
+    def iter_source(self, state):
+        """Render the header and rows of `source`, if `columns` is set.
+        """
+        columns = state.values.get('columns')
+        if not columns:
+            return
+
+        context = state.context
+        selectable = self.provided(state, 'selectable')
+
+        yield state.values['head']
+        yield '<tbody class="mdc-data-table__content">'
+
+        fields = [column.field for column in columns]
+        if selectable:
+            fields.append(self.eval(self.kwargs.get('row_value', 'pk'),
+                    context))
+        chunk_size = int(self.eval(self.kwargs.get('chunk_size'), context)\
+                or 2000)
+
+        row_format = state.values['row_format']
+        formatters = [column.formatter for column in columns]
+        render = value_renderer(context)
+        row_id = state.id + '-%d'
+
+        for index, row in enumerate(iter_source(state.values['source'],
+                fields, chunk_size)):
+            cells = [render(formatter(value) if formatter else value)\
+                    for formatter, value in zip(formatters, row)]
+            if selectable:
+                cells.append(row_id % index)
+                cells.append(render(row[-1]))
+            yield row_format.format(*cells)
+
+        yield '</tbody>'
+
+
+    def render_head(self, state, columns, selectable):
+        cells = []
+        if selectable:
+            cells.append(self.format_template(state, HEAD_CHECKBOX, {
+                'label_toggle_all': _("Toggle all rows"),
+            }))
+        for column in columns:
+            cells.append('<th role="columnheader" scope="col" '
+                    'class="mdc-data-table__header-cell%s">%s</th>' % (
+                    ' mdc-data-table__header-cell--numeric'\
+                        if column.type == 'num' else '',
+                    conditional_escape(column.header)))
+
+        return '<thead><tr class="mdc-data-table__header-row">%s</tr></thead>'\
+                % ''.join(cells)
+
+
+    def row_format(self, state, columns, selectable):
+        """Get the format string of a row, with positional fields.
+
+        The fields are the column values, then the row header id and the row
+        value if the rows are selectable.
+        """
+        count = len(columns)
+        row_header = next((index for index, column in enumerate(columns)\
+                if column.row_header), 0)
+
+        parts = ['<tr class="mdc-data-table__row">']
+        if selectable:
+            name = str(conditional_escape(self.provided(state, 'name', '')))
+            parts.append(ROW_CHECKBOX.format(
+                    name=name.replace('{', '{{').replace('}', '}}'),
+                    value='{%d}' % (count + 1),
+                    id_row_header='{%d}' % count))
+
+        for index, column in enumerate(columns):
+            classes = 'mdc-data-table__cell'
+            if column.type == 'num':
+                classes += ' mdc-data-table__cell--numeric'
+            if index == row_header:
+                parts.append('<th class="%s" scope="row"%s>{%d}</th>' % (
+                        classes, ' id="{%d}"' % count if selectable else '',
+                        index))
+            else:
+                parts.append('<td class="%s">{%d}</td>' % (classes, index))
+
+        parts.append('</tr>')
+        row = ''.join(parts)
+        if get_setting('MATERIALWEB_MINIFY'):
+            row = minify(row)
+        if get_setting('MATERIALWEB_SVG_SPRITE'):
+            row, symbols = svg_uses(row)
+            state.symbols.extend(symbols)
+        return row
+
+
+    def render_pagination(self, state, pager):
+        request = state.context['request']
+        page_name = self.eval(self.kwargs.get('page_name', 'page'),
+                state.context)
+        markup = pagination_markup(get_language(),
+                get_setting('MATERIALWEB_MINIFY'))
+        links = page_links(pager)
+        page_size = pager.paginator.per_page
 
         values = {
-            'page_size': pager.paginator.per_page,
-            'total_pages': pager.paginator.num_pages,
-            'total_items': pager.paginator.count,
-            'start': pager.start_index(),
-            'end': pager.end_index(),
-            'first_button': first_button.render(self.context),
-            'prev_button': prev_button.render(self.context),
-            'next_button': next_button.render(self.context),
-            'last_button': last_button.render(self.context),
-            'label_rows_per_page': _("Rows per page"),
-            'id_page_size': self.id + '-pagesize',
+            'page_size': page_size,
+            'page_size_options': self.render_page_sizes(state, request,
+                    page_name, page_size),
+            'summary': page_summary(pager),
+            'export': self.render_export(state, request, page_name,
+                    markup['label_export']),
+            'label_rows_per_page': markup['label_rows_per_page'],
+            'id_page_size': state.id + '-pagesize',
         }
-        template = '''
+
+        query = request.GET.copy()
+        for key in ('first', 'prev', 'next', 'last'):
+            enabled, disabled = markup[key]
+            if links[key] is None:
+                values[key + '_button'] = disabled
+            else:
+                query[page_name] = links[key]
+                href = conditional_escape(request.path + '?'\
+                        + query.urlencode())
+                values[key + '_button'] = enabled.format(href=href)
+
+        layout = '''
 <div class="mdc-data-table__pagination">
   <div class="mdc-data-table__pagination-trailing">
+    {export}
+
     <div class="mdc-data-table__pagination-rows-per-page">
       <div class="mdc-data-table__pagination-rows-per-page-label">
         {label_rows_per_page}
@@ -324,16 +668,7 @@ class DataTable(Node):
         <div role="listbox"
             class="mdc-select__menu mdc-menu mdc-menu-surface mdc-menu-surface--fullwidth">
           <ul class="mdc-list">
-            <li aria-selected="true" role="option" data-value="10"
-                class="mdc-list-item mdc-list-item--selected">
-              <span class="mdc-list-item__text">10</span>
-            </li>
-            <li class="mdc-list-item" role="option" data-value="25">
-              <span class="mdc-list-item__text">25</span>
-            </li>
-            <li class="mdc-list-item" role="option" data-value="100">
-              <span class="mdc-list-item__text">100</span>
-            </li>
+            {page_size_options}
           </ul>
         </div>
       </div>
@@ -341,7 +676,7 @@ class DataTable(Node):
 
     <div class="mdc-data-table__pagination-navigation">
       <div class="mdc-data-table__pagination-total">
-        {start}‑{end} of {total_items}
+        {summary}
       </div>
       {first_button}
       {prev_button}
@@ -351,7 +686,69 @@ class DataTable(Node):
   </div>
 </div>
 ''' # pylint:disable=line-too-long
-        return template.format(**values)
+        return self.format_template(state, layout, values)
+
+
+    def render_page_sizes(self, state, request, page_name, page_size):
+        """Render the options of the rows per page select.
+
+        Each option links to the first page with the `page_size_name` query
+        parameter set, see `materialweb.pagination.get_page_size()`.
+        """
+        size_name = self.eval(self.kwargs.get('page_size_name', 'page_size'),
+                state.context)
+        sizes = self.eval(self.kwargs.get('page_sizes'), state.context)
+        if sizes is None:
+            sizes = get_setting('MATERIALWEB_PAGE_SIZES')
+        elif isinstance(sizes, str):
+            sizes = sizes.split(',')
+        sizes = [int(size) for size in sizes]
+        page_size = int(page_size)
+        option = compile_template(PAGE_SIZE_OPTION)
+        query = request.GET.copy()
+        query.pop(page_name, None)
+
+        options = []
+        for size in sizes:
+            query[size_name] = size
+            options.append(option.format({
+                'selected': ' mdc-list-item--selected'\
+                        if size == page_size else '',
+                'aria_selected': 'true' if size == page_size else 'false',
+                'size': size,
+                'href': conditional_escape(request.path + '?'\
+                        + query.urlencode()),
+            }))
+        return ''.join(options)
+
+
+    def render_export(self, state, request, page_name, label):
+        """Render the links downloading the rows in the `export` formats.
+
+        The format is passed in the `export_name` query parameter, see
+        `materialweb.export.export_response()`.
+        """
+        formats = self.eval(self.kwargs.get('export'), state.context)
+        if not formats:
+            return ''
+        if isinstance(formats, str):
+            formats = formats.split(',')
+        export_name = self.eval(self.kwargs.get('export_name', 'export'),
+                state.context)
+        link = compile_template(EXPORT_LINK)
+        query = request.GET.copy()
+        query.pop(page_name, None)
+
+        links = []
+        for format in formats: # pylint:disable=redefined-builtin
+            query[export_name] = format
+            links.append(link.format({
+                'href': conditional_escape(request.path + '?'\
+                        + query.urlencode()),
+                'label': label,
+                'format': format.upper(),
+            }))
+        return ''.join(links)
 
 
     def template_default(self):
@@ -484,34 +881,22 @@ class HeadRow(Node):
     "Template Tag needs closing end tag."
     DEFAULT_TAG = 'tr'
     "Rendered HTML tag."
+    READS_CONTEXT = True
+    "Output depends on context values besides CATCH_CLASSNAMES/PROPERTIES."
 
-    def prepare(self):
-        if self.context['selectable']:
-            self.values['select_checkbox'] = self.render_select()
+    def prepare(self, state):
+        if self.provided(state, 'selectable'):
+            state.values['select_checkbox'] = self.render_select(state)
         else:
-            self.values['select_checkbox'] = ''
+            state.values['select_checkbox'] = ''
 
-        self.values['label_toggle_all'] = _("Toggle all rows")
+        state.values['label_toggle_all'] = _("Toggle all rows")
 
 
-    def render_select(self):
-        return '''
-<th role="columnheader" scope="col"
-    class="mdc-data-table__header-cell mdc-data-table__header-cell--checkbox">
-  <div class="mdc-checkbox mdc-data-table__header-row-checkbox mdc-checkbox--selected">
-    <input type="checkbox" aria-label="{label_toggle_all}"
-        class="mdc-checkbox__native-control" />
-    <div class="mdc-checkbox__background">
-      <svg viewBox="0 0 24 24" class="mdc-checkbox__checkmark">
-        <path fill="none" d="M1.73,12.91 8.1,19.28 22.79,4.59"
-            class="mdc-checkbox__checkmark-path" />
-      </svg>
-      <div class="mdc-checkbox__mixedmark"></div>
-    </div>
-    <div class="mdc-checkbox__ripple"></div>
-  </div>
-</th>
-''' # pylint:disable=line-too-long
+    def render_select(self, state):
+        return self.format_template(state, HEAD_CHECKBOX, {
+            'label_toggle_all': _("Toggle all rows"),
+        })
 
 
     def template_default(self):
@@ -554,10 +939,10 @@ class HeadColumn(Node):
     DEFAULT_TAG = 'th'
     "Rendered HTML tag."
 
-    def prepare(self):
+    def prepare(self, state):
         type_ = self.kwargs.get('type')
         if type_ == 'num':
-            self.values['class'].append('mdc-data-table__header-cell--numeric')
+            state.values['class'].append('mdc-data-table__header-cell--numeric')
 
 
     def template_default(self):
@@ -666,6 +1051,9 @@ class BodyRow(Node):
          <td class="mdc-data-table__cell">Super tasty</td>
        </tr>
 
+    Rows whose cells are fixed, see `compile_row()`, are rendered by filling
+    in a row template. The row templates are kept in `row_templates`, keyed
+    by selectable, MATERIALWEB_MINIFY and MATERIALWEB_SVG_SPRITE.
     """
     WANT_CHILDREN = True
     "Template Tag needs closing end tag."
@@ -673,39 +1061,184 @@ class BodyRow(Node):
     "Extended Template Tag arguments."
     DEFAULT_TAG = 'tr'
     "Rendered HTML tag."
+    READS_CONTEXT = True
+    "Output depends on context values besides CATCH_CLASSNAMES/PROPERTIES."
+
+    PROVIDES = ('id_row_header',)
+
+    def compile(self):
+        super().compile()
+        self.dynamic_children = self.compile_row()
+        self.row_templates = {}
+
+
+    def compile_row(self):
+        """Get the dynamic children of the cells, None if the row is not fixed.
+
+        The row is fixed when its only arguments besides `value` are literal,
+        and its children are text, or cells with literal arguments containing
+        no other materialweb Template Tag. The dynamic children of the cells,
+        like :code:`{{ value }}`, are the only parts rendered for each row.
+        """
+        if 'cache' in self.kwargs or any(isinstance(val, template.Variable)\
+                for (key, val) in self.kwargs.items() if key != 'value'):
+            return None
+
+        dynamic = []
+        for node in self.nodelist:
+            if isinstance(node, TextNode):
+                continue
+            if type(node) not in (BodyColumn, BodyColumnHeader)\
+                    or node.args or 'cache' in node.kwargs\
+                    or any(isinstance(val, template.Variable)\
+                        for val in node.kwargs.values()):
+                return None
+            for child in node.nodelist:
+                if isinstance(child, Node):
+                    return None
+                if not isinstance(child, TextNode):
+                    dynamic.append(child)
+        return dynamic
+
+
+    def render_uncached_into(self, context, write):
+        row = self.render_row(context)
+        if row is None:
+            super().render_uncached_into(context, write)
+        else:
+            write(row)
 
-    def prepare(self):
-        if self.context['selectable']:
-            self.context['id_row_header'] = self.id + '-header'
-            self.values['select_checkbox'] = self.render_select()
+
+    def render_iter(self, context):
+        row = None
+        if not (self.cache and self.eval(self.cache, context)):
+            row = self.render_row(context)
+        if row is None:
+            yield from super().render_iter(context)
+        else:
+            yield row
+
+
+    def render_row(self, context):
+        """Render a fixed row by filling in its row template.
+
+        Same output as the generic rendering, except the cells do not take
+        element ids. Returns None if the row is not fixed.
+        """
+        if self.dynamic_children is None:
+            return None
+        page = page_state(context)
+        selectable = bool(page.scope.get('selectable'))
+        compiled = self.row_template(context, selectable)
+        if compiled is None:
+            return None
+
+        parts, slots = compiled
+        parts = parts[:]
+        values = {}
+        if selectable:
+            values['id'] = get_id_generator()(context)
+            values['name'] = str(page.scope.get('name', ''))
+            values['value'] = str(self.eval(self.kwargs.get('value', ''),
+                    context))
+        # Autoescape, localization and language can change within a template.
+        key = (VALUE_RENDERER_KEY, context.autoescape, context.use_l10n,
+                get_language())
+        render = context.render_context.get(key)
+        if render is None:
+            render = context.render_context[key] = value_renderer(context)
+
+        dynamic = self.dynamic_children
+        for index, name in slots:
+            if name in values:
+                parts[index] = values[name]
+                continue
+            node = dynamic[int(name[1:])]
+            if type(node) is not VariableNode:
+                parts[index] = node.render_annotated(context)
+                continue
+            try:
+                parts[index] = render(node.filter_expression.resolve(context))
+            except Exception as e:
+                annotate_exception(node, context, e)
+                raise
+        return ''.join(parts)
+
+
+    def row_template(self, context, selectable):
+        """Get the literal parts of the row and its (index, name) slots.
+
+        Built on first use by rendering the row with markers in place of the
+        dynamic parts, so it is the same markup the generic rendering makes.
+        None if the element id cannot be marked, with a random id generator.
+        """
+        key = (selectable, get_setting('MATERIALWEB_MINIFY'),
+                get_setting('MATERIALWEB_SVG_SPRITE'))
+        try:
+            return self.row_templates[key]
+        except KeyError:
+            pass
+
+        index = 0
+        children = []
+        for node in self.nodelist:
+            if isinstance(node, TextNode):
+                children.append(node)
+                continue
+            cell_children = []
+            for child in node.nodelist:
+                if isinstance(child, TextNode):
+                    cell_children.append(child)
+                else:
+                    cell_children.append(TextNode('\x00c%d\x00' % index))
+                    index += 1
+            children.append(type(node)(NodeList(cell_children),
+                    **node.kwargs))
+
+        row = type(self)(NodeList(children), *self.args,
+                **dict(self.kwargs, value='\x00value\x00'))
+
+        markers = context.new()
+        page = markers.materialweb_page = PageState('\x00id\x00')
+        page.scope.update(selectable=selectable, name='\x00name\x00')
+        # The shared SVG shapes are written by the Table.
+        page.symbols.update(SVG_SYMBOLS)
+        chunks = []
+        Node.render_uncached_into(row, markers, chunks.append)
+        text = ''.join(chunks)
+
+        compiled = None
+        if not selectable or '\x00id\x00-1' in text:
+            parts = []
+            slots = []
+            for position, part in enumerate(_row_slot.split(
+                    text.replace('\x00id\x00-1', '\x00id\x00'))):
+                if position % 2:
+                    slots.append((len(parts), part))
+                    parts.append(None)
+                elif part:
+                    parts.append(part)
+            compiled = (parts, slots)
+
+        self.row_templates[key] = compiled
+        return compiled
+
+
+    def prepare(self, state):
+        if self.provided(state, 'selectable'):
+            self.provide(state, 'id_row_header', state.id + '-header')
+            state.values['select_checkbox'] = self.render_select(state)
         else:
-            self.values['select_checkbox'] = ''
+            state.values['select_checkbox'] = ''
 
 
-    def render_select(self):
+    def render_select(self, state):
         values = {
-            'name': self.context.get('name', ''),
-            'value': self.eval(self.kwargs.get('value', '')),
-            'id_row_header': self.context['id_row_header'],
+            'name': self.provided(state, 'name', ''),
+            'value': self.eval(self.kwargs.get('value', ''), state.context),
+            'id_row_header': self.provided(state, 'id_row_header'),
         }
-        template = '''
-<td class="mdc-data-table__cell mdc-data-table__cell--checkbox">
-  <div class="mdc-checkbox mdc-data-table__row-checkbox">
-    <input name="{name}" value="{value}" type="checkbox"
-        aria-labelledby="{id_row_header}"
-        class="mdc-checkbox__native-control" />
-    <div class="mdc-checkbox__background">
-      <svg viewBox="0 0 24 24" class="mdc-checkbox__checkmark">
-        <path fill="none" d="M1.73,12.91 8.1,19.28 22.79,4.59"
-            class="mdc-checkbox__checkmark-path" />
-      </svg>
-      <div class="mdc-checkbox__mixedmark"></div>
-    </div>
-    <div class="mdc-checkbox__ripple"></div>
-  </div>
-</td>
-'''
-        return template.format(**values)
+        return self.format_template(state, ROW_CHECKBOX, values)
 
 
     def template_default(self):
@@ -741,10 +1274,10 @@ class BodyColumn(Node):
     DEFAULT_TAG = 'td'
     "Rendered HTML tag."
 
-    def prepare(self):
+    def prepare(self, state):
         type_ = self.kwargs.get('type')
         if type_ == 'num':
-            self.values['class'].append('mdc-data-table__header-cell--numeric')
+            state.values['class'].append('mdc-data-table__header-cell--numeric')
 
 
     def template_default(self):
@@ -778,14 +1311,17 @@ class BodyColumnHeader(Node):
     "Extended Template Tag arguments."
     DEFAULT_TAG = 'th'
     "Rendered HTML tag."
+    READS_CONTEXT = True
+    "Output depends on context values besides CATCH_CLASSNAMES/PROPERTIES."
 
-    def prepare(self):
+    def prepare(self, state):
         type_ = self.kwargs.get('type')
         if type_ == 'num':
-            self.values['class'].append('mdc-data-table__header-cell--numeric')
+            state.values['class'].append('mdc-data-table__header-cell--numeric')
 
-        if 'id_row_header' in self.context:
-            self.values['props'].append(('id', self.context['id_row_header']))
+        id_row_header = self.provided(state, 'id_row_header')
+        if id_row_header:
+            state.values['props'].append(('id', id_row_header))
 
 
     def template_default(self):
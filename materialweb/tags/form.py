@@ -0,0 +1,325 @@
+"""Renders a whole Django form with the components matching its widgets.
+
+Each field is given to :code:`TextField`, :code:`TextArea`, :code:`Select` or
+:code:`CheckBox`, depending on its widget, in one pass without a template
+include per field. Other widgets keep their own markup.
+
+See :mod:`materialweb.renderers` to render :code:`{{ form }}` this way.
+"""
+from weakref import WeakKeyDictionary
+#-
+from django.forms import widgets
+from django.template import Variable
+from django.utils.html import conditional_escape
+#-
+from .base import Node, NodeList, compile_template
+from .checkbox import CheckBox
+from .select import Select
+from .textarea import TextArea
+from .textfield import TextField
+
+FIELD_VARIABLE = 'materialweb_field'
+"Context variable holding the bound field, while a field is rendered."
+
+WIDGET_COMPONENTS = (
+    (widgets.CheckboxInput, CheckBox),
+    (widgets.Textarea, TextArea),
+    (widgets.SelectMultiple, None),
+    (widgets.Select, Select),
+    (widgets.FileInput, None),
+    (widgets.Input, TextField),
+)
+"""Component rendering a widget class and its subclasses, the first match is
+used. None to render the widget itself."""
+
+_field_nodes = WeakKeyDictionary()
+"""Nodes rendering the fields of a form class, keyed by the form class, then
+by (field name, widget class, mode)."""
+
+
+def widget_component(widget_class):
+    """Get the component class rendering `widget_class`, None if there is not.
+    """
+    for base, component in WIDGET_COMPONENTS:
+        if issubclass(widget_class, base):
+            return component
+    return None
+
+
+def field_node(bound_field, mode, show_label=True):
+    """Get the Node rendering `bound_field`, None to use its widget markup.
+
+    The Node reads the field from the `materialweb_field` context variable,
+    it is created once per form class and field.
+    """
+    form_class = type(bound_field.form)
+    nodes = _field_nodes.get(form_class)
+    if nodes is None:
+        nodes = _field_nodes.setdefault(form_class, {})
+
+    widget_class = type(bound_field.field.widget)
+    key = (bound_field.name, widget_class, mode, show_label)
+    try:
+        return nodes[key]
+    except KeyError:
+        pass
+
+    component = widget_component(widget_class)
+    kwargs = {'mode': mode}
+    if not show_label:
+        kwargs['label'] = ''
+    if component is None:
+        node = None
+    elif component.WANT_CHILDREN:
+        node = component(NodeList(), Variable(FIELD_VARIABLE), **kwargs)
+    else:
+        node = component(Variable(FIELD_VARIABLE), **kwargs)
+    nodes[key] = node
+    return node
+
+
+def write_field(context, bound_field, mode, write, show_errors=True,
+        show_label=True, label_class=''):
+    """Render one field of a form, with its errors.
+
+    `label_class` is given to the label of the widgets without a component,
+    the components have their own.
+    """
+    node = field_node(bound_field, mode, show_label)
+    if node is None:
+        if show_label:
+            label = bound_field.label_tag(
+                    attrs={'class': label_class} if label_class else None)
+        else:
+            label = ''
+        write(compile_template(TEMPLATE_WIDGET).format({
+            'class': bound_field.css_classes(),
+            'label': label,
+            'widget': str(bound_field),
+        }))
+        if bound_field.help_text:
+            write('\n')
+            write(compile_template(TEMPLATE_HINT).format({
+                'id': bound_field.auto_id,
+                'hint': bound_field.help_text,
+            }))
+    else:
+        with context.push({FIELD_VARIABLE: bound_field}):
+            node.render_annotated_into(context, write)
+
+    if show_errors and bound_field.errors:
+        write('\n')
+        write(compile_template(TEMPLATE_ERRORS).format({
+            'id': bound_field.auto_id,
+            'errors': join_errors(bound_field.errors),
+        }))
+
+
+def join_errors(errors):
+    return '<br>'.join(conditional_escape(error) for error in errors)
+
+
+TEMPLATE_WIDGET = '''
+<div class="mdc-form-field {class}">
+  {label}
+  {widget}
+</div>
+'''
+"Field whose widget has no component."
+
+TEMPLATE_HINT = '''
+<div class="mdc-text-field-helper-line">
+  <div id="{id}-hint" aria-hidden="true" class="mdc-text-field-helper-text">
+    {hint}
+  </div>
+</div>
+'''
+"Help text of a field whose widget has no component."
+
+TEMPLATE_ERRORS = '''
+<div class="mdc-text-field-helper-line">
+  <div id="{id}-errors" role="alert"
+      class="mdc-text-field-helper-text mdc-text-field-helper-text--persistent mdc-text-field-helper-text--validation-msg">
+    {errors}
+  </div>
+</div>
+''' # pylint:disable=line-too-long
+"Validation errors of a field."
+
+
+class Form(Node):
+    """Form component, every field of a Django form.
+
+    Example usage:
+
+    .. code-block:: jinja
+
+       {% load materialweb %}
+
+       <form method="post">
+         {% csrf_token %}
+         {% Form form mode="outlined" %}
+         <button type="submit">Save</button>
+       </form>
+
+    The errors not tied to a visible field come first, then the hidden
+    fields, then a component per visible field.
+    """
+    MODES = ('filled', 'outlined')
+
+    def prepare(self, state):
+        form = self.eval(self.args[0], state.context)
+        state.values['fields'] = fields = []
+        hidden = []
+        errors = list(form.non_field_errors())
+        for bound_field in form:
+            if bound_field.is_hidden:
+                hidden.append(str(bound_field))
+                errors.extend(bound_field.errors)
+            else:
+                fields.append(bound_field)
+
+        state.values['hidden'] = '\n'.join(hidden)
+        if errors:
+            state.values['errors'] = compile_template(
+                    self.template_errors()).format({
+                        'id': state.id,
+                        'errors': join_errors(errors),
+                    })
+        else:
+            state.values['errors'] = ''
+
+
+    def write_child(self, state, write):
+        for bound_field in state.values['fields']:
+            write_field(state.context, bound_field, state.mode, write)
+            write('\n')
+
+
+    def iter_child(self, state):
+        for bound_field in state.values['fields']:
+            chunks = []
+            write_field(state.context, bound_field, state.mode, chunks.append)
+            chunks.append('\n')
+            yield ''.join(chunks)
+
+
+    def template_filled(self):
+        return '''
+<{tag} class="mdc-form {class}" {props}>
+  {errors}
+  {hidden}
+  {child}
+</{tag}>
+'''
+
+
+    def template_outlined(self):
+        return self.template_filled()
+
+
+    def template_errors(self):
+        return '''
+<div id="{id}-errors" role="alert" class="mdc-form__errors">
+  {errors}
+</div>
+'''
+
+
+class FormField(Node):
+    """One field of a form, the component of its widget in a wrapper.
+
+    Example usage:
+
+    .. code-block:: jinja
+
+       {% load materialweb %}
+
+       {% for field in form.visible_fields %}
+         {% Form_Field field mode="outlined" %}
+       {% endfor %}
+
+    Like `material/field.html` of the crispy-forms template pack it reads
+    `tag`, `wrapper_class`, `field_class`, `label_class`, `form_show_labels`
+    and `form_show_errors` from the context, but renders the markup of the
+    components, :code:`Form_PackField` renders the markup of the pack. The
+    `tag`, `class`, `show_labels` and `show_errors` arguments take precedence.
+    A hidden field is only its input.
+    """
+    MODES = ('filled', 'outlined')
+    NODE_PROPS = ('show_labels', 'show_errors')
+    READS_CONTEXT = True
+    DYNAMIC_TEMPLATE = True
+
+    def prepare(self, state):
+        context = state.context
+        bound_field = self.eval(self.args[0], context)
+        state.values['field'] = bound_field
+        if bound_field.is_hidden:
+            state.values['widget'] = str(bound_field)
+            return
+
+        if 'tag' not in self.kwargs and context.get('tag'):
+            state.values['tag'] = context.get('tag')
+        if 'class' not in self.kwargs:
+            state.values['class'].extend(
+                    str(context.get('wrapper_class') or '').split())
+        state.values['class'].extend(bound_field.css_classes().split())
+        if bound_field.auto_id:
+            state.values['props'].append(('id', 'div_' + bound_field.auto_id))
+        state.values['field_class'] = context.get('field_class') or ''
+        state.values['label_class'] = context.get('label_class') or ''
+
+        for name, context_name in (('show_labels', 'form_show_labels'),
+                ('show_errors', 'form_show_errors')):
+            if name in self.kwargs:
+                value = self.eval(self.kwargs[name], context)
+            else:
+                value = context.get(context_name, True)
+            state.values[name] = value
+
+
+    def write_child(self, state, write):
+        values = state.values
+        if values['field_class']:
+            write('<div class="%s">\n' % conditional_escape(
+                    values['field_class']))
+        write_field(state.context, values['field'], state.mode, write,
+                values['show_errors'], values['show_labels'],
+                values['label_class'])
+        if values['field_class']:
+            write('\n</div>')
+
+
+    def iter_child(self, state):
+        chunks = []
+        self.write_child(state, chunks.append)
+        yield ''.join(chunks)
+
+
+    def template(self, state):
+        if state.values['field'].is_hidden:
+            return self.template_hidden()
+        return super().template(state)
+
+
+    def template_filled(self):
+        return '''
+<{tag} class="mdc-form__field {class}" {props}>
+  {child}
+</{tag}>
+'''
+
+
+    def template_outlined(self):
+        return self.template_filled()
+
+
+    def template_hidden(self):
+        return '{widget}'
+
+
+components = {
+    'Form': Form,
+    'Form_Field': FormField,
+}
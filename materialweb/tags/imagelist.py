@@ -44,16 +44,17 @@ class ImageList(Node):
     DEFAULT_TAG = 'ul'
     "Rendered HTML tag."
 
-    def prepare(self):
-        if self.mode == 'masonry':
-            self.values['class'].append('mdc-image-list--masonry')
+    PROVIDES = ('list_mode',)
+
+    def prepare(self, state):
+        if state.mode == 'masonry':
+            state.values['class'].append('mdc-image-list--masonry')
 
         # Send this to ListItem
-        self.context['list_mode'] = self.mode
+        self.provide(state, 'list_mode', state.mode)
 
 
-    @property
-    def template(self):
+    def template(self, state):
         return '''
 <{tag} class="mdc-image-list {class}" {props}>
   {child}
@@ -95,21 +96,24 @@ class ListItem(Node):
     "Extended Template Tag arguments."
     DEFAULT_TAG = 'li'
     "Rendered HTML tag."
+    DYNAMIC_TEMPLATE = True
+    "Template depends on the image, `reversed` and parent ImageList mode."
+    READS_CONTEXT = True
+    "Output depends on context values besides CATCH_CLASSNAMES/PROPERTIES."
 
-    def prepare(self):
-        image = self.eval(self.kwargs.get('image'))
+    def prepare(self, state):
+        image = self.eval(self.kwargs.get('image'), state.context)
         if image:
-            self.values['image'] = image
+            state.values['image'] = image
 
 
-    @property
-    def template(self):
-        image = self.values.get('image')
+    def template(self, state):
+        image = state.values.get('image')
         reverse = 'reversed' in self.args or\
-                self.eval(self.kwargs.get('reversed'))
+                self.eval(self.kwargs.get('reversed'), state.context)
 
         # Coming from ImageList
-        mode = self.context.get('list_mode')
+        mode = self.provided(state, 'list_mode')
 
         if image:
             if mode == 'masonry':
@@ -58,13 +58,12 @@ class List(Node):
 
     CATCH_PROPERTIES = ('list_props',)
 
-    def prepare(self):
-        if self.mode == 'two_line':
-            self.values['class'].append('mdc-list--two-line')
+    def prepare(self, state):
+        if state.mode == 'two_line':
+            state.values['class'].append('mdc-list--two-line')
 
 
-    @property
-    def template(self):
+    def template(self, state):
         return '''
 <{tag} class="mdc-list {class}" {props}>
   {child}
@@ -139,10 +138,10 @@ class Item(Node):
 
     CATCH_PROPERTIES = ('list_item_props',)
 
-    def prepare(self):
-        activated = self.eval(self.kwargs.get('activated'))
+    def prepare(self, state):
+        activated = self.eval(self.kwargs.get('activated'), state.context)
         if activated:
-            self.values['class'].append('mdc-list-item--activated')
+            state.values['class'].append('mdc-list-item--activated')
 
 
     def template_default(self):
@@ -519,23 +518,26 @@ class SelectList(Node):
     DEFAULT_TAG = 'ul'
     "Rendered HTML tag."
 
-    def prepare(self):
-        if self.mode == 'radio':
-            self.values['props'].append(('role', 'radiogroup'))
-        elif self.mode == 'checkbox':
-            self.values['props'].append(('role', 'group'))
+    PROVIDES = ('list_mode', 'list_value')
+
+    def prepare(self, state):
+        if state.mode == 'radio':
+            state.values['props'].append(('role', 'radiogroup'))
+        elif state.mode == 'checkbox':
+            state.values['props'].append(('role', 'group'))
+            self.use_symbols(state, 'mw-checkmark')
         else:
-            self.values['props'].append(('role', 'listbox'))
+            state.values['props'].append(('role', 'listbox'))
 
-        if self.values['label']:
-            self.values['props'].append(('aria-label', self.values['label']))
+        if state.values['label']:
+            state.values['props'].append(('aria-label', state.values['label']))
 
-        self.context['list_mode'] = self.mode
-        self.context['list_value'] = self.eval(self.kwargs.get('value', ''))
+        self.provide(state, 'list_mode', state.mode)
+        self.provide(state, 'list_value', self.eval(
+                self.kwargs.get('value', ''), state.context))
 
 
-    @property
-    def template(self):
+    def template(self, state):
         return '''
 <{tag} class="mdc-list {class}" {props}>
   {child}
@@ -552,33 +554,36 @@ class SelectItem(Node):
     "Extended Template Tag arguments."
     DEFAULT_TAG = 'li'
     "Rendered HTML tag."
+    READS_CONTEXT = True
+    "Output depends on context values besides CATCH_CLASSNAMES/PROPERTIES."
 
-    def prepare(self):
-        # Late declaration of `self.mode`.
-        self.mode = self.context.get('list_mode', 'list')
-        selected = self.context.get('list_value', '')
+    def prepare(self, state):
+        # Late declaration of `state.mode`.
+        state.mode = self.provided(state, 'list_mode', 'list')
+        selected = self.provided(state, 'list_value', '')
 
         input_props = []
 
         if selected:
-            self.values['props'].append(('tabindex', '0'))
+            state.values['props'].append(('tabindex', '0'))
 
-            if self.mode in ('radio', 'checkbox'):
-                self.values['props'].append(('aria-checked', 'true'))
+            if state.mode in ('radio', 'checkbox'):
+                state.values['props'].append(('aria-checked', 'true'))
                 input_props.append(('checked', 'checked'))
             else:
-                self.values['props'].append(('aria-selected', 'true'))
-                self.values['class'].append('mdc-list-item--selected')
+                state.values['props'].append(('aria-selected', 'true'))
+                state.values['class'].append('mdc-list-item--selected')
         else:
-            if self.mode in ('radio', 'checkbox'):
-                self.values['props'].append(('aria-checked', 'false'))
+            if state.mode in ('radio', 'checkbox'):
+                state.values['props'].append(('aria-checked', 'false'))
             else:
-                self.values['props'].append(('aria-selected', 'false'))
+                state.values['props'].append(('aria-selected', 'false'))
 
-        self.values['name'] = self.eval(self.kwargs.get('name'))
-        self.values['value'] = self.eval(self.kwargs.get('value'))
+        state.values['name'] = self.eval(self.kwargs.get('name'), state.context)
+        state.values['value'] = self.eval(self.kwargs.get('value'),
+                state.context)
 
-        self.values['input_props'] = self.join_attributes(input_props)
+        state.values['input_props'] = self.join_attributes(input_props)
 
 
     def template_list(self):
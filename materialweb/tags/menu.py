@@ -58,16 +58,18 @@ class Menu(Node):
     WANT_CHILDREN = True
     "Template Tag needs closing end tag."
 
-    def prepare(self):
-        self.context['list_props'] = (
+    PROVIDES = ('list_props', 'list_item_props')
+
+    def prepare(self, state):
+        self.provide(state, 'list_props', (
             ('role', 'menu'),
             ('aria-hidden', 'true'),
             ('aria-orientation', 'vertical'),
             ('tabindex', '-1'),
-        )
-        self.context['list_item_props'] = (
+        ))
+        self.provide(state, 'list_item_props', (
             ('role', 'menuitem'),
-        )
+        ))
 
 
     def template_default(self):
@@ -198,8 +200,11 @@ class Group(Node):
     DEFAULT_TAG = 'ul'
     "Rendered HTML tag."
 
-    def prepare(self):
-        self.context['list_image_class'] = ['mdc-menu__selection-group-icon']
+    PROVIDES = ('list_image_class',)
+
+    def prepare(self, state):
+        self.provide(state, 'list_image_class',
+                ['mdc-menu__selection-group-icon'])
 
 
     def template_default(self):
@@ -0,0 +1,373 @@
+"""The `material/field.html` template of the crispy-forms pack, in Python.
+
+`templates/material/field.html` renders a field with the bootstrap markup,
+including `radioselect.html`, `checkboxselectmultiple.html`,
+`field_file.html`, `help_text_and_errors.html`, `field_errors.html`,
+`field_errors_block.html` and `help_text.html`, and calling the
+crispy-forms `is_*` filters. :code:`Form_PackField` does the same branching
+in code, with no include per field, and renders the same markup. It reads the
+same context values: `tag`, `wrapper_class`, `field_class`, `label_class`,
+`form_class`, `form_show_labels`, `form_show_errors`, `help_text_inline`,
+`error_text_inline`, `use_custom_control`, `inline_class`, `flat_attrs` and
+`bootstrap_checkbox_offsets`.
+
+See :mod:`materialweb.loaders` to use it in place of the template file.
+"""
+from django.conf import settings
+from django.forms import widgets
+from django.forms.utils import flatatt
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+#-
+from .base import Node, compile_template
+
+FILE_SCRIPT = '''
+<script type="text/javascript" id="script-{id}">
+    document.getElementById("script-{id}").parentNode.querySelector('.custom-file-input').onchange =  function (e){{
+        var filenames = "";
+        for (let i=0;i<e.target.files.length;i++){{
+            filenames+=(i>0?", ":"")+e.target.files[0].name;
+        }}
+        e.target.parentNode.querySelector('.custom-file-label').innerHTML=filenames;
+    }}
+</script>
+''' # pylint:disable=line-too-long
+"Script of `field_file.html`, showing the chosen file names."
+
+
+def crispy_field(bound_field, attrs=None):
+    """Render the widget of a field like `{% crispy_field %}`.
+
+    The widget gets its class name, and the `attrs` values, added to its CSS
+    classes. Like the template tag, this changes the widget attrs in place.
+    """
+    widget = bound_field.field.widget
+    # Widgets wrapping other widgets, like MultiWidget.
+    wrapped = getattr(widget, 'widgets', [getattr(widget, 'widget', widget)])
+    converters = getattr(settings, 'CRISPY_CLASS_CONVERTERS', {})
+
+    for widget in wrapped:
+        class_name = widget.__class__.__name__.lower()
+        class_name = converters.get(class_name, class_name)
+        css_class = widget.attrs.get('class', '')
+        if css_class:
+            if css_class.find(class_name) == -1:
+                css_class += ' %s' % class_name
+        else:
+            css_class = class_name
+        widget.attrs['class'] = css_class
+
+        for name, value in (attrs or {}).items():
+            if name in widget.attrs:
+                for item in value.split():
+                    if item not in widget.attrs[name].split():
+                        widget.attrs[name] += ' ' + item
+            else:
+                widget.attrs[name] = value
+
+    return str(bound_field)
+
+
+def stringformat(value):
+    """Same as the `stringformat:"s"` template filter.
+    """
+    if isinstance(value, tuple):
+        value = str(value)
+    try:
+        return '%s' % value
+    except (ValueError, TypeError):
+        return ''
+
+
+def contains(container, value):
+    """Same as the `in` operator of the `{% if %}` template tag.
+    """
+    try:
+        return value in container
+    except Exception: # pylint:disable=broad-except
+        return False
+
+
+def unlocalize(value):
+    """Same as `{{ value|unlocalize }}`.
+    """
+    return conditional_escape(str(localize(value, use_l10n=False)))
+
+
+class PackField(Node):
+    """One field of a form, with the markup of `material/field.html`.
+
+    Example usage:
+
+    .. code-block:: jinja
+
+       {% load materialweb %}
+
+       {% for field in form %}
+         {% Form_PackField field %}
+       {% endfor %}
+
+    The output is the same as :code:`{% include "material/field.html" %}`
+    with the template pack files, except for white space.
+    """
+    READS_CONTEXT = True
+
+    def prepare_state(self, state):
+        # Does not take an element id, the ids of the template file are
+        # made from the field.
+        state.mode = self.mode
+        state.values = {}
+
+
+    def write_child(self, state, write):
+        context = state.context
+        field = self.eval(self.args[0], context)
+        if field.is_hidden:
+            write(str(field))
+            return
+
+        values = {
+            'auto_id': conditional_escape(field.auto_id),
+            'id_for_label': conditional_escape(field.id_for_label),
+            'field_class': conditional_escape(context.get('field_class', '')),
+            'label_class': conditional_escape(context.get('label_class', '')),
+            'label': mark_safe(field.label),
+            'required': '',
+            'asterisk': '',
+        }
+        if field.field.required:
+            values['required'] = ' requiredField'
+            values['asterisk'] = '<span class="asteriskField">*</span>'
+
+        widget = field.field.widget
+        is_checkbox = isinstance(widget, widgets.CheckboxInput)
+        custom_control = context.get('use_custom_control')
+        horizontal = contains(context.get('form_class'), 'form-horizontal')
+        label_class = context.get('label_class')
+        form_show_labels = context.get('form_show_labels')
+
+        if is_checkbox:
+            write('<div class="form-group%s">\n' % (
+                    ' row' if horizontal else ''))
+            if label_class:
+                offsets = context.get('bootstrap_checkbox_offsets') or ()
+                write('<div class="%s%s">\n' % (''.join(
+                        '%s ' % conditional_escape(offset)\
+                        for offset in offsets), values['field_class']))
+
+        tag = conditional_escape(context.get('tag') or 'div')
+        if not is_checkbox:
+            classes = ['form-group row' if horizontal else 'form-group']
+        elif custom_control:
+            classes = ['custom-control custom-checkbox']
+        else:
+            classes = ['form-check']
+        if context.get('wrapper_class'):
+            classes.append(conditional_escape(context.get('wrapper_class')))
+        if field.css_classes():
+            classes.append(conditional_escape(field.css_classes()))
+        write('<%s id="div_%s" class="%s">\n' % (tag, values['auto_id'],
+                ' '.join(classes)))
+
+        if field.label and not is_checkbox and form_show_labels:
+            values['horizontal'] = 'col-form-label ' if horizontal else ''
+            write(compile_template(TEMPLATE_LABEL).format(values))
+
+        self.write_input(context, field, values, write)
+
+        write('</%s>\n' % tag)
+        if is_checkbox:
+            if label_class:
+                write('</div>\n')
+            write('</div>\n')
+
+
+    def write_input(self, context, field, values, write):
+        """Write the input of the field, with its help text and errors.
+        """
+        widget = field.field.widget
+        custom_control = context.get('use_custom_control')
+        if isinstance(widget, widgets.CheckboxSelectMultiple):
+            self.write_choices(context, field, 'checkbox', write)
+        elif isinstance(widget, widgets.RadioSelect):
+            self.write_choices(context, field, 'radio', write)
+        elif isinstance(widget, widgets.CheckboxInput)\
+                and context.get('form_show_labels'):
+            write(crispy_field(field, {'class': 'custom-control-input'\
+                    if custom_control else 'form-check-input'}))
+            values['label_type'] = 'custom-control-label' if custom_control\
+                    else 'form-check-label'
+            write(compile_template(TEMPLATE_CHECKBOX_LABEL).format(values))
+            self.write_help_text_and_errors(context, field, write)
+        elif isinstance(widget, widgets.FileInput)\
+                and not isinstance(widget, widgets.ClearableFileInput)\
+                and custom_control:
+            write('<div class="custom-file %s">\n' % values['field_class'])
+            write(crispy_field(field, {'class': 'custom-file-input'}))
+            write(compile_template(TEMPLATE_FILE_LABEL).format(values))
+            self.write_help_text_and_errors(context, field, write)
+            write(compile_template(FILE_SCRIPT).format(
+                    {'id': values['id_for_label']}))
+            write('</div>\n')
+        else:
+            write('<div class="%s">\n' % values['field_class'])
+            write(crispy_field(field))
+            write('\n')
+            self.write_help_text_and_errors(context, field, write)
+            write('</div>\n')
+
+
+    def write_choices(self, context, field, input_type, write):
+        """Port of `radioselect.html` and `checkboxselectmultiple.html`.
+        """
+        custom_control = context.get('use_custom_control')
+        inline = context.get('inline_class')
+        if custom_control:
+            choice_class = 'custom-control custom-%s' % input_type
+            if inline:
+                choice_class += ' custom-control-inline'
+            input_class, label_class = ('custom-control-input',
+                    'custom-control-label')
+        else:
+            choice_class = 'form-check'
+            if inline:
+                choice_class += ' form-check-inline'
+            input_class, label_class = ('form-check-input',
+                    'form-check-label')
+        if field.errors:
+            input_class += ' is-invalid'
+
+        field_class = context.get('field_class')
+        flat_attrs = context.get('flat_attrs')
+        write('<div class="%s"%s>\n' % (
+                ' ' + conditional_escape(field_class) if field_class else '',
+                ' ' + flat_attrs if flat_attrs else ''))
+
+        name = conditional_escape(field.html_name)
+        value = field.value()
+        selected = stringformat('' if value is None else value)
+        attrs = flatatt({key.replace('_', '-'): val for (key, val)\
+                in field.field.widget.attrs.items()})
+        template = compile_template(TEMPLATE_CHOICE_LABEL[input_type])
+        choices = list(field.field.choices)
+
+        for counter, choice in enumerate(choices, 1):
+            if input_type == 'checkbox':
+                checked = contains(value, choice[0])\
+                        or contains(value, stringformat(choice[0]))\
+                        or stringformat(choice[0]) == selected
+            else:
+                checked = stringformat(choice[0]) == selected
+            write('<div class="%s">\n' % choice_class)
+            write('<input type="%s" class="%s"%s name="%s" id="id_%s_%d" '
+                    'value="%s" %s>\n' % (input_type, input_class,
+                    ' checked="checked"' if checked else '', name, name,
+                    counter, unlocalize(choice[0]), attrs))
+            write(template.format({
+                'id': 'id_%s_%d' % (name, counter),
+                'class': label_class,
+                'label': unlocalize(choice[1]),
+            }))
+            if field.errors and counter == len(choices) and not inline:
+                self.write_errors_block(context, field, write)
+            write('</div>\n')
+
+        if field.errors and inline:
+            write('<div class="w-100 %s">\n' % choice_class)
+            write('<input type="checkbox" '
+                    'class="custom-control-input is-invalid">\n')
+            self.write_errors_block(context, field, write)
+            write('</div>\n')
+
+        self.write_help_text(context, field, write)
+        write('</div>\n')
+
+
+    def write_help_text_and_errors(self, context, field, write):
+        """Port of `help_text_and_errors.html`.
+        """
+        help_text_inline = context.get('help_text_inline')
+        error_text_inline = context.get('error_text_inline')
+        if help_text_inline and not error_text_inline:
+            self.write_help_text(context, field, write)
+        if error_text_inline:
+            self.write_errors(context, field, write, 'span')
+        else:
+            self.write_errors_block(context, field, write)
+        if not help_text_inline:
+            self.write_help_text(context, field, write)
+
+
+    def write_help_text(self, context, field, write):
+        """Port of `help_text.html`.
+        """
+        if not field.help_text:
+            return
+        if context.get('help_text_inline'):
+            template = '<span id="hint_{id}" class="text-muted">{text}</span>\n'
+        else:
+            template = '<small id="hint_{id}" class="form-text text-muted">'\
+                    '{text}</small>\n'
+        write(compile_template(template).format({
+            'id': conditional_escape(field.auto_id),
+            'text': field.help_text,
+        }))
+
+
+    def write_errors_block(self, context, field, write):
+        """Port of `field_errors_block.html`.
+        """
+        self.write_errors(context, field, write, 'p')
+
+
+    def write_errors(self, context, field, write, tag='span'):
+        """Port of `field_errors.html`, the errors in `tag` elements.
+        """
+        if not context.get('form_show_errors') or not field.errors:
+            return
+        auto_id = conditional_escape(field.auto_id)
+        for counter, error in enumerate(field.errors, 1):
+            write('<%s id="error_%d_%s" class="invalid-feedback"><strong>%s'
+                    '</strong></%s>\n' % (tag, counter, auto_id,
+                    conditional_escape(error), tag))
+
+
+    def iter_child(self, state):
+        chunks = []
+        self.write_child(state, chunks.append)
+        yield ''.join(chunks)
+
+
+    def template_default(self):
+        return '{child}'
+
+
+TEMPLATE_LABEL = '''
+<label for="{id_for_label}" class="{horizontal}{label_class}{required}">
+  {label}{asterisk}
+</label>
+'''
+"Label of the fields other than checkboxes."
+
+TEMPLATE_CHECKBOX_LABEL = '''
+<label for="{id_for_label}" class="{label_type}{required}">
+  {label}{asterisk}
+</label>
+'''
+"Label of a checkbox, after the input."
+
+TEMPLATE_FILE_LABEL = '''
+<label class="custom-file-label" for="{id_for_label}">Choose file</label>
+'''
+"Label of a file input with `use_custom_control`."
+
+TEMPLATE_CHOICE_LABEL = {
+    'radio': '<label for="{id}" class="{class}">\n  {label}\n</label>\n',
+    'checkbox': '<label class="{class}" for="{id}">\n  {label}\n</label>\n',
+}
+"Label of a radio button or a checkbox of multiple choices."
+
+components = {
+    'Form_PackField': PackField,
+}
@@ -7,10 +7,123 @@ See: https://material.io/develop/web/components/input-controls/select-menus
 """
 import logging
 #-
-from .base import Node, TextNode
+from django.core.exceptions import EmptyResultSet
+from django.urls import reverse
+from django.utils.html import conditional_escape
+from django.utils.translation import get_language
+#-
+from ..conf import get_setting
+from ..remote import get_choices as get_remote_choices
+from .base import Node, NodeList, PageState, TextNode, compile_template
 
 _logger = logging.getLogger(__name__)
 
+RENDERED_CHOICES_SIZE = 256
+"Number of fixed choice lists kept rendered."
+
+_rendered_choices = {}
+"RenderedChoices keyed by (choices as str pairs, language, minify)."
+
+
+def choices_key(field):
+    """Key of the choices of a ModelChoiceField, None for other fields.
+
+    The forms of a formset have their own copy of the field, with the same
+    query.
+    """
+    queryset = getattr(field, 'queryset', None)
+    if queryset is None:
+        return None
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    label = field.label_from_instance
+    return ('materialweb.choices', type(field), queryset.db, sql, params,
+            field.empty_label, field.to_field_name,
+            getattr(label, '__func__', label))
+
+
+def get_choices(field, page):
+    """Get the (value, label) choices of `field`, listed once per page.
+    """
+    key = choices_key(field)
+    if key is None:
+        return field.choices
+    choices = page.memo.get(key)
+    if choices is None:
+        # Not list(field.choices), the len() of ModelChoiceIterator counts.
+        choices = page.memo[key] = list(iter(field.choices))
+    return choices
+
+
+def static_choices(bound_field):
+    """Get the choices of `bound_field` if they are a fixed list, else None.
+    """
+    choices = bound_field.field.choices
+    if not isinstance(choices, list):
+        return None
+    return choices
+
+
+def render_item(context, key, label, selected):
+    """Render an Item of the Select list.
+    """
+    item = Item(NodeList([TextNode(label)]), value=key, selected=selected)
+    return item.render(context)
+
+
+class RenderedChoices:
+    """The Select list of fixed choices, rendered once.
+
+    Every item is rendered unselected, `render()` replaces the item of the
+    current value with its selected version, found by its offsets.
+    """
+    __slots__ = ('choices', 'html', 'offsets', 'selected_items')
+
+    def __init__(self, choices, context):
+        self.choices = list(choices)
+        "Copy of the choices rendered."
+
+        self.offsets = {}
+        "(index, start, end, label) of the first item of each value."
+
+        self.selected_items = {}
+        "Selected version of the items, keyed by index, rendered on use."
+
+        # The items do not take element ids from the page being rendered,
+        # they would be missing from the next pages.
+        context = context.new()
+        context.materialweb_page = PageState('materialweb-choices')
+
+        items = []
+        position = 0
+        for index, (key, label) in enumerate(self.choices):
+            label = conditional_escape(label)
+            item = render_item(context, key, label, False)
+            self.offsets.setdefault(str(key),
+                    (index, position, position + len(item), label))
+            items.append(item)
+            position += len(item) + 1
+        self.html = '\n'.join(items)
+
+
+    def render(self, context, selected):
+        """Get the items html with `selected` marked, and its label.
+        """
+        try:
+            index, start, end, label = self.offsets[selected]
+        except KeyError:
+            return self.html, ''
+
+        item = self.selected_items.get(index)
+        if item is None:
+            context = context.new()
+            context.materialweb_page = PageState('materialweb-choices')
+            item = self.selected_items[index] = render_item(context,
+                    self.choices[index][0], label, True)
+        return self.html[:start] + item + self.html[end:], label
+
 
 class Select(Node):
     """Select component.
@@ -19,64 +132,120 @@ class Select(Node):
     WANT_FORM_FIELD = True
     HIDE_FORM_FIELD = True
     MODES = ('filled', 'outlined')
-    NODE_PROPS = ('value', 'required', 'disabled')
+    NODE_PROPS = ('value', 'required', 'disabled', 'remote', 'remote_limit')
     DEFAULT_TAG = 'ul'
 
-    def prepare_attributes(self, attrs, default):
+    PROVIDES = ('list_value',)
+
+    def prepare_attributes(self, state, attrs, default):
         """Prepare html input element's attributes.
         """
-        if 'required' in self.kwargs and self.eval(self.kwargs['required']):
+        context = state.context
+        if 'required' in self.kwargs and\
+                self.eval(self.kwargs['required'], context):
             attrs['required'] = 'true'
 
-        if 'disabled' in self.kwargs and self.eval(self.kwargs['disabled']):
+        if 'disabled' in self.kwargs and\
+                self.eval(self.kwargs['disabled'], context):
             attrs['disabled'] = 'true'
 
 
-    def prepare(self):
-        self.values['value'] = self.eval(self.kwargs.get('value'))
-        self.context['list_value'] = self.values['value']
+    def prepare(self, state):
+        context = state.context
+        state.values['value'] = self.eval(self.kwargs.get('value'), context)
+        self.provide(state, 'list_value', state.values['value'])
+
+        remote = self.eval(self.kwargs.get('remote'), context)
+        if remote:
+            state.values['remote'] = get_remote_choices(remote)
 
-        self.values['items'] = '\n'.join(self.render_items())
+        state.values['items'], state.values['selected_text'] =\
+                self.render_items(state)
 
-        field = self.bound_field.field
-        choices = {str(choice): text for choice, text in field.choices}
-        selected = self.bound_field.value()
-        self.values['selected_text'] = choices.get(selected, '')
+        field = state.bound_field.field
 
         anchor_props = []
 
-        if ('required' in self.kwargs and self.eval(self.kwargs['required']))\
+        if ('required' in self.kwargs and\
+                self.eval(self.kwargs['required'], context))\
                 or field.required:
-            self.values['class'].append('mdc-select--required')
+            state.values['class'].append('mdc-select--required')
             anchor_props.append(('aria-required', 'true'))
 
-        if ('disabled' in self.kwargs and self.eval(self.kwargs['disabled']))\
+        if ('disabled' in self.kwargs and\
+                self.eval(self.kwargs['disabled'], context))\
                 or field.disabled:
-            self.values['class'].append('mdc-select--disabled')
+            state.values['class'].append('mdc-select--disabled')
             anchor_props.append(('aria-disabled', 'true'))
 
-        self.values['anchor_props'] = self.join_attributes(anchor_props)
+        if remote:
+            anchor_props.append(('data-remote-url',
+                    reverse('materialweb:choices', args=[remote])))
 
-        self.values['dropdown_icon'] = self.template_dropdown_icon()
+        state.values['anchor_props'] = self.join_attributes(anchor_props)
 
-        if self.values['label']:
-            template_method = getattr(self, 'template_label_' + self.mode)
-            self.values['html_label'] = template_method().format(self.values)
+        state.values['dropdown_icon'] = self.format_template(state,
+                self.template_dropdown_icon(), {})
+
+        if state.values['label']:
+            template_method = getattr(self, 'template_label_' + state.mode)
+            state.values['html_label'] = compile_template(
+                    template_method()).format(state.values)
         else:
-            self.values['class'].append('mdc-select--no-label')
-            self.values['html_label'] = ''
+            state.values['class'].append('mdc-select--no-label')
+            state.values['html_label'] = ''
 
 
-    def render_items(self):
-        selected = self.bound_field.value()
-        for key, val in self.bound_field.field.choices:
-            item = Item(
-                    TextNode(val),
-                    **{
-                        'value': key,
-                        'selected': key == selected,
-                    })
-            yield item.render(self.context)
+    def render_items(self, state):
+        """Render the items and find the selected label, in one pass.
+
+        With the `remote` argument, only the current value and the first
+        `remote_limit` choices. Fixed choices are rendered once, see
+        `rendered_choices()`.
+        """
+        selected = state.bound_field.value()
+        selected = '' if selected is None else str(selected)
+        selected_text = ''
+
+        remote = state.values.get('remote')
+        if remote is None:
+            choices = static_choices(state.bound_field)
+            if choices is not None:
+                return self.rendered_choices(state, choices)\
+                        .render(state.context, selected)
+            choices = get_choices(state.bound_field.field, state.page)
+        else:
+            limit = self.eval(self.kwargs.get('remote_limit'), state.context)
+            choices = remote.initial(selected, int(limit) if limit else None)
+
+        items = []
+        for key, val in choices:
+            val = conditional_escape(val)
+            is_selected = str(key) == selected
+            if is_selected:
+                selected_text = val
+            items.append(render_item(state.context, key, val, is_selected))
+        return '\n'.join(items), selected_text
+
+
+    def rendered_choices(self, state, choices):
+        """Get the RenderedChoices of a fixed list of choices.
+
+        Shared by every Select of the same choices, in the current language.
+        The key is their contents, a list changed in place gets rendered
+        again.
+        """
+        key = (tuple((str(value), str(label)) for value, label in choices),
+                get_language(), get_setting('MATERIALWEB_MINIFY'))
+        rendered = _rendered_choices.get(key)
+        if rendered is not None:
+            return rendered
+
+        rendered = RenderedChoices(choices, state.context)
+        if len(_rendered_choices) >= RENDERED_CHOICES_SIZE:
+            _rendered_choices.clear()
+        _rendered_choices[key] = rendered
+        return rendered
 
 
     def template_filled(self):
@@ -186,21 +355,26 @@ class Item(Node):
     """Select list item.
     """
     WANT_CHILDREN = True
-    NODE_PROPS = ('value', 'disabled')
+    NODE_PROPS = ('value', 'selected', 'disabled')
     DEFAULT_TAG = 'li'
+    READS_CONTEXT = True
 
-    def prepare(self):
-        self.values['value'] = self.eval(self.kwargs['value'])
-        self.values['selected'] = self.values['value'] ==\
-                self.context['list_value']
+    def prepare(self, state):
+        state.values['value'] = self.eval(self.kwargs['value'], state.context)
+        if 'selected' in self.kwargs:
+            state.values['selected'] = self.eval(self.kwargs['selected'],
+                    state.context)
+        else:
+            state.values['selected'] = state.values['value'] ==\
+                    self.provided(state, 'list_value')
 
-        if self.values['selected']:
-            self.values['class'].append('mdc-list-item--selected')
-            self.values['props'].append(('aria-selected', 'true'))
+        if state.values['selected']:
+            state.values['class'].append('mdc-list-item--selected')
+            state.values['props'].append(('aria-selected', 'true'))
 
-        if self.eval(self.kwargs.get('disabled', False)):
-            self.values['class'].append('mdc-list-item--disabled')
-            self.values['props'].append(('aria-disabled', 'true'))
+        if self.eval(self.kwargs.get('disabled', False), state.context):
+            state.values['class'].append('mdc-list-item--disabled')
+            state.values['props'].append(('aria-disabled', 'true'))
 
 
     def template_default(self):
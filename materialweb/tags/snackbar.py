@@ -6,13 +6,13 @@ class Snackbar(Node):
     WANT_CHILDREN = True
     NODE_PROPS = ('stacked', 'leading')
 
-    def prepare(self):
-        stacked = self.eval(self.kwargs.get('stacked'))
+    def prepare(self, state):
+        stacked = self.eval(self.kwargs.get('stacked'), state.context)
         if stacked:
-            self.values['class'].append('mdc-snackbar--stacked')
-        leading = self.eval(self.kwargs.get('leading'))
+            state.values['class'].append('mdc-snackbar--stacked')
+        leading = self.eval(self.kwargs.get('leading'), state.context)
         if leading:
-            self.values['class'].append('mdc-snackbar--leading')
+            state.values['class'].append('mdc-snackbar--leading')
 
 
     def template_default(self):
@@ -45,8 +45,10 @@ class Actions(Node):
 
     WANT_CHILDREN = True
 
-    def prepare(self):
-        self.context['button_class'] = ['mdc-snackbar__action']
+    PROVIDES = ('button_class',)
+
+    def prepare(self, state):
+        self.provide(state, 'button_class', ['mdc-snackbar__action'])
 
 
     def template_default(self):
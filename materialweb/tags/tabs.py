@@ -53,7 +53,7 @@ class TabBar(Node):
     MODES = ('scoll',)
     "Available variants."
 
-    def prepare(self):
+    def prepare(self, state):
         pass
 
     def template_scroll(self):
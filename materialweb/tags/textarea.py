@@ -9,7 +9,7 @@ The text field class consists of the following types:
 See: https://material-components.github.io/material-components-web-catalog/#/component/text-field
 """ # pylint:disable=line-too-long
 
-from .base import Node
+from .base import Node, compile_template
 
 
 class TextArea(Node):
@@ -21,20 +21,21 @@ class TextArea(Node):
     MODES = ('filled', 'outlined')
     DEFAULT_TAG = 'label'
 
-    def prepare_attributes(self, attrs, default):
+    def prepare_attributes(self, state, attrs, default):
         """Prepare html input element's attributes.
         """
-        attrs['aria-label'] = self.values['label']
+        attrs['aria-label'] = state.values['label']
         attrs['class'].append('mdc-text-field__input')
 
 
-    def prepare(self):
-        if self.values.get('label'):
-            method = getattr(self, 'template_label_%s' % self.mode)
-            self.values['html_label'] = method().format(**self.values)
+    def prepare(self, state):
+        if state.values.get('label'):
+            method = getattr(self, 'template_label_%s' % state.mode)
+            state.values['html_label'] = compile_template(method()).format(
+                    state.values)
         else:
-            self.values['class'].append('mdc-text-field--no-label')
-            self.values['html_label'] = ''
+            state.values['class'].append('mdc-text-field--no-label')
+            state.values['html_label'] = ''
 
 
     def template_filled(self):
@@ -21,15 +21,15 @@ class TextField(Node):
     MODES = ('filled', 'outlined', 'fullwidth')
     DEFAULT_TAG = 'label'
 
-    def prepare_attributes(self, attrs, default):
+    def prepare_attributes(self, state, attrs, default):
         """Prepare html input element's attributes.
         """
-        if self.mode == 'fullwidth':
-            attrs['aria-label'] = self.values['label']
+        if state.mode == 'fullwidth':
+            attrs['aria-label'] = state.values['label']
         else:
-            attrs['aria-labelledby'] = self.values['id'] + '-label'
+            attrs['aria-labelledby'] = state.values['id'] + '-label'
         if not 'placeholder' in attrs:
-            attrs['placeholder'] = self.values['label']
+            attrs['placeholder'] = state.values['label']
         attrs['class'].append('mdc-text-field__input')
 
 
@@ -21,22 +21,21 @@ class TopAppBar(Node):
     MODES = ('default', 'short', 'short_closed', 'fixed', 'prominent', 'dense')
     DEFAULT_TAG = 'header'
 
-    def prepare(self):
-        if self.mode == 'short':
-            self.values['class'].append('mdc-top-app-bar--short')
-        elif self.mode == 'short_closed':
-            self.values['class'].append('mdc-top-app-bar--short')
-            self.values['class'].append('mdc-top-app-bar--short-collapsed')
-        elif self.mode == 'fixed':
-            self.values['class'].append('mdc-top-app-bar--fixed')
-        elif self.mode == 'prominent':
-            self.values['class'].append('mdc-top-app-bar--prominent')
-        elif self.mode == 'dense':
-            self.values['class'].append('mdc-top-app-bar--dense')
-
-
-    @property
-    def template(self):
+    def prepare(self, state):
+        if state.mode == 'short':
+            state.values['class'].append('mdc-top-app-bar--short')
+        elif state.mode == 'short_closed':
+            state.values['class'].append('mdc-top-app-bar--short')
+            state.values['class'].append('mdc-top-app-bar--short-collapsed')
+        elif state.mode == 'fixed':
+            state.values['class'].append('mdc-top-app-bar--fixed')
+        elif state.mode == 'prominent':
+            state.values['class'].append('mdc-top-app-bar--prominent')
+        elif state.mode == 'dense':
+            state.values['class'].append('mdc-top-app-bar--dense')
+
+
+    def template(self, state):
         """Get formatted literal string for different types of TopAppBar.
 
         Overridden because the templates are the same.
@@ -56,8 +55,10 @@ class LeftSection(Node):
     WANT_CHILDREN = True
     DEFAULT_TAG = 'section'
 
-    def prepare(self):
-        self.context['button_class'] = ['mdc-top-app-bar__action-item']
+    PROVIDES = ('button_class',)
+
+    def prepare(self, state):
+        self.provide(state, 'button_class', ['mdc-top-app-bar__action-item'])
 
 
     def template_default(self):
@@ -73,10 +74,11 @@ class Menu(Node):
     """TopAppBar navigation button
     """
     WANT_CHILDREN = True
+    READS_CONTEXT = True
 
-    def prepare(self):
-        if not self.values['label']:
-            self.values['label'] = _("Open navigation menu")
+    def prepare(self, state):
+        if not state.values['label']:
+            state.values['label'] = _("Open navigation menu")
 
 
     def template_default(self):
@@ -103,8 +105,10 @@ class RightSection(Node):
     WANT_CHILDREN = True
     DEFAULT_TAG = 'section'
 
-    def prepare(self):
-        self.context['button_class'] = ['mdc-top-app-bar__action-item']
+    PROVIDES = ('button_class',)
+
+    def prepare(self, state):
+        self.provide(state, 'button_class', ['mdc-top-app-bar__action-item'])
 
 
     def template_default(self):
@@ -1,10 +1,12 @@
 import logging
 #-
 from django import template
+from django.template.base import TextNode
 #-
-from ..tags import banner, button, card, checkbox, data_table, drawer, imagelist
-from ..tags import lists, menu, select, snackbar, tabs, textarea, textfield
-from ..tags import top_appbar
+from ..tags import banner, button, card, checkbox, data_table, drawer, form
+from ..tags import imagelist, lists, menu, pack, select, snackbar, tabs
+from ..tags import textarea, textfield, top_appbar
+from ..tags.base import page_state
 
 _logger = logging.getLogger(__name__)
 register = template.Library()
@@ -17,9 +19,11 @@ MATERIAL_TAGS = {
     **checkbox.components,
     **data_table.components,
     **drawer.components,
+    **form.components,
     **imagelist.components,
     **lists.components,
     **menu.components,
+    **pack.components,
     **select.components,
     **snackbar.components,
     **tabs.components,
@@ -63,7 +67,29 @@ class TagParser:
             parser.delete_first_token()
             args.insert(0, nodelist)
 
-        return cls(*args, **kwargs)
+        node = cls(*args, **kwargs)
+        if node.is_static():
+            # Fully literal subtree, render it once. Not when its output has
+            # element ids, which would repeat in loops and includes: those
+            # make two renders in pages of different prefixes differ.
+            output = self.prerender(node, 'mw-static-a')
+            if output is not None\
+                    and output == self.prerender(node, 'mw-static-b'):
+                return TextNode(output)
+        return node
+
+
+    def prerender(self, node, prefix):
+        """Render a static node on its own, None if it uses shared SVG shapes,
+        which must be written once per page, not frozen.
+        """
+        context = template.Context()
+        page = page_state(context)
+        page.id_prefix = prefix
+        output = node.render(context)
+        if page.symbols:
+            return None
+        return output
 
 
 _parser = TagParser(MATERIAL_TAGS)
@@ -0,0 +1,25 @@
+"""Run the Django test cases of this package with pytest.
+"""
+import os
+#-
+import django
+import pytest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'materialweb.tests.settings')
+django.setup()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def django_test_environment():
+    """Create the test database once, like the Django test runner does.
+    """
+    # pylint:disable=import-outside-toplevel
+    from django.db import connection
+    from django.test.utils import setup_test_environment,\
+            teardown_test_environment
+
+    setup_test_environment()
+    name = connection.creation.create_test_db(verbosity=0)
+    yield
+    connection.creation.destroy_test_db(name, verbosity=0)
+    teardown_test_environment()
@@ -0,0 +1,33 @@
+"""Django settings of the materialweb test suite.
+
+.. code-block:: sh
+
+   python -m pytest
+   python -m django test materialweb.tests --settings=materialweb.tests.settings
+
+"""
+SECRET_KEY = 'materialweb-tests'
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'materialweb',
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+}
+
+TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {
+        'builtins': ['django.templatetags.i18n'],
+    },
+}]
+
+USE_I18N = True
+USE_TZ = True
@@ -0,0 +1,332 @@
+from concurrent.futures import ThreadPoolExecutor
+import re
+from unittest.mock import patch
+#-
+from django import forms
+from django.template import Context, Engine, Library, engines
+from django.template.base import TextNode
+from django.template.loader import render_to_string
+from django.test import RequestFactory, SimpleTestCase, override_settings
+#-
+from materialweb.tags.base import CompiledTemplate, Node, page_state
+from materialweb.templatetags.materialweb import TagParser
+
+PAGE = '''{% load materialweb %}
+{% Card_Actions %}
+  {% for label in labels %}
+    {% Button mode=mode %}{{ label }}{% endButton %}
+  {% endfor %}
+{% endCard_Actions %}
+{% Table row_selectable=True name=name %}
+  {% Table_Body %}
+    {% for label in labels %}
+      {% Table_Row value=forloop.counter %}
+        {% Table_ColHeader %}{{ label }}{% endTable_ColHeader %}
+        {% Table_Col class=mode %}{{ name }}{% endTable_Col %}
+      {% endTable_Row %}
+    {% endfor %}
+  {% endTable_Body %}
+{% endTable %}
+'''
+
+
+class Labelled(Node):
+    """Literal Template Tag whose output has an element id.
+    """
+    WANT_CHILDREN = True
+
+    def template_default(self):
+        return '<label for="{id}">{child}</label>'
+
+
+register = Library()
+register.tag('Labelled', TagParser({'Labelled': Labelled}))
+
+engine = Engine(libraries={
+    'materialweb': 'materialweb.templatetags.materialweb',
+    'materialweb_test': __name__,
+})
+
+
+def page_context(number):
+    return {
+        'labels': ['label%d-%d' % (number, i) for i in range(number % 7)],
+        'mode': ('outlined', 'raised')[number % 2],
+        'name': 'table%d' % number,
+    }
+
+
+class ConcurrentRenderTest(SimpleTestCase):
+
+    def test_shared_template(self):
+        template = engines['django'].from_string(PAGE)
+        expected = [template.render(page_context(i)) for i in range(64)]
+
+        with ThreadPoolExecutor(8) as executor:
+            for _ in range(4):
+                results = list(executor.map(lambda i: template.render(
+                        page_context(i)), range(64)))
+                self.assertEqual(results, expected)
+
+
+    def test_same_output_every_render(self):
+        template = engines['django'].from_string(PAGE)
+        self.assertEqual(template.render(page_context(5)),
+                template.render(page_context(5)))
+
+
+class RequestRendersTest(SimpleTestCase):
+
+    @override_settings(TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'OPTIONS': {
+            'loaders': [('django.template.loaders.locmem.Loader', {
+                'list.html': '{% load materialweb %}'
+                        '{% SelectList mode="radio" %}'
+                        '{% SelectList_Item name="size" value="s" %}Small'
+                        '{% endSelectList_Item %}{% endSelectList %}',
+            })],
+        },
+    }])
+    def test_ids_per_render(self):
+        ids = re.compile(r'id="([^"]+)"')
+        request = RequestFactory().get('/')
+        first = render_to_string('list.html', {}, request)
+        second = render_to_string('list.html', {}, request)
+        self.assertTrue(ids.findall(first))
+        self.assertFalse(set(ids.findall(first)) & set(ids.findall(second)))
+
+        # The same ids for every request.
+        self.assertEqual(render_to_string('list.html', {},
+                RequestFactory().get('/')), first)
+        self.assertEqual(render_to_string('list.html', {}), first)
+
+
+class StaticSubtreeTest(SimpleTestCase):
+
+    def parse(self, source):
+        return engine.from_string('{% load materialweb materialweb_test %}' +\
+                source)
+
+
+    def test_collapsed(self):
+        template = self.parse('{% Card_Actions %}{% Button mode="raised" %}'
+                'Go{% endButton %}{% endCard_Actions %}')
+        self.assertEqual([type(x) for x in template.nodelist[1:]],
+                [TextNode])
+
+        dynamic = self.parse('{% Card_Actions %}{% Button mode=mode %}'
+                'Go{% endButton %}{% endCard_Actions %}')
+        self.assertNotIsInstance(dynamic.nodelist[1], TextNode)
+        self.assertEqual(template.render(Context()),
+                dynamic.render(Context({'mode': 'raised'})))
+
+
+    def test_element_ids_not_collapsed(self):
+        for source in ('{% Labelled %}Name{% endLabelled %}',
+                '{% Card_Actions %}{% Labelled %}Name{% endLabelled %}'
+                '{% endCard_Actions %}'):
+            template = self.parse('{% for i in "ab" %}' + source +\
+                    '{% endfor %}')
+            node = template.nodelist[1].nodelist_loop[0]
+            self.assertNotIsInstance(node, TextNode, source)
+            ids = re.findall(r'for="([^"]*)"', template.render(Context()))
+            self.assertEqual(len(ids), 2)
+            self.assertNotEqual(ids[0], ids[1])
+
+
+    def test_unprovided_catch_not_collapsed(self):
+        # The classes of the Card_Actions around it are only known on render.
+        template = self.parse('{% Button %}Go{% endButton %}')
+        self.assertNotIsInstance(template.nodelist[1], TextNode)
+
+
+class RenderIntoTest(SimpleTestCase):
+
+    values = {'tag': 'p', 'class': 'a {b}', 'child': '<i>child</i>'}
+
+    def write(self, compiled, child=None):
+        chunks = []
+        compiled.write(self.values, chunks.append, child)
+        return ''.join(chunks)
+
+
+    def test_compiled_template(self):
+        for text in ('<{tag} class="{class}">{child}</{tag}>', '{child}',
+                'no fields', '{tag:>4}{child!r}'):
+            expected = text.format(**self.values)
+            compiled = CompiledTemplate(text)
+            self.assertEqual(compiled.format(self.values), expected, text)
+            self.assertEqual(self.write(compiled), expected, text)
+            self.assertEqual(self.write(compiled,
+                    lambda write: write(self.values['child'])), expected, text)
+            self.assertEqual(''.join(compiled.iter(self.values,
+                    lambda: iter([self.values['child']]))), expected, text)
+
+
+    def test_same_as_string_children(self):
+        # Children rendered as a string and formatted into the parent.
+        template = engines['django'].from_string(PAGE)
+        expected = template.render(page_context(4))
+        with patch.object(Node, 'write_child',
+                lambda self, state, write: write(self.child(state))):
+            self.assertEqual(template.render(page_context(4)), expected)
+
+
+class Broken:
+
+    @property
+    def label(self):
+        raise ValueError
+
+
+class ScopeTest(SimpleTestCase):
+
+    def buttons(self, source, **context):
+        template = engines['django'].from_string('{% load materialweb %}' +\
+                source)
+        html = template.render(dict(context, mode='raised'))
+        return re.findall(r'<button class="([^"]*)"[^>]*>\s*'
+                r'<span class="mdc-button__ripple"></span>\s*(\w+)', html)
+
+
+    def test_not_past_end_tag(self):
+        self.assertEqual(self.buttons(
+                '{% Card_Actions %}{% Button mode=mode %}A{% endButton %}'
+                '{% endCard_Actions %}{% Button mode=mode %}B{% endButton %}'), [
+            ('mdc-button mdc-button--touch mdc-card__action '
+                'mdc-card__action--button mdc-button--raised', 'A'),
+            ('mdc-button mdc-button--touch mdc-button--raised', 'B'),
+        ])
+
+
+    def test_nested_restored(self):
+        buttons = self.buttons('{% Card_Actions %}{% Snackbar_Actions %}'
+                '{% Button mode=mode %}A{% endButton %}{% endSnackbar_Actions %}'
+                '{% Button mode=mode %}B{% endButton %}{% endCard_Actions %}')
+        self.assertEqual([label for (_, label) in buttons], ['A', 'B'])
+        self.assertIn('mdc-snackbar__action', buttons[0][0])
+        self.assertNotIn('mdc-card__action', buttons[0][0])
+        self.assertIn('mdc-card__action', buttons[1][0])
+        self.assertNotIn('mdc-snackbar__action', buttons[1][0])
+
+
+    def test_in_loop(self):
+        buttons = self.buttons('{% for i in "ab" %}{% Button mode=mode %}'
+                '{{ i }}{% endButton %}{% Card_Actions %}{% Button mode=mode %}'
+                'X{% endButton %}{% endCard_Actions %}{% endfor %}')
+        self.assertEqual(['mdc-card__action' in classes\
+                for (classes, _) in buttons], [False, True, False, True])
+
+
+    def test_released_on_error(self):
+        template = engines['django'].from_string('{% load materialweb %}'
+                '{% Card_Actions %}{% Button mode=mode %}{{ broken.label }}'
+                '{% endButton %}{% endCard_Actions %}').template
+        context = Context({'mode': 'raised', 'broken': Broken()})
+        with self.assertRaises(ValueError):
+            template.render(context)
+        self.assertEqual(page_state(context).scope, {})
+
+
+class ChoiceForm(forms.Form):
+    color = forms.ChoiceField(choices=[('r', 'Red'), ('g', 'Green')])
+    size = forms.ChoiceField(choices=[('s', 'Small'), ('l', 'Large')])
+    agree = forms.BooleanField()
+
+
+SPRITE_PAGE = '''{% load materialweb %}
+{% Select form.color %}{% endSelect %}
+{% CheckBox form.agree %}
+{% Select form.size %}{% endSelect %}
+{% include "sprite_include.html" %}
+'''
+
+
+class SpriteTest(SimpleTestCase):
+
+    def render(self):
+        template_engine = Engine(libraries={
+            'materialweb': 'materialweb.templatetags.materialweb',
+        }, loaders=[('django.template.loaders.locmem.Loader', {
+            'sprite_include.html': '{% load materialweb %}'
+                    '{% CheckBox form.agree %}',
+        })])
+        return template_engine.from_string(SPRITE_PAGE).render(Context({
+            'form': ChoiceForm()}))
+
+
+    @override_settings(MATERIALWEB_SVG_SPRITE=True)
+    def test_defined_once(self):
+        html = self.render()
+        for name in ('mw-checkmark', 'mw-dropdown-inactive',
+                'mw-dropdown-active'):
+            self.assertEqual(html.count('id="%s"' % name), 1, name)
+            self.assertLess(html.index('id="%s"' % name),
+                    html.index('href="#%s"' % name), name)
+        self.assertEqual(html.count('href="#mw-checkmark"'), 2)
+        self.assertEqual(html.count('href="#mw-dropdown-active"'), 2)
+        self.assertNotIn('points="7 10 12 15 17 10"', html.split('</defs>',
+                2)[-1])
+
+
+    @override_settings(MATERIALWEB_SVG_SPRITE=True)
+    def test_every_page(self):
+        self.assertEqual(self.render(), self.render())
+
+
+    def test_disabled(self):
+        html = self.render()
+        self.assertNotIn('<use', html)
+        self.assertNotIn('<defs>', html)
+        self.assertEqual(html.count('d="M1.73,12.91 8.1,19.28 22.79,4.59"'),
+                2)
+
+
+class NoteForm(forms.Form):
+    note = forms.CharField(widget=forms.Textarea)
+
+
+MINIFY_PAGE = PAGE + '''
+{% Card mode=mode %}
+  {% Card_Content %}<pre>  first
+    second</pre>{% endCard_Content %}
+{% endCard %}
+{% TextArea form.note %}
+'''
+
+NOTE = 'line one\n    indented\n\n'
+
+
+def collapse_space(html):
+    """Remove the white space around tags, collapse it elsewhere.
+
+    Minify removes the line breaks between a tag and a field of the
+    template, like the text of a button.
+    """
+    return re.sub(r'\s+', ' ', re.sub(r'\s*(<[^>]*>)\s*', r'\1', html))\
+            .strip()
+
+
+class MinifyTest(SimpleTestCase):
+
+    def render(self):
+        template = engines['django'].from_string(MINIFY_PAGE)
+        context = page_context(4)
+        context['form'] = NoteForm({'note': NOTE})
+        return template.render(context)
+
+
+    def test_equivalent(self):
+        normal = self.render()
+        with self.settings(MATERIALWEB_MINIFY=True):
+            minified = self.render()
+        self.assertLess(len(minified), len(normal))
+        self.assertEqual(collapse_space(minified), collapse_space(normal))
+
+
+    @override_settings(MATERIALWEB_MINIFY=True)
+    def test_preformatted_kept(self):
+        html = self.render()
+        self.assertIn('<pre>  first\n    second</pre>', html)
+        self.assertIn('>\n%s</textarea>' % NOTE, html)
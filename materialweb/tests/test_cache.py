@@ -0,0 +1,144 @@
+from datetime import datetime, timezone as dt_timezone
+from threading import Thread
+from unittest.mock import patch
+#-
+from django.template import TemplateSyntaxError, engines
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils import timezone, translation
+#-
+from materialweb.cache import get_cache, get_fragment, store
+
+
+def render(source, **context):
+    template = engines['django'].from_string('{% load materialweb %}' +\
+            source)
+    return template.render(context)
+
+
+class FragmentTest(SimpleTestCase):
+
+    def setUp(self):
+        get_cache().clear()
+
+
+    def test_cached(self):
+        source = '{% Button mode="raised" cache=True vary_on="fixed" %}'\
+                '{{ label }}{% endButton %}'
+        self.assertIn('first', render(source, label='first'))
+        self.assertIn('first', render(source, label='second'))
+
+
+    def test_attributes(self):
+        source = '{% Card cache=True class=classes %}{% translate "Yes" %}'\
+                '{% endCard %}'
+        self.assertIn('class="mdc-card first ', render(source,
+                classes='first'))
+        self.assertIn('class="mdc-card second ', render(source,
+                classes='second'))
+
+
+    def test_children_need_vary_on(self):
+        for source in (
+                '{% Card cache=True class=c %}{{ user }}{% endCard %}',
+                '{% Card cache=True %}{% Button mode=mode %}Go{% endButton %}'
+                    '{% endCard %}',
+                '{% Card cache=True %}{% if user %}Hi{% endif %}{% endCard %}',
+                '{% Table source=items columns=columns cache=True %}'
+                    '{% endTable %}',
+                '{% Form form cache=True %}',
+                '{% ToggleButton state=state cache=True %}'
+                    '{% endToggleButton %}'):
+            with self.subTest(source=source):
+                with self.assertRaisesRegex(TemplateSyntaxError, 'vary_on'):
+                    render(source)
+
+
+    def test_vary_on(self):
+        source = '{% Button mode="raised" cache=True vary_on=label %}'\
+                '{{ label }}{% endButton %}'
+        self.assertIn('first', render(source, label='first'))
+        self.assertIn('second', render(source, label='second'))
+
+
+    def test_language(self):
+        source = '{% Button mode="raised" cache=True %}{% translate "Yes" %}'\
+                '{% endButton %}'
+        with translation.override('en'):
+            self.assertIn('Yes', render(source))
+        with translation.override('de'):
+            self.assertIn('Ja', render(source))
+
+
+    def test_time_zone(self):
+        source = '{% Button mode="raised" cache=True vary_on=when %}'\
+                '{{ when|time:"H:i" }}{% endButton %}'
+        when = datetime(2024, 1, 1, 12, tzinfo=dt_timezone.utc)
+        with timezone.override('UTC'):
+            self.assertIn('12:00', render(source, when=when))
+        with timezone.override('Asia/Tokyo'):
+            self.assertIn('21:00', render(source, when=when))
+
+
+    def test_no_request(self):
+        source = '{% Button mode="raised" cache=True vary_on="" %}'\
+                '[{{ request.path }}{{ csrf_token }}]{% endButton %}'
+        template = engines['django'].from_string('{% load materialweb %}' +\
+                source)
+        html = template.render({'request': RequestFactory().get('/private/'),
+                'csrf_token': 'secret'})
+        self.assertIn('[]', html)
+
+
+    @override_settings(MATERIALWEB_SVG_SPRITE=True)
+    def test_sprite_once_per_page(self):
+        source = '{% Table source=items columns=columns row_selectable=True '\
+                'row_value="a" cache=True vary_on="items" %}{% endTable %}'
+        context = {'items': [{'a': 1}], 'columns': ['a']}
+        for _ in range(2):
+            html = render(source + source, **context)
+            self.assertEqual(html.count('id="mw-checkmark"'), 1)
+            self.assertLess(html.index('id="mw-checkmark"'),
+                    html.index('href="#mw-checkmark"'))
+
+
+class RefreshTest(SimpleTestCase):
+
+    key = 'materialweb.tests.fragment'
+
+    def setUp(self):
+        self.cache = get_cache()
+        self.cache.clear()
+        # Expired, but still stored.
+        store(self.cache, self.key, -10, 'stale')
+
+
+    def refresh(self, renderer):
+        threads = []
+
+        def _thread(target, args=(), daemon=None):
+            thread = Thread(target=target, args=args, daemon=daemon)
+            threads.append(thread)
+            return thread
+
+        with patch('materialweb.cache.Thread', _thread),\
+                patch('materialweb.cache.connections') as connections:
+            self.assertEqual(get_fragment(self.key, 60, lambda: renderer),
+                    'stale')
+            self.assertEqual(len(threads), 1)
+            threads[0].join()
+        connections.close_all.assert_called_once_with()
+
+
+    def test_refreshed(self):
+        self.refresh(lambda: 'fresh')
+        self.assertEqual(get_fragment(self.key, 60, None), 'fresh')
+        self.assertIsNone(self.cache.get(self.key + ':refresh'))
+
+
+    def test_failed(self):
+        def _render():
+            raise ValueError
+
+        with self.assertLogs('materialweb.cache', 'ERROR'):
+            self.refresh(_render)
+        self.assertIsNone(self.cache.get(self.key + ':refresh'))
@@ -0,0 +1,245 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import re
+from unittest.mock import patch
+#-
+from django.core.paginator import Paginator
+from django.template import TemplateSyntaxError, engines
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils import translation
+#-
+from materialweb.tags.data_table import BodyRow, pagination_markup
+
+VALUES = [1234567, -42, 0, Decimal('1234.50'), Decimal('-0.001'), 2.5,
+        1e-07, 1.5e+20, Decimal('1E+3'), Decimal('2.5E-8'), date(2024, 2, 29), datetime(2024, 2, 29, 23, 30, tzinfo=timezone.utc),
+        None, True, '<b>&amp;</b>']
+
+CELL = re.compile(r'<t[dh] class="mdc-data-table__cell[^"]*"[^>]*>(.*?)'
+        r'</t[dh]>', re.S)
+ELEMENT_ID = re.compile(r'\bmw[0-9a-f]*-\d+|\b[0-9a-f]{32}\b')
+
+ROWS = '''{% load materialweb %}
+{% Table row_selectable=selectable name="row" %}
+  {% Table_Body %}
+    {% for item in items %}
+      {% Table_Row value=item.pk %}
+        {% Table_ColHeader %}{{ item.name }}{% endTable_ColHeader %}
+        {% Table_Col type="num" %}
+          {{ item.amount }} &times; {{ item.amount|add:1 }}
+        {% endTable_Col %}
+        {% Table_Col %}{% if item.pk %}#{{ item.pk }}{% endif %}{% endTable_Col %}
+      {% endTable_Row %}
+    {% endfor %}
+  {% endTable_Body %}
+{% endTable %}
+'''
+
+
+def render(source, **context):
+    template = engines['django'].from_string(
+            '{% load l10n materialweb %}' + source)
+    return template.render(context)
+
+
+def numbered_ids(html):
+    """Replace the element ids by their order of appearance.
+    """
+    ids = {}
+    return ELEMENT_ID.sub(lambda match: 'id%d' % ids.setdefault(
+            match.group(0), len(ids)), html)
+
+
+class SourceTest(SimpleTestCase):
+
+    def source_cells(self, values, localize='on'):
+        source = '{% Table source=items columns=columns %}{% endTable %}'
+        if localize:
+            source = '{% localize ' + localize + ' %}' + source +\
+                    '{% endlocalize %}'
+        html = render(source,
+                items=[{'v%d' % index: value\
+                    for (index, value) in enumerate(values)}],
+                columns=['v%d' % index for index in range(len(values))])
+        return CELL.findall(html)
+
+
+    def template_cells(self, values, localize='on'):
+        return [render('{% localize ' + localize + ' %}{{ value }}'
+                '{% endlocalize %}', value=value) for value in values]
+
+
+    def assertSameCells(self, localize='on'):
+        self.assertEqual(self.source_cells(VALUES, localize),
+                self.template_cells(VALUES, localize))
+
+
+    def test_values(self):
+        self.assertSameCells()
+
+
+    @override_settings(USE_THOUSAND_SEPARATOR=True)
+    def test_localized(self):
+        with translation.override('de'):
+            self.assertSameCells()
+            self.assertIn('1.234.567', self.source_cells([1234567]))
+
+
+    @override_settings(USE_THOUSAND_SEPARATOR=True)
+    def test_localize_off(self):
+        with translation.override('de'):
+            self.assertSameCells('off')
+            self.assertEqual(self.source_cells([1234567], 'off'),
+                    ['1234567'])
+
+
+    @override_settings(USE_L10N=False)
+    def test_l10n_setting_off(self):
+        # Django 4 setting: numbers are not localized, but still formatted
+        # by number_format(), unlike in {% localize off %}.
+        with patch('materialweb.tags.data_table.DJANGO_VERSION', (4, 2)):
+            self.assertEqual(self.source_cells([1e-07, 1.5e+20,
+                    Decimal('1E+3'), Decimal('2.5E-8'), 1234567], None),
+                    ['0.0000001', '150000000000000000000', '1000',
+                    '0.000000025', '1234567'])
+
+
+    def test_autoescape_off(self):
+        html = render('{% autoescape off %}'
+                '{% Table source=items columns=columns %}{% endTable %}'
+                '{% endautoescape %}', items=[{'a': '<b>'}], columns=['a'])
+        self.assertEqual(CELL.findall(html), ['<b>'])
+
+
+    def test_missing_source(self):
+        with self.assertRaisesRegex(TemplateSyntaxError, 'source or pager'):
+            render('{% Table columns=columns %}{% endTable %}',
+                    columns=['a'])
+
+
+class CompiledRowTest(SimpleTestCase):
+
+    items = [
+        {'pk': 1, 'name': 'Frozen <yogurt>', 'amount': 1234},
+        {'pk': 2, 'name': 'Eclair', 'amount': Decimal('2.50')},
+        {'pk': None, 'name': None, 'amount': None},
+    ]
+
+    def render(self, selectable, compiled=True):
+        template = engines['django'].from_string(ROWS)
+        context = {'items': self.items, 'selectable': selectable}
+        if compiled:
+            return template.render(context)
+        with patch.object(BodyRow, 'render_row', return_value=None):
+            return template.render(context)
+
+
+    def assertSameRows(self, selectable):
+        compiled = self.render(selectable)
+        generic = self.render(selectable, compiled=False)
+        # The cells of the generic rendering take element ids too.
+        self.assertEqual(numbered_ids(compiled), numbered_ids(generic))
+        return compiled, generic
+
+
+    def test_not_selectable(self):
+        compiled, generic = self.assertSameRows(False)
+        self.assertEqual(compiled, generic)
+        self.assertIn('Frozen &lt;yogurt&gt;', compiled)
+
+
+    def test_selectable(self):
+        compiled, _ = self.assertSameRows(True)
+        self.assertEqual(len(re.findall(r'aria-labelledby="(mw-\d+)-header"',
+                compiled)), 3)
+
+
+    @override_settings(MATERIALWEB_MINIFY=True)
+    def test_minify(self):
+        compiled, _ = self.assertSameRows(True)
+        self.assertIn('mdc-data-table__cell--checkbox"><div', compiled)
+        compiled, generic = self.assertSameRows(False)
+        self.assertEqual(compiled, generic)
+
+
+    @override_settings(
+            MATERIALWEB_ID_GENERATOR='materialweb.tags.base.random_id')
+    def test_random_ids(self):
+        self.assertSameRows(True)
+        self.assertSameRows(False)
+
+
+class PaginationTest(SimpleTestCase):
+
+    source = '{% Table pager=page columns=columns page_sizes="10,25" '\
+            'export="csv" %}{% endTable %}'
+
+    def setUp(self):
+        pagination_markup.cache_clear()
+
+
+    def render(self, number=2, **params):
+        request = RequestFactory().get('/items/', dict({'q': 'a b',
+                'page': str(number)}, **params))
+        page = Paginator([{'a': x} for x in range(45)], 10).page(number)
+        return render(self.source, request=request, page=page,
+                columns=['a'])
+
+
+    def hrefs(self, html, pattern):
+        return re.findall(r'<[^>]*href="([^"]*)"[^>]*%s' % pattern, html)
+
+
+    def test_buttons(self):
+        html = self.render()
+        self.assertEqual(self.hrefs(html, 'data-first-page'),
+                ['/items/?q=a+b&amp;page=1'])
+        self.assertEqual(self.hrefs(html, 'data-prev-page'),
+                ['/items/?q=a+b&amp;page=1'])
+        self.assertEqual(self.hrefs(html, 'data-next-page'),
+                ['/items/?q=a+b&amp;page=3'])
+        self.assertEqual(self.hrefs(html, 'data-last-page'),
+                ['/items/?q=a+b&amp;page=5'])
+        self.assertIn('11‑20 of 45', html)
+
+
+    def test_disabled_buttons(self):
+        html = self.render(1)
+        for key in ('first', 'prev'):
+            self.assertRegex(html, r'disabled="disabled" type="button" '
+                    r'data-%s-page' % key)
+        self.assertEqual(len(self.hrefs(html, 'data-next-page')), 1)
+
+
+    def test_page_sizes(self):
+        html = self.render()
+        options = re.findall(r'<li aria-selected="(\w+)" role="option" '
+                r'data-value="(\d+)"\s+class="mdc-list-item([^"]*)">\s*'
+                r'<a href="([^"]*)"', html)
+        self.assertEqual(options, [
+            ('true', '10', ' mdc-list-item--selected',
+                '/items/?q=a+b&amp;page_size=10'),
+            ('false', '25', '', '/items/?q=a+b&amp;page_size=25'),
+        ])
+
+
+    def test_export(self):
+        html = self.render(export='xlsx')
+        self.assertEqual(re.findall(r'<a href="([^"]*)" download', html),
+                ['/items/?q=a+b&amp;export=csv'])
+
+
+    def test_markup_cache(self):
+        with translation.override('en'):
+            self.render()
+            self.render(3)
+        self.assertEqual(pagination_markup.cache_info().currsize, 1)
+        with translation.override('de'):
+            self.render()
+        self.assertEqual(pagination_markup.cache_info().currsize, 2)
+
+        with override_settings(MATERIALWEB_MINIFY=True):
+            html = self.render()
+        self.assertEqual(pagination_markup.cache_info().currsize, 3)
+        self.assertRegex(html, r'data-next-page="true" class="[^"]*">'
+                r'chevron_right</button>')
+        self.assertRegex(self.render(), r'data-next-page="true"\n')
@@ -0,0 +1,87 @@
+import csv
+from decimal import Decimal
+import io
+import json
+#-
+from django.contrib.auth.models import User
+from django.test import RequestFactory, SimpleTestCase, TestCase
+#-
+from materialweb.export import ExportResponse, export_response, iter_csv
+from materialweb.tags.data_table import Column
+
+ITEMS = [
+    {'name': '=SUM(A1:A2)', 'amount': -5, 'price': Decimal('1.50')},
+    {'name': '+1', 'amount': 0, 'price': None},
+    {'name': '@cmd', 'amount': 3, 'price': Decimal('-2')},
+    {'name': 'plain, "quoted"', 'amount': 4, 'price': Decimal('0')},
+]
+
+COLUMNS = [
+    'name',
+    Column('amount', '-Amount'),
+    ('price', 'Price', 'num', lambda value: value and value * 2),
+]
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+class CSVTest(SimpleTestCase):
+
+    def test_response(self):
+        response = ExportResponse(ITEMS, COLUMNS, 'csv', filename='items')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'],
+                'attachment; filename="items.csv"')
+        self.assertEqual(list(csv.reader(io.StringIO(content(response)))), [
+            ['name', "'-Amount", 'Price'],
+            ["'=SUM(A1:A2)", '-5', '3.00'],
+            ["'+1", '0', ''],
+            ["'@cmd", '3', '-4'],
+            ['plain, "quoted"', '4', '0'],
+        ])
+
+
+    def test_formulas_kept(self):
+        lines = list(iter_csv(ITEMS[:1], [Column('name')],
+                escape_formulas=False))
+        self.assertEqual(lines, ['name\r\n', '=SUM(A1:A2)\r\n'])
+
+
+class NDJSONTest(SimpleTestCase):
+
+    def test_response(self):
+        response = ExportResponse(ITEMS, COLUMNS, 'ndjson')
+        self.assertEqual(response['Content-Type'],
+                'application/x-ndjson; charset=utf-8')
+        self.assertEqual([json.loads(line) for line in\
+                content(response).splitlines()], [
+            {'name': '=SUM(A1:A2)', 'amount': -5, 'price': '3.00'},
+            {'name': '+1', 'amount': 0, 'price': None},
+            {'name': '@cmd', 'amount': 3, 'price': '-4'},
+            {'name': 'plain, "quoted"', 'amount': 4, 'price': '0'},
+        ])
+
+
+class QuerySetExportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(User(username='user%d' % i,
+                first_name='Café ☕') for i in range(5))
+
+
+    def test_export_response(self):
+        factory = RequestFactory()
+        queryset = User.objects.order_by('username')
+        columns = ['username', 'first_name']
+        self.assertIsNone(export_response(factory.get('/'), queryset, columns))
+        self.assertIsNone(export_response(factory.get('/', {'export': 'xls'}),
+                queryset, columns))
+
+        response = export_response(factory.get('/', {'export': 'ndjson'}),
+                queryset, columns, chunk_size=2)
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        self.assertEqual(rows, [{'username': 'user%d' % i,
+                'first_name': 'Café ☕'} for i in range(5)])
@@ -0,0 +1,174 @@
+from importlib.util import find_spec
+import os
+import re
+from unittest import skipUnless
+#-
+from django import forms
+from django.template import Context, Engine, TemplateDoesNotExist, engines
+from django.test import SimpleTestCase, override_settings
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__)))), 'templates')
+
+
+class ContactForm(forms.Form):
+    name = forms.CharField(help_text="Your full name.")
+    topic = forms.ChoiceField(choices=[('a', 'Sales'), ('b', 'Support')],
+            widget=forms.RadioSelect)
+    token = forms.CharField(widget=forms.HiddenInput)
+
+
+class WidgetsForm(forms.Form):
+    name = forms.CharField(help_text="Your <b>full</b> name.", max_length=4)
+    agree = forms.BooleanField(label="I agree")
+    topic = forms.ChoiceField(choices=[('a', 'Sales'), ('b', 'R&D')],
+            widget=forms.RadioSelect)
+    tags = forms.MultipleChoiceField(choices=[(1, 'One'), (2, 'Two')],
+            widget=forms.CheckboxSelectMultiple, required=False)
+    document = forms.FileField(widget=forms.FileInput, help_text="A PDF.")
+    attachment = forms.FileField(required=False)
+    kind = forms.ChoiceField(choices=[(1, 1.5), (2, 2.5)])
+    notes = forms.CharField(widget=forms.Textarea(attrs={'class': 'wide'}))
+    when = forms.SplitDateTimeField(required=False)
+    token = forms.CharField(widget=forms.HiddenInput)
+
+
+def render(source, **context):
+    template = engines['django'].from_string('{% load materialweb %}' +\
+            source)
+    return template.render(context)
+
+
+class FormFieldTest(SimpleTestCase):
+
+    def test_component(self):
+        html = render('{% Form_Field form.name %}', form=ContactForm())
+        self.assertRegex(html, r'<div class="mdc-form__field[^"]*" '
+                r'id="div_id_name">')
+        self.assertIn('mdc-text-field', html)
+        self.assertIn('Your full name.', html)
+
+
+    def test_no_auto_id(self):
+        html = render('{% Form_Field form.name %}',
+                form=ContactForm(auto_id=False))
+        self.assertNotIn('id="div_', html)
+        self.assertIn('class="mdc-form__field', html)
+
+
+    def test_hidden(self):
+        html = render('{% Form_Field form.token %}', form=ContactForm())
+        self.assertEqual(html.strip(),
+                '<input type="hidden" name="token" id="id_token">')
+
+
+    def test_widget_markup(self):
+        html = render('{% Form_Field form.topic %}', form=ContactForm(),
+                label_class='lead')
+        self.assertIn('<label class="lead">Topic:</label>', html)
+        self.assertIn('type="radio" name="topic" value="a"', html)
+
+
+    def test_context(self):
+        html = render('{% Form_Field form.name %}', form=ContactForm({}),
+                tag='section', wrapper_class='wide', field_class='col',
+                form_show_errors=False)
+        self.assertRegex(html, r'^\s*<section class="mdc-form__field wide"')
+        self.assertIn('<div class="col">', html)
+        self.assertNotIn('errors', html)
+
+
+    def test_arguments(self):
+        html = render('{% Form_Field form.name tag="p" show_errors=True %}',
+                form=ContactForm({}), tag='section', form_show_errors=False)
+        self.assertRegex(html, r'^\s*<p class="mdc-form__field ')
+        self.assertEqual(len(re.findall(r'id="id_name-errors"', html)), 1)
+
+
+def normalize(html):
+    """Collapse white space, and remove it around tags.
+    """
+    html = re.sub(r'\s+', ' ', html)
+    return re.sub(r'\s*([<>])\s*', r'\1', html).strip()
+
+
+@skipUnless(find_spec('crispy_forms'), "django-crispy-forms is required")
+class PackFieldTest(SimpleTestCase):
+    """Form_PackField against `material/field.html` of the template pack.
+    """
+    CONTEXTS = (
+        {},
+        {'form_show_labels': False, 'form_show_errors': False},
+        {'use_custom_control': True, 'help_text_inline': True,
+            'inline_class': 'inline', 'label_class': 'col-2',
+            'field_class': 'col-10', 'form_class': 'form-horizontal',
+            'wrapper_class': 'extra', 'tag': 'p'},
+        {'error_text_inline': True, 'bootstrap_checkbox_offsets': ['off'],
+            'label_class': 'lead', 'flat_attrs': 'data-x="1"'},
+    )
+
+    def engine(self):
+        return Engine(dirs=[TEMPLATES_DIR], libraries={
+            'crispy_forms_field':\
+                'crispy_forms.templatetags.crispy_forms_field',
+            'crispy_forms_filters':\
+                'crispy_forms.templatetags.crispy_forms_filters',
+            'l10n': 'django.templatetags.l10n',
+            'materialweb': 'materialweb.templatetags.materialweb',
+        })
+
+
+    def assertSameMarkup(self, form):
+        engine = self.engine()
+        pack = engine.from_string('{% include "material/field.html" %}')
+        python = engine.from_string(
+                '{% load materialweb %}{% Form_PackField field %}')
+        for values in self.CONTEXTS:
+            for bound_field in form:
+                context = dict({'form_show_labels': True,
+                        'form_show_errors': True}, field=bound_field,
+                        **values)
+                with self.subTest(field=bound_field.name, context=values):
+                    self.assertEqual(
+                            normalize(python.render(Context(context))),
+                            normalize(pack.render(Context(context))))
+
+
+    def test_unbound(self):
+        self.assertSameMarkup(WidgetsForm())
+
+
+    def test_errors(self):
+        self.assertSameMarkup(WidgetsForm({'name': 'Too long', 'topic': 'b',
+                'tags': ['1'], 'kind': '2'}))
+
+
+    def test_no_auto_id(self):
+        self.assertSameMarkup(WidgetsForm({'agree': 'on'}, auto_id=False))
+
+
+class LoaderTest(SimpleTestCase):
+
+    def engine(self):
+        return Engine(loaders=['materialweb.loaders.Loader'],
+                libraries={'materialweb':\
+                    'materialweb.templatetags.materialweb'})
+
+
+    @override_settings(MATERIALWEB_PYTHON_TEMPLATES=True)
+    def test_field(self):
+        template = self.engine().get_template('material/field.html')
+        form = ContactForm()
+        self.assertEqual(template.render(Context({'field': form['name']})),
+                render('{% Form_PackField form.name %}', form=form))
+
+
+    @override_settings(MATERIALWEB_PYTHON_TEMPLATES=True)
+    def test_other_templates(self):
+        with self.assertRaises(TemplateDoesNotExist):
+            self.engine().get_template('material/layout/div.html')
+
+
+    def test_disabled(self):
+        with self.assertRaises(TemplateDoesNotExist):
+            self.engine().get_template('material/field.html')
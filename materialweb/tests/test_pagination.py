@@ -0,0 +1,380 @@
+from datetime import date
+from decimal import Decimal
+#-
+from django.contrib.auth.models import Permission, User
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+#-
+from materialweb.cache import get_cache
+from materialweb.pagination import LAST_PAGE, CachedCountPaginator,\
+        CursorPaginator, NoCountPaginator, decode_cursor, encode_cursor,\
+        get_page_size
+
+
+class CursorTest(TestCase):
+
+    def test_round_trip(self):
+        for direction in ('after', 'before'):
+            cursor = encode_cursor(direction, ['abc', 3, None])
+            self.assertEqual(decode_cursor(cursor),
+                    (direction, ['abc', 3, None]))
+
+
+    def test_values_as_str(self):
+        cursor = encode_cursor('after', [date(2024, 2, 29), Decimal('1.10')])
+        self.assertEqual(decode_cursor(cursor),
+                ('after', ['2024-02-29', '1.10']))
+
+
+    def test_url_safe(self):
+        cursor = encode_cursor('after', ['???>>>'])
+        self.assertNotRegex(cursor, r'[+/=]')
+
+
+    def test_last_page(self):
+        self.assertEqual(decode_cursor(LAST_PAGE), ('before', None))
+
+
+    def test_invalid(self):
+        for cursor in ('', 'x', '!!!!', encode_cursor('sideways', [1]),
+                encode_cursor('after', 1)):
+            self.assertIsNone(decode_cursor(cursor), cursor)
+
+
+class CursorPaginatorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # Repeated first names, the pk breaks the ties.
+        User.objects.bulk_create(User(username='user%02d' % i,
+                first_name='name%d' % (i % 4)) for i in range(23))
+        cls.ordered = list(User.objects.order_by('-first_name', 'pk')\
+                .values_list('username', flat=True))
+
+
+    def paginator(self, per_page=5):
+        return CursorPaginator(User.objects.all(), per_page,
+                ordering=('-first_name',))
+
+
+    def names(self, page):
+        return [user.username for user in page]
+
+
+    def test_forward(self):
+        paginator = self.paginator()
+        page = paginator.page()
+        self.assertFalse(page.has_previous())
+        self.assertIsNone(page.previous_cursor())
+
+        names = self.names(page)
+        while page.has_next():
+            page = paginator.page(page.next_cursor())
+            self.assertTrue(page.has_previous())
+            names.extend(self.names(page))
+
+        self.assertEqual(len(page), 3)
+        self.assertIsNone(page.next_cursor())
+        self.assertEqual(names, self.ordered)
+
+
+    def test_backward(self):
+        paginator = self.paginator()
+        page = paginator.page(LAST_PAGE)
+        self.assertFalse(page.has_next())
+        self.assertEqual(len(page), 5)
+
+        names = self.names(page)
+        while page.has_previous():
+            page = paginator.page(page.previous_cursor())
+            self.assertTrue(page.has_next())
+            names[:0] = self.names(page)
+
+        self.assertEqual(names, self.ordered)
+
+
+    def test_previous_of_next(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        second = paginator.page(first.next_cursor())
+        self.assertEqual(self.names(paginator.page(second.previous_cursor())),
+                self.names(first))
+
+
+    def test_exact_pages(self):
+        paginator = self.paginator(per_page=23)
+        page = paginator.page()
+        self.assertEqual(len(page), 23)
+        self.assertFalse(page.has_next())
+        self.assertFalse(page.has_other_pages())
+
+
+    def test_one_query_per_page(self):
+        paginator = self.paginator()
+        cursor = paginator.page().next_cursor()
+        with self.assertNumQueries(1):
+            page = paginator.page(cursor)
+            self.names(page)
+            page.next_cursor()
+            page.previous_cursor()
+
+
+    def test_invalid_cursor(self):
+        paginator = self.paginator()
+        for cursor in ('garbage', encode_cursor('after', ['too', 'many',
+                'values'])):
+            page = paginator.page(cursor)
+            self.assertFalse(page.has_previous())
+            self.assertEqual(self.names(page), self.ordered[:5])
+
+
+    def test_tampered_cursor(self):
+        paginators = [
+            self.paginator(),
+            CursorPaginator(User.objects.order_by('pk'), 5),
+        ]
+        first = [self.names(x.page()) for x in paginators]
+        for values in (['abc'], [{'x': 1}], [None], [[1]], ['']):
+            for paginator, names in zip(paginators, first):
+                key = ['name1'][:len(paginator.fields) - 1] + values
+                for direction in ('after', 'before'):
+                    page = paginator.page(encode_cursor(direction, key))
+                    self.assertFalse(page.has_previous(), key)
+                    self.assertEqual(self.names(page), names, key)
+
+
+    def test_cursor_values_converted(self):
+        paginator = CursorPaginator(User.objects.order_by('pk'), 5)
+        user = User.objects.get(username='user04')
+        page = paginator.page(encode_cursor('after', [str(user.pk)]))
+        self.assertEqual(self.names(page)[0], 'user05')
+
+
+    def test_meta_ordering(self):
+        # Ordered by content_type__app_label, content_type__model, codename.
+        queryset = Permission.objects.all()
+        paginator = CursorPaginator(queryset, 10)
+        self.assertEqual(paginator.ordering[:3],
+                tuple(Permission._meta.ordering))
+
+        page = paginator.page()
+        rows = list(page)
+        while page.has_next():
+            page = paginator.page(page.next_cursor())
+            rows.extend(page)
+        self.assertEqual(rows, list(queryset))
+
+
+    def test_empty(self):
+        page = CursorPaginator(User.objects.none(), 5).page()
+        self.assertEqual(len(page), 0)
+        self.assertFalse(page.has_other_pages())
+
+
+    def test_expression_ordering(self):
+        with self.assertRaises(ValueError):
+            CursorPaginator(User.objects.all(), 5,
+                    ordering=(F('first_name').desc(),))
+
+
+class NoCountPaginatorTest(TestCase):
+
+    def setUp(self):
+        self.paginator = NoCountPaginator(list(range(23)), 10)
+
+
+    def test_pages(self):
+        page = self.paginator.page(1)
+        self.assertEqual(list(page), list(range(10)))
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertEqual(page.pagination_summary(), '1‑10 of many')
+
+        page = self.paginator.page(3)
+        self.assertEqual(list(page), [20, 21, 22])
+        self.assertFalse(page.has_next())
+        self.assertEqual((page.start_index(), page.end_index()), (21, 23))
+        self.assertEqual(page.pagination_summary(), '21‑23 of 23')
+
+
+    def test_full_last_page(self):
+        page = NoCountPaginator(list(range(20)), 10).page(2)
+        self.assertFalse(page.has_next())
+        self.assertEqual(len(page), 10)
+
+
+    def test_one_query_per_page(self):
+        User.objects.bulk_create(User(username='user%02d' % i)\
+                for i in range(12))
+        paginator = NoCountPaginator(User.objects.order_by('pk'), 10)
+        with self.assertNumQueries(1):
+            page = paginator.page(2)
+            self.assertEqual(len(page), 2)
+            self.assertFalse(page.has_next())
+
+
+    def test_empty_page(self):
+        with self.assertRaises(EmptyPage):
+            self.paginator.page(4)
+        with self.assertRaises(EmptyPage):
+            self.paginator.page(0)
+        with self.assertRaises(PageNotAnInteger):
+            self.paginator.page('x')
+
+
+    def test_unknown_count(self):
+        page = self.paginator.page(2)
+        self.assertEqual(repr(page), '<Page 2>')
+        self.assertTrue(page.has_other_pages())
+        for name in ('count', 'num_pages', 'page_range'):
+            with self.assertRaisesRegex(AttributeError, 'NoCountPaginator'):
+                getattr(self.paginator, name)
+
+
+    def test_empty_first_page(self):
+        page = NoCountPaginator([], 10).page(1)
+        self.assertFalse(page.has_next())
+        self.assertEqual((page.start_index(), page.end_index()), (0, 0))
+
+
+    def test_get_page(self):
+        self.assertEqual(self.paginator.get_page(9).number, 1)
+        self.assertEqual(self.paginator.get_page('x').number, 1)
+        self.assertEqual(self.paginator.get_page('2').number, 2)
+
+
+class CachedCountPaginatorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(User(username='user%02d' % i,
+                is_staff=i % 3 == 0) for i in range(12))
+
+
+    def setUp(self):
+        get_cache().clear()
+
+
+    def test_cached_count(self):
+        paginator = CachedCountPaginator(User.objects.order_by('pk'), 5)
+        self.assertEqual(paginator.count, 12)
+        self.assertTrue(paginator.count_is_exact)
+        self.assertEqual(paginator.page(1).pagination_summary(),
+                '1‑5 of 12')
+
+        User.objects.create(username='late')
+        # Another ordering of the same rows shares the count.
+        paginator = CachedCountPaginator(User.objects.order_by('-pk'), 5)
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, 12)
+        self.assertFalse(paginator.count_is_exact)
+        self.assertEqual(paginator.page(1).pagination_summary(),
+                '1‑5 of about 12')
+
+
+    def test_count_per_query(self):
+        paginator = CachedCountPaginator(User.objects.order_by('pk'), 5)
+        self.assertEqual(paginator.count, 12)
+        paginator = CachedCountPaginator(User.objects.filter(is_staff=True)\
+                .order_by('pk'), 5)
+        self.assertEqual(paginator.count, 4)
+        self.assertTrue(paginator.count_is_exact)
+
+
+    def test_expired(self):
+        paginator = CachedCountPaginator(User.objects.order_by('pk'), 5,
+                count_timeout=0)
+        self.assertEqual(paginator.count, 12)
+        User.objects.create(username='late')
+        paginator = CachedCountPaginator(User.objects.order_by('pk'), 5,
+                count_timeout=0)
+        self.assertEqual(paginator.count, 13)
+        self.assertTrue(paginator.count_is_exact)
+
+
+    def test_not_cached(self):
+        paginator = CachedCountPaginator(User.objects.filter(pk__in=[])\
+                .order_by('pk'), 5)
+        self.assertIsNone(paginator.count_key())
+        self.assertEqual(paginator.count, 0)
+
+        paginator = CachedCountPaginator(list(range(7)), 5)
+        self.assertIsNone(paginator.count_key())
+        self.assertEqual(paginator.count, 7)
+        self.assertTrue(paginator.count_is_exact)
+
+
+class GetPageSizeTest(TestCase):
+
+    def request(self, path='/items/', session=True, **params):
+        request = RequestFactory().get(path, params)
+        if session:
+            request.session = {}
+        return request
+
+
+    def test_query_parameter(self):
+        self.assertEqual(get_page_size(self.request(page_size='25')), 25)
+        self.assertEqual(get_page_size(self.request(rows='5'), name='rows',
+                sizes=(5, 50)), 5)
+        self.assertEqual(get_page_size(self.request(page_size='50'),
+                sizes='5, 50'), 50)
+        self.assertEqual(get_page_size(self.request(), sizes=['5', '50']), 5)
+
+
+    def test_default(self):
+        self.assertEqual(get_page_size(self.request()), 10)
+        self.assertEqual(get_page_size(self.request(), default=100), 100)
+        self.assertEqual(get_page_size(self.request(), default=7), 10)
+        with override_settings(MATERIALWEB_PAGE_SIZES=(20, 40)):
+            self.assertEqual(get_page_size(self.request()), 20)
+
+
+    def test_invalid(self):
+        for value in ('x', '', '26', '-10'):
+            self.assertEqual(get_page_size(self.request(page_size=value)), 10)
+
+
+    def test_session_fallback(self):
+        request = self.request(page_size='100')
+        self.assertEqual(get_page_size(request), 100)
+
+        later = self.request()
+        later.session = request.session
+        self.assertEqual(get_page_size(later), 100)
+
+        # An invalid value keeps the saved one.
+        later = self.request(page_size='x')
+        later.session = request.session
+        self.assertEqual(get_page_size(later), 100)
+
+
+    def test_session_key(self):
+        request = self.request(page_size='100')
+        get_page_size(request)
+
+        other = self.request('/other/')
+        other.session = request.session
+        self.assertEqual(get_page_size(other), 10)
+
+        shared = self.request('/other/', page_size='25')
+        shared.session = request.session
+        get_page_size(shared, key='items')
+        other = self.request('/elsewhere/')
+        other.session = request.session
+        self.assertEqual(get_page_size(other, key='items'), 25)
+
+
+    def test_saved_size_no_longer_allowed(self):
+        request = self.request(page_size='100')
+        get_page_size(request)
+        later = self.request()
+        later.session = request.session
+        self.assertEqual(get_page_size(later, sizes=(10, 25)), 10)
+
+
+    def test_no_session(self):
+        request = self.request(page_size='25', session=False)
+        self.assertEqual(get_page_size(request), 25)
+        self.assertEqual(get_page_size(self.request(session=False)), 10)
@@ -0,0 +1,76 @@
+from django.http import HttpResponse
+from django.template import engines
+from django.test import RequestFactory, SimpleTestCase, override_settings
+#-
+from materialweb import profiler
+from materialweb.tags.base import Node
+
+PAGE = '''{% load materialweb %}
+{% Card_Actions %}{% Button mode=mode %}{{ label }}{% endButton %}{% endCard_Actions %}
+'''
+
+
+class ProfilerTest(SimpleTestCase):
+
+    def setUp(self):
+        profiler.install()
+        self.addCleanup(profiler.uninstall)
+        self.template = engines['django'].from_string(PAGE)
+
+
+    def render(self, label='Café ☕'):
+        return self.template.render({'mode': 'raised', 'label': label})
+
+
+    def test_stats(self):
+        with profiler.profile() as result:
+            html = self.render()
+
+        stats = {(x['component'], x['mode']): x for x in result.as_list()}
+        self.assertEqual(set(stats), {('card.Actions', 'default'),
+                ('button.Button', 'raised')})
+        actions = stats['card.Actions', 'default']
+        button = stats['button.Button', 'raised']
+        self.assertEqual(actions['calls'], 1)
+        self.assertEqual(button['calls'], 1)
+        # The line breaks around the Card_Actions are not a component's.
+        self.assertEqual(actions['bytes'], len(html[1:-1].encode()))
+        self.assertLess(button['bytes'], actions['bytes'])
+        self.assertLessEqual(button['cumulative'], actions['cumulative'])
+        self.assertAlmostEqual(result.total(),
+                actions['self'] + button['self'])
+
+
+    def test_bytes(self):
+        sizes = []
+        for label in ('Cafe X', 'Café ☕'):
+            with profiler.profile() as result:
+                self.render(label)
+            sizes.append(result.stats['button.Button', 'raised'].bytes)
+        # Same length, é and ☕ take 2 and 3 bytes.
+        self.assertEqual(sizes[1] - sizes[0], 3)
+
+
+    def test_not_profiling(self):
+        # Installed, without profile() nothing is recorded.
+        self.assertIn('Café ☕', self.render())
+
+
+    def test_uninstall(self):
+        self.assertIsNot(Node.render_into, profiler._original_render_into) # pylint:disable=protected-access
+        profiler.uninstall()
+        self.assertIs(Node.render_into, profiler._original_render_into) # pylint:disable=protected-access
+        self.assertIs(Node.render_state, profiler._original_render_state) # pylint:disable=protected-access
+        with profiler.profile() as result:
+            self.render()
+        self.assertEqual(result.as_list(), [])
+
+
+    @override_settings(MATERIALWEB_PROFILE=True,
+            MATERIALWEB_PROFILE_LOG=False)
+    def test_middleware(self):
+        middleware = profiler.ProfilerMiddleware(
+                lambda request: HttpResponse(self.render()))
+        response = middleware(RequestFactory().get('/'))
+        self.assertRegex(response['Server-Timing'],
+                r'^mw;dur=[\d.]+;desc="materialweb", mw0;dur=')
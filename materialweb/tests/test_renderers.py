@@ -0,0 +1,39 @@
+import re
+#-
+from django import forms
+from django.template import engines
+from django.test import SimpleTestCase
+#-
+from materialweb.renderers import MaterialFormRenderer
+
+
+class NameForm(forms.Form):
+    name = forms.CharField()
+
+    def clean(self):
+        raise forms.ValidationError("Not this name.")
+
+
+class OtherForm(NameForm):
+    pass
+
+
+class RendererTest(SimpleTestCase):
+
+    def test_unique_ids(self):
+        renderer = MaterialFormRenderer()
+        template = engines['django'].from_string('{{ a }}{{ b }}{{ c }}')
+        html = template.render({
+            'a': NameForm({}, renderer=renderer),
+            'b': OtherForm({}, renderer=renderer),
+            'c': NameForm({}, renderer=renderer, prefix='c'),
+        })
+        ids = re.findall(r'\bid="(mw[^"]*-errors)"', html)
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(len(set(ids)), 3)
+
+
+    def test_same_ids_every_render(self):
+        renderer = MaterialFormRenderer()
+        self.assertEqual(str(NameForm({}, renderer=renderer)),
+                str(NameForm({}, renderer=renderer)))
@@ -0,0 +1,98 @@
+from django import forms
+from django.contrib.auth.models import User
+from django.template import engines
+from django.test import TestCase
+#-
+from materialweb.tags.select import get_choices
+
+
+class ColorForm(forms.Form):
+    color = forms.ChoiceField(choices=[('r', 'Red'), ('g', 'Green')])
+
+
+class UserForm(forms.Form):
+    user = forms.ModelChoiceField(User.objects.order_by('username'))
+
+
+def render(source, **context):
+    template = engines['django'].from_string('{% load materialweb %}' +\
+            source)
+    return template.render(context)
+
+
+class ModelChoicesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(User(username='user%d' % i)\
+                for i in range(5))
+
+
+    def test_one_query_per_page(self):
+        form_list = [UserForm(initial={'user': user}) for user in\
+                User.objects.order_by('pk')[:3]]
+        with self.assertNumQueries(1):
+            html = render('{% for form in forms %}'
+                    '{% Select form.user %}{% endSelect %}{% endfor %}',
+                    forms=form_list)
+        self.assertEqual(html.count('data-value="%s"' %\
+                User.objects.get(username='user3').pk), 3)
+
+
+    def test_selected(self):
+        user = User.objects.get(username='user2')
+        html = render('{% Select form.user %}{% endSelect %}',
+                form=UserForm(initial={'user': user}))
+        self.assertEqual(html.count('aria-selected="true"'), 1)
+        self.assertRegex(html, r'selected-text">\s*user2\s*<')
+
+
+    def test_query_per_render(self):
+        with self.assertNumQueries(2):
+            render('{% Select form.user %}{% endSelect %}', form=UserForm())
+            render('{% Select form.user %}{% endSelect %}', form=UserForm())
+
+
+    def test_other_query(self):
+        class StaffForm(forms.Form):
+            user = forms.ModelChoiceField(User.objects.filter(
+                    username__in=['user1', 'user4']).order_by('username'))
+
+        with self.assertNumQueries(2):
+            html = render('{% Select a.user %}{% endSelect %}'
+                    '{% Select b.user %}{% endSelect %}', a=UserForm(),
+                    b=StaffForm())
+        self.assertEqual(html.count('user4'), 2)
+        self.assertEqual(html.count('user0'), 1)
+
+
+    def test_fixed_choices(self):
+        field = forms.ChoiceField(choices=[('a', 'A')])
+        self.assertIs(get_choices(field, None), field.choices)
+
+
+class FixedChoicesTest(TestCase):
+
+    def render(self, form):
+        return render('{% Select form.color %}{% endSelect %}', form=form)
+
+
+    def test_selected(self):
+        html = self.render(ColorForm(initial={'color': 'g'}))
+        self.assertRegex(html, r'selected-text">\s*Green\s*<')
+        self.assertEqual(html.count('aria-selected="true"'), 1)
+
+        html = self.render(ColorForm(initial={'color': 'r'}))
+        self.assertRegex(html, r'selected-text">\s*Red\s*<')
+        self.assertEqual(html.count('aria-selected="true"'), 1)
+
+
+    def test_changed_in_place(self):
+        form = ColorForm()
+        self.assertNotIn('Blue', self.render(form))
+        form.fields['color'].choices.append(('b', 'Blue'))
+        self.assertIn('Blue', self.render(form))
+        form.fields['color'].choices[0] = ('r', 'Crimson')
+        html = self.render(form)
+        self.assertIn('Crimson', html)
+        self.assertNotIn('Red', html)
@@ -0,0 +1,96 @@
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory, SimpleTestCase
+#-
+from materialweb.streaming import StreamingTemplateResponse, iter_template
+
+TEMPLATES = {
+    'base.html': '''{% load materialweb %}<html>
+{% block title %}Base title{% endblock %}
+{% block content %}
+  {% Card_Actions %}{% Button mode=mode %}{{ label }}{% endButton %}{% endCard_Actions %}
+  {% block inner %}base inner{% endblock %}
+{% endblock %}
+{% block empty %}{% endblock %}
+</html>''',
+
+    'middle.html': '''{% extends "base.html" %}
+{% block title %}Middle, {{ block.super }}{% endblock %}
+{% block inner %}middle inner, {{ block.super }}{% endblock %}''',
+
+    'page.html': '''{% extends "middle.html" %}{% load materialweb %}
+{% block content %}
+  {% for row in rows %}
+    {{ forloop.counter }}/{{ forloop.revcounter0 }}
+    {% if forloop.first %}first{% elif forloop.last %}last{% else %}-{% endif %}
+    {% for cell in row %}
+      {{ forloop.parentloop.counter0 }}.{{ forloop.counter0 }}={{ cell }}
+    {% empty %}
+      empty row
+    {% endfor %}
+  {% empty %}
+    no rows
+  {% endfor %}
+  {% for key, value in pairs %}{{ key }}:{{ value }}{% endfor %}
+  {% for item in rows reversed %}{{ item|length }}{% endfor %}
+  {% with total=rows|length %}{{ total }} rows{% endwith %}
+  {% Table_Body %}
+    {% for row in rows %}
+      {% Table_Row %}{% Table_Col %}{{ row|join:"," }}{% endTable_Col %}{% endTable_Row %}
+    {% endfor %}
+  {% endTable_Body %}
+  {{ block.super }}
+{% endblock %}''',
+
+    'include.html': '''{% load materialweb %}
+{% include "middle.html" %}
+{% Button mode=mode %}after{% endButton %}''',
+}
+
+
+class StreamingTest(SimpleTestCase):
+
+    def setUp(self):
+        self.backend = DjangoTemplates({
+            'NAME': 'streaming',
+            'DIRS': [],
+            'APP_DIRS': False,
+            'OPTIONS': {
+                'loaders': [('django.template.loaders.locmem.Loader',
+                    TEMPLATES)],
+            },
+        })
+
+
+    def assertSameOutput(self, name, **context):
+        template = self.backend.get_template(name)
+        context = dict({'mode': 'raised', 'label': 'Go'}, **context)
+        self.assertEqual(''.join(iter_template(template, context)),
+                template.render(context))
+
+
+    def test_extends(self):
+        self.assertSameOutput('middle.html')
+
+
+    def test_for(self):
+        self.assertSameOutput('page.html', rows=[[1, 2], [], ['<a>', 4, 5]],
+                pairs=[('a', 1), ('b', 2)])
+
+
+    def test_for_empty(self):
+        self.assertSameOutput('page.html', rows=[], pairs=[])
+        self.assertSameOutput('page.html', rows=None, pairs={})
+
+
+    def test_include(self):
+        self.assertSameOutput('include.html')
+
+
+    def test_response(self):
+        template = self.backend.get_template('page.html')
+        context = {'mode': 'raised', 'label': 'Go', 'rows': [[1]],
+                'pairs': []}
+        request = RequestFactory().get('/')
+        response = StreamingTemplateResponse(request, template, context)
+        self.assertEqual(b''.join(response.streaming_content).decode(),
+                template.render(context, request))
@@ -0,0 +1,89 @@
+import json
+from unittest.mock import patch
+#-
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+#-
+from materialweb import remote, views
+from materialweb.remote import QuerySetChoices, StaticChoices
+
+
+class ChoicesViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='alice')
+        User.objects.create(username='bob')
+
+
+    def setUp(self):
+        # The registrations of a test are undone after it.
+        registry = patch.dict('materialweb.remote._choices')
+        registry.start()
+        self.addCleanup(registry.stop)
+
+        remote.register('users', QuerySetChoices(User.objects.all(),
+                'username', label=lambda user: user.username))
+        remote.register('colors', StaticChoices([('r', 'Red'),
+                ('g', 'Green'), ('b', 'Blue')], public=True))
+
+
+    def get(self, name, user=None, **params):
+        request = RequestFactory().get('/choices/%s/' % name, params)
+        request.user = AnonymousUser() if user is None else user
+        return views.choices(request, name)
+
+
+    def results(self, response):
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)['results']
+
+
+    def test_anonymous_denied(self):
+        with self.assertRaises(PermissionDenied):
+            self.get('users', q='a')
+
+
+    def test_no_user_denied(self):
+        request = RequestFactory().get('/choices/users/')
+        with self.assertRaises(PermissionDenied):
+            views.choices(request, 'users')
+
+
+    def test_authenticated(self):
+        self.assertEqual(self.results(self.get('users', self.user, q='B')),
+                [{'value': str(User.objects.get(username='bob').pk),
+                  'label': 'bob'}])
+
+
+    def test_public(self):
+        self.assertEqual(self.results(self.get('colors', q='gr')),
+                [{'value': 'g', 'label': 'Green'}])
+
+
+    def test_has_permission_override(self):
+        class StaffChoices(StaticChoices):
+            def has_permission(self, request):
+                return request.user.is_staff
+
+        remote.register('staff', StaffChoices([('x', 'X')]))
+        with self.assertRaises(PermissionDenied):
+            self.get('staff', self.user)
+        self.user.is_staff = True
+        self.assertEqual(len(self.results(self.get('staff', self.user))), 1)
+
+
+    def test_unknown_name(self):
+        with self.assertRaises(Http404):
+            self.get('nothing', self.user)
+
+
+    def test_html(self):
+        response = self.get('colors', q='b', format='html')
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        self.assertIn('data-value="b"', html)
+        self.assertIn('Blue', html)
+        self.assertNotIn('Red', html)
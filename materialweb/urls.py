@@ -0,0 +1,9 @@
+from django.urls import path
+#-
+from . import views
+
+app_name = 'materialweb'
+
+urlpatterns = [
+    path('choices/<str:name>/', views.choices, name='choices'),
+]
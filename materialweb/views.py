@@ -0,0 +1,48 @@
+"""Views used by the components, include `materialweb.urls` to enable them.
+
+.. code-block:: python
+
+   urlpatterns = [
+       path('materialweb/', include('materialweb.urls')),
+       ...
+   ]
+
+"""
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template import Context
+from django.utils.html import conditional_escape
+#-
+from .remote import get_choices
+from .tags.base import NodeList, TextNode
+from .tags.select import Item
+
+MAX_TERM_LENGTH = 100
+"Longer search terms are cut."
+
+
+def choices(request, name):
+    """Search the remote choices registered under `name`.
+
+    The `q` query parameter is the search term. Returns JSON
+    :code:`{"results": [{"value": ..., "label": ...}]}`, or the list items of
+    a :code:`Select` with :code:`format=html`.
+    """
+    try:
+        source = get_choices(name)
+    except ImproperlyConfigured:
+        raise Http404() from None
+    if not source.has_permission(request):
+        raise PermissionDenied()
+
+    results = source.search(request.GET.get('q', '')[:MAX_TERM_LENGTH])
+
+    if request.GET.get('format') == 'html':
+        context = Context()
+        return HttpResponse('\n'.join(Item(
+                NodeList([TextNode(conditional_escape(label))]),
+                value=conditional_escape(value)).render(context)\
+                for value, label in results))
+
+    return JsonResponse({'results': [{'value': str(value), 'label': str(label)}\
+            for value, label in results]})